@@ -0,0 +1,159 @@
+import argparse
+import os
+import struct
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+from level import read_level_rows
+from replay import CAUSES, OUTCOMES, level_hash
+from settings import ANALYTICS_BUFFER_RECORDS, ANALYTICS_PATH, TILE_SIZE
+from simulation import Outcome, Simulation
+from validate_levels import LEVELS_DIR, collect_paths
+
+# Layout: a fixed header, then fixed-size records (level hash, step, float
+# top-left position, outcome index, death cause index) so a log can be read
+# straight into a numpy array however long it gets.
+MAGIC = b"GDAN"
+VERSION = 1
+HEADER = struct.Struct("<4sHH")
+RECORD = struct.Struct("<32sIffBB")
+RECORD_DTYPE = np.dtype(
+    [("level_hash", "S32"), ("step", "<u4"), ("x", "<f4"), ("y", "<f4"), ("outcome", "u1"), ("cause", "u1")]
+)
+PLAYER_SIZE = int(TILE_SIZE * 0.85)
+
+
+class AnalyticsLog:
+    # Records are packed into a buffer and handed to a single writer thread
+    # when it fills, so the frame that ends a run never waits on the disk.
+    def __init__(
+        self,
+        level_hash: bytes,
+        path: Path = ANALYTICS_PATH,
+        buffer_records: int = ANALYTICS_BUFFER_RECORDS,
+    ) -> None:
+        # level_hash is of the rows being played, taken when they were loaded.
+        self.level_hash = level_hash
+        self.path = path
+        self.buffer_records = buffer_records
+        self._buffer = bytearray()
+        self._count = 0
+        # The browser build has no threads; its writes are small and rare.
+        self._writer = ThreadPoolExecutor(max_workers=1) if sys.platform != "emscripten" else None
+
+    def level_changed(self, level_hash: bytes) -> None:
+        # The level was reloaded; later runs are tagged with its new hash.
+        self.level_hash = level_hash
+
+    def log(self, simulation: Simulation) -> None:
+        player = simulation.player
+        self._buffer += RECORD.pack(
+            self.level_hash,
+            simulation.steps,
+            player.x,
+            player.y,
+            OUTCOMES.index(simulation.outcome),
+            CAUSES.index(simulation.death_cause),
+        )
+        self._count += 1
+        if self._count >= self.buffer_records:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self._buffer:
+            return
+        data = bytes(self._buffer)
+        self._buffer.clear()
+        self._count = 0
+        if self._writer is None:
+            _append(self.path, data)
+        else:
+            self._writer.submit(_append, self.path, data)
+
+    def close(self) -> None:
+        self.flush()
+        if self._writer is not None:
+            self._writer.shutdown(wait=True)
+
+
+def _append(path: Path, data: bytes) -> None:
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("ab") as file:
+            if file.tell() == 0:
+                file.write(HEADER.pack(MAGIC, VERSION, RECORD.size))
+            file.write(data)
+    except OSError:
+        return
+
+
+def load_records(path: Path = ANALYTICS_PATH) -> np.ndarray:
+    # Memory-mapped, so millions of records cost nothing until they are read.
+    if not path.exists() or path.stat().st_size <= HEADER.size:
+        return np.empty(0, dtype=RECORD_DTYPE)
+    with path.open("rb") as file:
+        magic, version, size = HEADER.unpack(file.read(HEADER.size))
+    if magic != MAGIC:
+        raise ValueError("Not an analytics log.")
+    if version != VERSION or size != RECORD.size:
+        raise ValueError(f"Unsupported analytics log version {version}.")
+    count = (path.stat().st_size - HEADER.size) // RECORD.size
+    return np.memmap(path, dtype=RECORD_DTYPE, mode="r", offset=HEADER.size, shape=(count,))
+
+
+def death_heatmap(records: np.ndarray, digest: bytes, cols: int) -> np.ndarray:
+    # Deaths per (cause, column) for one level, counted at the column under
+    # the player's center. Rows follow CAUSES, so row 0 is always empty.
+    deaths = records[(records["level_hash"] == digest) & (records["outcome"] == OUTCOMES.index(Outcome.DEAD))]
+    column = np.floor((deaths["x"] + PLAYER_SIZE / 2) / TILE_SIZE).astype(np.int64)
+    flat = deaths["cause"].astype(np.int64) * cols + np.clip(column, 0, cols - 1)
+    return np.bincount(flat, minlength=len(CAUSES) * cols).reshape(len(CAUSES), cols)
+
+
+def level_heatmap(level_path: Path, path: Path = ANALYTICS_PATH) -> np.ndarray:
+    rows = read_level_rows(level_path)
+    return death_heatmap(load_records(path), level_hash(rows), max(len(row) for row in rows))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Summarize where players die, per level column.")
+    parser.add_argument("levels", nargs="*", type=Path, help="level files (default: levels/)")
+    parser.add_argument("--log", type=Path, default=ANALYTICS_PATH, help="analytics log to read")
+    parser.add_argument("--top", type=int, default=5, help="deadliest columns to list per level")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    records = load_records(args.log)
+    wins = OUTCOMES.index(Outcome.WIN)
+    for level_path in collect_paths(args.levels or [LEVELS_DIR]):
+        try:
+            rows = read_level_rows(level_path)
+        except (OSError, ValueError) as exc:
+            print(f"{level_path.name}: {exc}")
+            continue
+        digest = level_hash(rows)
+        heatmap = death_heatmap(records, digest, max(len(row) for row in rows))
+        per_column = heatmap.sum(axis=0)
+        total = int(per_column.sum())
+        won = int(np.count_nonzero((records["level_hash"] == digest) & (records["outcome"] == wins)))
+        if total == 0 and won == 0:
+            continue
+        causes = ", ".join(
+            f"{cause.name.lower()} {int(count)}" for cause, count in zip(CAUSES[1:], heatmap[1:].sum(axis=1)) if count
+        )
+        print(f"{level_path.name}: {total} deaths, {won} wins ({causes or 'no deaths'})")
+        for column in np.argsort(per_column, kind="stable")[::-1][:args.top]:
+            if per_column[column]:
+                print(f"  column {column}: {per_column[column]} deaths")
+    elapsed = time.perf_counter() - start
+    print(f"{len(records):,} records in {elapsed:.3f}s", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,522 @@
+import argparse
+import math
+import os
+import sys
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+from level import load_level, read_level_rows, spike_hitbox
+from masks import player_mask, spike_mask
+from replay import CAUSES, OUTCOMES
+from settings import (
+    COYOTE_TIME,
+    FORWARD_SPEED,
+    GRAVITY,
+    JUMP_BUFFER_TIME,
+    JUMP_VELOCITY,
+    LEVEL_PATH,
+    MAX_FALL_SPEED,
+    PHYSICS_STEP,
+    SCREEN_HEIGHT,
+    SWEEP_MAX_STEP,
+    TILE_SIZE,
+)
+from simulation import Outcome, Simulation
+from sweep import X_AXIS, Y_AXIS
+from validate_levels import LEVELS_DIR, collect_paths
+
+RUNNING = 0
+DEAD = 1
+WIN = 2
+
+CAUSE_NONE = 0
+CAUSE_SPIKE = 1
+CAUSE_HIT_HEAD = 2
+CAUSE_HIT_WALL = 3
+CAUSE_FALL = 4
+
+PLAYER_SIZE = int(TILE_SIZE * 0.85)
+VERIFY_RUNS = 200
+# Step lengths --verify compares at; the longer ones split into sweep segments.
+VERIFY_STEP_SECONDS = (PHYSICS_STEP, 1 / 30, 0.1, 0.25)
+VERIFY_SECONDS = 40.0
+_HITBOX = spike_hitbox(0, 0)
+# Per-player arrays that change while a player is running.
+_STATE = ("x", "y", "velocity_y", "grounded", "coyote_timer", "jump_buffer_timer")
+
+
+@lru_cache(maxsize=None)
+def overlap_table(player_size: int, size: int = TILE_SIZE) -> np.ndarray:
+    # Every answer spike_mask(size).overlap(player_mask(player_size), offset)
+    # can give, indexed by offset + player_size - 1, for code that tests many
+    # offsets at once.
+    spike = spike_mask(size)
+    player = player_mask(player_size)
+    span = player_size + size - 1
+    table = np.zeros((span, span), dtype=bool)
+    for oy in range(span):
+        for ox in range(span):
+            table[oy, ox] = spike.overlap(player, (ox - player_size + 1, oy - player_size + 1)) is not None
+    return table
+
+
+_SPIKE_OVERLAP = overlap_table(PLAYER_SIZE)
+
+
+def _fall(velocity: np.ndarray, dt: float) -> tuple[np.ndarray, np.ndarray]:
+    # sweep.fall for many players, term for term so results match exactly.
+    end_velocity = velocity + GRAVITY * dt
+    capped_after = np.maximum(0.0, (MAX_FALL_SPEED - velocity) / GRAVITY)
+    uncapped = end_velocity <= MAX_FALL_SPEED
+    distance = np.where(
+        uncapped,
+        (velocity + end_velocity) * 0.5 * dt,
+        (velocity + MAX_FALL_SPEED) * 0.5 * capped_after + MAX_FALL_SPEED * (dt - capped_after),
+    )
+    return distance, np.where(uncapped, end_velocity, MAX_FALL_SPEED)
+
+
+def _slab(position: np.ndarray, delta: np.ndarray, low: np.ndarray, high: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    with np.errstate(divide="ignore", invalid="ignore"):
+        to_low = (low - position) / delta
+        to_high = (high - position) / delta
+    forward = delta > 0.0
+    enter = np.where(forward, to_low, to_high)
+    leave = np.where(forward, to_high, to_low)
+    still = np.flatnonzero(delta == 0.0)
+    if len(still):
+        inside = ((low < position) & (position < high))[still]
+        enter[still] = np.where(inside, -np.inf, np.inf)
+        leave[still] = np.where(inside, np.inf, -np.inf)
+    return enter, leave
+
+
+def _sweep(x, y, dx, dy, left, top, width, height) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    # sweep.sweep against one rect per player.
+    enter_x, leave_x = _slab(x, dx, left - PLAYER_SIZE, left + width)
+    enter_y, leave_y = _slab(y, dy, top - PLAYER_SIZE, top + height)
+    vertical = enter_y >= enter_x
+    enter = np.where(vertical, enter_y, enter_x)
+    axis = np.where(vertical, Y_AXIS, X_AXIS).astype(np.int8)
+    return enter, np.minimum(leave_x, leave_y), axis
+
+
+def _touches_spike(x0, y0, dx, dy, tile_x, tile_y) -> np.ndarray:
+    # masks.move_touches_spike for many moves, through the precomputed
+    # answers of the mask test instead of one overlap call per sample.
+    samples = np.maximum(1, np.ceil(np.maximum(np.abs(dx), np.abs(dy)))).astype(np.int64)
+    span = _SPIKE_OVERLAP.shape[0]
+    touched = np.zeros(len(x0), dtype=bool)
+    for k in range(int(samples.max()) + 1):
+        t = k / samples
+        ox = np.floor(x0 + dx * t).astype(np.int64) - tile_x + PLAYER_SIZE - 1
+        oy = np.floor(y0 + dy * t).astype(np.int64) - tile_y + PLAYER_SIZE - 1
+        inside = (k <= samples) & (ox >= 0) & (ox < span) & (oy >= 0) & (oy < span)
+        touched |= inside & _SPIKE_OVERLAP[np.minimum(np.maximum(oy, 0), span - 1), np.minimum(np.maximum(ox, 0), span - 1)]
+    return touched
+
+
+def _bordered(table: np.ndarray) -> np.ndarray:
+    # The table with an empty cell all round, flattened, so lookups can clamp
+    # instead of masking.
+    return np.pad(table, 1).ravel()
+
+
+@dataclass
+class OccupancyGrid:
+    solid: np.ndarray
+    spike: np.ndarray
+    start: tuple[int, int]
+    end: tuple[int, int]
+
+    @classmethod
+    def from_rows(cls, rows: list[str]) -> "OccupancyGrid":
+        chars = np.array([list(row) for row in rows], dtype="<U1")
+        start = np.argwhere(chars == "S")
+        end = np.argwhere(chars == "E")
+        if len(start) == 0:
+            raise ValueError("Level is missing 'S' start marker.")
+        if len(end) == 0:
+            raise ValueError("Level is missing 'E' end marker.")
+        # load_level keeps the last marker it sees, so do the same here.
+        return cls(
+            solid=chars == "#",
+            spike=chars == "^",
+            start=(int(start[-1][0]), int(start[-1][1])),
+            end=(int(end[-1][0]), int(end[-1][1])),
+        )
+
+    @classmethod
+    def from_file(cls, path: Path) -> "OccupancyGrid":
+        return cls.from_rows(read_level_rows(path))
+
+    @property
+    def rows(self) -> int:
+        return self.solid.shape[0]
+
+    @property
+    def cols(self) -> int:
+        return self.solid.shape[1]
+
+
+class BatchSimulation:
+    def __init__(self, grid: OccupancyGrid, count: int, step_seconds: float = PHYSICS_STEP) -> None:
+        self.grid = grid
+        self.count = count
+        self._solid = _bordered(grid.solid)
+        self._spike = _bordered(grid.spike)
+        self.step_seconds = step_seconds
+        self.x = np.zeros(count, dtype=np.float64)
+        self.y = np.zeros(count, dtype=np.float64)
+        self.velocity_y = np.zeros(count, dtype=np.float64)
+        self.grounded = np.zeros(count, dtype=bool)
+        self.coyote_timer = np.zeros(count, dtype=np.float64)
+        self.jump_buffer_timer = np.zeros(count, dtype=np.float64)
+        self.outcome = np.zeros(count, dtype=np.int8)
+        self.death_cause = np.zeros(count, dtype=np.int8)
+        self.final_step = np.zeros(count, dtype=np.int64)
+        self.final_x = np.zeros(count, dtype=np.int64)
+        self.final_y = np.zeros(count, dtype=np.int64)
+        self.steps = 0
+        self.reset()
+
+    def reset(self) -> None:
+        self.reset_where(np.ones(self.count, dtype=bool))
+        self.steps = 0
+
+    def reset_where(self, mask: np.ndarray) -> None:
+        # Puts the selected players back at the start; the rest keep going.
+        start_row, start_col = self.grid.start
+        self.x[mask] = start_col * TILE_SIZE
+        self.y[mask] = start_row * TILE_SIZE
+        self.velocity_y[mask] = 0.0
+        self.grounded[mask] = False
+        self.coyote_timer[mask] = 0.0
+        self.jump_buffer_timer[mask] = 0.0
+        self.outcome[mask] = RUNNING
+        self.death_cause[mask] = CAUSE_NONE
+        self.final_step[mask] = 0
+        self.final_x[mask] = 0
+        self.final_y[mask] = 0
+
+    def load_states(
+        self,
+        x: np.ndarray,
+        y: np.ndarray,
+        velocity_y: np.ndarray,
+        grounded: np.ndarray,
+        coyote_timer: np.ndarray,
+        jump_buffer_timer: np.ndarray,
+    ) -> None:
+        self.count = len(x)
+        self.x = np.array(x, dtype=np.float64)
+        self.y = np.array(y, dtype=np.float64)
+        self.velocity_y = np.array(velocity_y, dtype=np.float64)
+        self.grounded = np.array(grounded, dtype=bool)
+        self.coyote_timer = np.array(coyote_timer, dtype=np.float64)
+        self.jump_buffer_timer = np.array(jump_buffer_timer, dtype=np.float64)
+        self.outcome = np.zeros(self.count, dtype=np.int8)
+        self.death_cause = np.zeros(self.count, dtype=np.int8)
+        self.final_step = np.zeros(self.count, dtype=np.int64)
+        self.final_x = np.zeros(self.count, dtype=np.int64)
+        self.final_y = np.zeros(self.count, dtype=np.int64)
+
+    def _candidate_cells(
+        self, table: np.ndarray, x0: np.ndarray, y0: np.ndarray, x1: np.ndarray, y1: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        # Every cell set in table (one of the bordered tables) that the box
+        # can overlap while moving in a straight line from (x0, y0) to
+        # (x1, y1), as (player, row, col). All offsets are looked up in one
+        # go; pairs come out row by row, then column by column, so each
+        # player's cells keep their scan order.
+        # Flooring to whole pixels first gives the same tile and keeps the
+        # division in integers, which is much cheaper than float //.
+        first_col = np.floor(np.minimum(x0, x1)).astype(np.int64) // TILE_SIZE
+        last_col = (np.ceil(np.maximum(x0, x1) + PLAYER_SIZE).astype(np.int64) - 1) // TILE_SIZE
+        first_row = np.floor(np.minimum(y0, y1)).astype(np.int64) // TILE_SIZE
+        last_row = (np.ceil(np.maximum(y0, y1) + PLAYER_SIZE).astype(np.int64) - 1) // TILE_SIZE
+        if len(x0) == 0:
+            empty = np.zeros(0, dtype=np.int64)
+            return empty, empty, empty
+        # Cells off the grid, and offsets past a player's own range, read the
+        # border, which is always empty.
+        rows = first_row + np.arange(int((last_row - first_row).max()) + 1)[:, None]
+        cols = first_col + np.arange(int((last_col - first_col).max()) + 1)[:, None]
+        row_base = np.where(rows <= last_row, (np.minimum(np.maximum(rows, -1), self.grid.rows) + 1) * (self.grid.cols + 2), 0)
+        col_base = np.where(cols <= last_col, np.minimum(np.maximum(cols, -1), self.grid.cols) + 1, 0)
+        hit = table[row_base[:, None, :] + col_base[None, :, :]]
+        row_offset, col_offset, player = np.unravel_index(np.flatnonzero(hit), hit.shape)
+        return player, first_row[player] + row_offset, first_col[player] + col_offset
+
+    def _first_contact(
+        self, cells: tuple[np.ndarray, np.ndarray, np.ndarray], dx: np.ndarray, dy: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        # cells are solid (player, row, col) candidates; players without any
+        # report no contact.
+        best = np.full(self.count, np.inf)
+        best_axis = np.full(self.count, X_AXIS, dtype=np.int8)
+        best_edge = np.zeros(self.count)
+        player, rows, cols = cells
+        if not len(player):
+            return best, best_axis, best_edge
+        left = cols * TILE_SIZE
+        top = rows * TILE_SIZE
+        x, y, dx, dy = self.x[player], self.y[player], dx[player], dy[player]
+        enter, leave, axis = _sweep(x, y, dx, dy, left, top, TILE_SIZE, TILE_SIZE)
+        hit = np.flatnonzero((enter < leave) & (enter >= 0.0) & (enter < 1.0))
+        if not len(hit):
+            return best, best_axis, best_edge
+        # Earliest contact per player; on a tie a vertical contact beats a
+        # horizontal one, then the first in scan order wins, as in the
+        # tile-by-tile loop.
+        order = hit[np.lexsort((hit, axis[hit] != Y_AXIS, enter[hit], player[hit]))]
+        first = order[np.concatenate(([True], player[order][1:] != player[order][:-1]))]
+        edge = np.where(
+            axis[first] == Y_AXIS,
+            np.where(dy[first] > 0.0, top[first] - PLAYER_SIZE, top[first] + TILE_SIZE),
+            np.where(dx[first] > 0.0, left[first] - PLAYER_SIZE, left[first] + TILE_SIZE),
+        ).astype(np.float64)
+        target = player[first]
+        best[target] = enter[first]
+        best_axis[target] = axis[first]
+        best_edge[target] = edge
+        return best, best_axis, best_edge
+
+    def _path_hits(
+        self, moving: np.ndarray, x1: np.ndarray, y1: np.ndarray, cells: tuple[np.ndarray, np.ndarray, np.ndarray]
+    ) -> None:
+        # Mirrors Simulation: spikes and the goal are tested against each
+        # straight piece of the path, not just where the step ends. cells are
+        # spike (player, row, col) candidates for at least this piece.
+        player, rows, cols = (values[moving[cells[0]]] for values in cells)
+        if len(player):
+            x0, y0 = self.x[player], self.y[player]
+            dx, dy = x1[player] - x0, y1[player] - y0
+            box_x = cols * TILE_SIZE + _HITBOX.x
+            box_y = rows * TILE_SIZE + _HITBOX.y
+            enter, leave, _ = _sweep(x0, y0, dx, dy, box_x, box_y, _HITBOX.width, _HITBOX.height)
+            broad = np.flatnonzero((enter < leave) & (enter < 1.0) & (leave > 0.0))
+            if len(broad):
+                touched = _touches_spike(
+                    x0[broad], y0[broad], dx[broad], dy[broad], cols[broad] * TILE_SIZE, rows[broad] * TILE_SIZE
+                )
+                self._spiked[player[broad[touched]]] = True
+
+        x0, y0 = self.x[moving], self.y[moving]
+        x1, y1 = x1[moving], y1[moving]
+        end_row, end_col = self.grid.end
+        end_left = end_col * TILE_SIZE
+        # Players only move forward; skip the sweep until one can get there.
+        if not len(x1) or x1.max() + PLAYER_SIZE < end_left:
+            return
+        dx, dy = x1 - x0, y1 - y0
+        enter, leave, _ = _sweep(x0, y0, dx, dy, end_left, end_row * TILE_SIZE, TILE_SIZE, TILE_SIZE)
+        self._reached_end[moving] |= (enter < leave) & (enter < 1.0) & (leave > 0.0)
+
+    def _try_consume_jump(self) -> None:
+        jump = (self.jump_buffer_timer > 0.0) & (self.grounded | (self.coyote_timer > 0.0))
+        self.velocity_y[jump] = JUMP_VELOCITY
+        self.grounded[jump] = False
+        self.coyote_timer[jump] = 0.0
+        self.jump_buffer_timer[jump] = 0.0
+
+    def _advance(self, dt: float, jump_held: np.ndarray) -> None:
+        self.jump_buffer_timer = np.where(jump_held, JUMP_BUFFER_TIME, np.maximum(0.0, self.jump_buffer_timer - dt))
+        self.coyote_timer = np.where(self.grounded, COYOTE_TIME, np.maximum(0.0, self.coyote_timer - dt))
+        self._try_consume_jump()
+
+        dx = np.full(self.count, FORWARD_SPEED * dt)
+        dy, velocity_y = _fall(self.velocity_y, dt)
+        self.grounded[:] = False
+
+        # Same contact order as Player._advance: up to two contacts, each
+        # stopping one axis, then the rest of the move. Every piece stays
+        # inside the box around the whole move, so the cells found for that
+        # box serve all of them; cells a piece misses fail its sweep test.
+        solids = self._candidate_cells(self._solid, self.x, self.y, self.x + dx, self.y + dy)
+        spikes = self._candidate_cells(self._spike, self.x, self.y, self.x + dx, self.y + dy)
+        for _ in range(2):
+            enter, axis, edge = self._first_contact(solids, dx, dy)
+            found = enter < np.inf
+            if not found.any():
+                break
+            enter = np.where(found, enter, 0.0)
+            vertical = found & (axis == Y_AXIS)
+            horizontal = found & (axis == X_AXIS)
+            new_x = np.where(vertical, self.x + dx * enter, np.where(horizontal, edge, self.x))
+            new_y = np.where(vertical, edge, np.where(horizontal, self.y + dy * enter, self.y))
+            self._path_hits(found, new_x, new_y, spikes)
+            self.x, self.y = new_x, new_y
+            self.grounded |= vertical & (dy > 0.0)
+            self._hit_head |= vertical & (dy < 0.0)
+            self._hit_wall |= horizontal
+            velocity_y = np.where(vertical, 0.0, velocity_y)
+            dx, dy = (
+                np.where(vertical, dx * (1.0 - enter), np.where(horizontal, 0.0, dx)),
+                np.where(vertical, 0.0, np.where(horizontal, dy * (1.0 - enter), dy)),
+            )
+            # Only players that just stopped on something can meet another.
+            solids = tuple(values[found[solids[0]]] for values in solids)
+        new_x = self.x + dx
+        new_y = self.y + dy
+        self._path_hits(np.ones(self.count, dtype=bool), new_x, new_y, spikes)
+        self.x, self.y = new_x, new_y
+        self.velocity_y = velocity_y
+
+        self.coyote_timer[self.grounded] = COYOTE_TIME
+        self._try_consume_jump()
+
+    def step(self, jump_held: np.ndarray, jump_pressed: np.ndarray | None = None) -> np.ndarray:
+        dt = self.step_seconds
+        if jump_pressed is not None:
+            self.jump_buffer_timer[jump_pressed] = JUMP_BUFFER_TIME
+
+        # Finished players stay where they ended; only the rest are advanced,
+        # on packed copies of their state that are scattered back afterwards.
+        running = np.flatnonzero(self.outcome == RUNNING)
+        packed = len(running) < self.count
+        if packed:
+            state = {name: getattr(self, name) for name in _STATE}
+            for name, values in state.items():
+                setattr(self, name, values[running])
+            count, self.count = self.count, len(running)
+            jump_held = np.asarray(jump_held)[running]
+
+        self._hit_head = np.zeros(self.count, dtype=bool)
+        self._hit_wall = np.zeros(self.count, dtype=bool)
+        self._spiked = np.zeros(self.count, dtype=bool)
+        self._reached_end = np.zeros(self.count, dtype=bool)
+        segments = max(1, math.ceil(dt / SWEEP_MAX_STEP - 1e-9))
+        for _ in range(segments):
+            self._advance(dt / segments, jump_held)
+        self.steps += 1
+
+        x, y = self.x, self.y
+        top = np.floor(y).astype(np.int64)
+        cause = np.full(self.count, CAUSE_NONE, dtype=np.int8)
+        cause[top > SCREEN_HEIGHT] = CAUSE_FALL
+        cause[self._hit_wall] = CAUSE_HIT_WALL
+        cause[self._hit_head] = CAUSE_HIT_HEAD
+        cause[self._spiked] = CAUSE_SPIKE
+        win = self._reached_end
+
+        if packed:
+            for name, values in state.items():
+                values[running] = getattr(self, name)
+                setattr(self, name, values)
+            self.count = count
+        finished = np.flatnonzero(win | (cause != CAUSE_NONE))
+        if len(finished):
+            players = running[finished]
+            self.outcome[players] = np.where(win[finished], WIN, DEAD)
+            self.death_cause[players] = np.where(win[finished], CAUSE_NONE, cause[finished])
+            self.final_step[players] = self.steps
+            self.final_x[players] = np.floor(x[finished]).astype(np.int64)
+            self.final_y[players] = top[finished]
+        return self.outcome
+
+    def run(self, schedule: np.ndarray) -> np.ndarray:
+        for jump_held in schedule:
+            if not (self.step(jump_held) == RUNNING).any():
+                break
+        return self.outcome
+
+
+def verify_level(level_path: Path, step_seconds: float, runs: int, seed: int = 0) -> list[str]:
+    # Steps the same random inputs through BatchSimulation and one Simulation
+    # per run and lists every run where outcome, cause, step count or
+    # position differ. Positions are compared exactly: the final top-left for
+    # finished runs, the float position for ones still running.
+    level = load_level(level_path)
+    rng = np.random.default_rng(seed)
+    steps = math.ceil(VERIFY_SECONDS / step_seconds)
+    held = rng.random((steps, runs)) < rng.uniform(0.02, 0.5, size=runs)
+    pressed = rng.random((steps, runs)) < 0.05
+    batch = BatchSimulation(OccupancyGrid.from_file(level_path), runs, step_seconds)
+    for step in range(steps):
+        if not (batch.step(held[step], pressed[step]) == RUNNING).any():
+            break
+
+    mismatches = []
+    for run in range(runs):
+        simulation = Simulation(level, step_seconds)
+        for step in range(batch.steps):
+            if simulation.step(bool(held[step, run]), bool(pressed[step, run])) != Outcome.RUNNING:
+                break
+        scalar = (OUTCOMES.index(simulation.outcome), CAUSES.index(simulation.death_cause), simulation.steps)
+        if simulation.outcome == Outcome.RUNNING:
+            scalar += (simulation.player.x, simulation.player.y)
+            batched = (int(batch.outcome[run]), int(batch.death_cause[run]), batch.steps, batch.x[run], batch.y[run])
+        else:
+            scalar += simulation.player.rect.topleft
+            batched = (
+                int(batch.outcome[run]),
+                int(batch.death_cause[run]),
+                int(batch.final_step[run]),
+                int(batch.final_x[run]),
+                int(batch.final_y[run]),
+            )
+        if scalar != batched:
+            mismatches.append(f"{level_path.name} step {step_seconds:.4f}s run {run}: scalar {scalar}, batch {batched}")
+    return mismatches
+
+
+def verify(runs: int) -> int:
+    mismatches = []
+    for level_path in collect_paths([LEVELS_DIR]):
+        for step_seconds in VERIFY_STEP_SECONDS:
+            found = verify_level(level_path, step_seconds, runs)
+            print(f"{level_path.name:<24} step {step_seconds:.4f}s  {runs - len(found)}/{runs} runs match")
+            mismatches.extend(found)
+    for line in mismatches[:20]:
+        print(f"  {line}")
+    return len(mismatches)
+
+
+def throughput(level_path: Path, players: int, steps: int, seed: int = 0) -> tuple[float, float]:
+    # Player-steps per millisecond over a run of random inputs, counting
+    # every player on every step, and the same with dead players put back
+    # at the start each step so all of them stay alive.
+    grid = OccupancyGrid.from_file(level_path)
+    rates = []
+    for restart in (False, True):
+        rng = np.random.default_rng(seed)
+        batch = BatchSimulation(grid, players)
+        start = time.perf_counter()
+        for _ in range(steps):
+            batch.step(rng.random(players) < 0.1)
+            if restart:
+                batch.reset_where(batch.outcome != RUNNING)
+        rates.append(players * steps / ((time.perf_counter() - start) * 1000))
+    return rates[0], rates[1]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure or check the batch simulator.")
+    parser.add_argument("level", nargs="?", type=Path, default=LEVEL_PATH, help="level to time on")
+    parser.add_argument("--players", type=int, default=100_000, help="players stepped together")
+    parser.add_argument("--steps", type=int, default=200, help="steps to time")
+    parser.add_argument(
+        "--verify",
+        action="store_true",
+        help="check that it agrees with Simulation on the bundled levels instead of timing it",
+    )
+    parser.add_argument("--runs", type=int, default=VERIFY_RUNS, help="random runs per level and step length")
+    args = parser.parse_args()
+
+    if args.verify:
+        sys.exit(1 if verify(args.runs) else 0)
+    finishing, alive = throughput(args.level, args.players, args.steps)
+    print(f"{args.players:,} players, {args.steps} steps on {args.level.name}")
+    print(f"  {finishing:,.0f} player-steps/ms as runs finish")
+    print(f"  {alive:,.0f} player-steps/ms with every run alive")
+
+
+if __name__ == "__main__":
+    main()
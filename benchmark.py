@@ -0,0 +1,291 @@
+import argparse
+import json
+import math
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+# Everything here runs without a window; the dummy driver must be chosen
+# before pygame is imported anywhere.
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import pygame
+
+from level import draw_level, load_level, read_level_rows
+from map_viewer import build_world_surface, load_grid, save_grid
+from player import Player
+from settings import LEVEL_PATH, PHYSICS_STEP, SCREEN_HEIGHT, SCREEN_WIDTH, TILE_SIZE
+from web_assets import FAST_START_ENV, STARTUP_TRACE_ENV, has_assets
+
+DEFAULT_LENGTHS = (250, 1000, 4000, 16000)
+DEFAULT_DENSITIES = (0.05, 0.25)
+DEFAULT_THRESHOLD = 0.25
+# A full world surface is cols * TILE_SIZE pixels wide; past this it is a
+# memory test rather than a drawing one.
+WORLD_SURFACE_MAX_COLS = 1000
+PLAYER_STEPS = 3000
+DRAW_FRAMES = 60
+STARTUP_RUNS = 5
+# Seconds a traced launch gets to reach its first full frame.
+STARTUP_TIMEOUT = 30.0
+MAIN_PATH = Path(__file__).with_name("main.py")
+ROWS = SCREEN_HEIGHT // TILE_SIZE
+# Obstacles are placed in the rows the player can actually reach.
+OBSTACLE_ROWS = range(ROWS - 5, ROWS - 1)
+
+
+def synthetic_rows(cols: int, density: float, seed: int = 0) -> list[str]:
+    rng = random.Random(seed * 1_000_003 + cols)
+    grid = [["."] * cols for _ in range(ROWS)]
+    grid[-1] = ["#"] * cols
+    for row in OBSTACLE_ROWS:
+        line = grid[row]
+        for col in range(4, cols - 4):
+            if rng.random() < density:
+                line[col] = "#" if rng.random() < 0.6 else "^"
+    grid[ROWS - 2][1] = "S"
+    grid[ROWS - 2][cols - 2] = "E"
+    return ["".join(line) for line in grid]
+
+
+def best_of(repeat: int, run: Callable[[], object]) -> float:
+    best = math.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def bench_player_update(level_path: Path, steps: int) -> Callable[[], None]:
+    level = load_level(level_path)
+
+    def run() -> None:
+        player = Player(*level.start_pos)
+        for step in range(steps):
+            player.update(PHYSICS_STEP, level.solid_index, step % 40 < 6)
+            if player.hit_wall or player.rect.top > SCREEN_HEIGHT or player.rect.left >= level.width_px:
+                player.reset(*level.start_pos)
+
+    return run
+
+
+def bench_draw_level(level_path: Path, frames: int) -> Callable[[], None]:
+    level = load_level(level_path)
+    screen = pygame.display.get_surface()
+    span = max(1, level.width_px - SCREEN_WIDTH)
+
+    def run() -> None:
+        for frame in range(frames):
+            draw_level(screen, level, frame * span // frames)
+
+    return run
+
+
+def run_case(directory: Path, cols: int, density: float, repeat: int) -> dict[str, dict]:
+    rows = synthetic_rows(cols, density)
+    text_path = directory / f"synthetic_{cols}_{density}.txt"
+    text_path.write_text("\n".join(rows) + "\n")
+    saved_path = directory / f"saved_{cols}_{density}.txt"
+    grid = load_grid(text_path)
+    cells = cols * ROWS
+
+    # Each entry: seconds for one run, the unit a run does, and how many.
+    measured = {
+        "load_level": (best_of(repeat, lambda: load_level(text_path)), "cells", cells),
+        "load_grid": (best_of(repeat, lambda: load_grid(text_path)), "cells", cells),
+        "save_grid": (best_of(repeat, lambda: save_grid(saved_path, grid)), "cells", cells),
+        "player_update": (best_of(repeat, bench_player_update(text_path, PLAYER_STEPS)), "steps", PLAYER_STEPS),
+        "draw_level": (best_of(repeat, bench_draw_level(text_path, DRAW_FRAMES)), "frames", DRAW_FRAMES),
+    }
+    if cols <= WORLD_SURFACE_MAX_COLS:
+        measured["build_world_surface"] = (best_of(repeat, lambda: build_world_surface(grid)), "cells", cells)
+
+    results = {}
+    for name, (seconds, unit, count) in measured.items():
+        results[f"{name}/{cols}/{density}"] = {
+            "benchmark": name,
+            "cols": cols,
+            "density": density,
+            "seconds": seconds,
+            "per_op_us": seconds / count * 1e6,
+            "throughput": count / seconds if seconds > 0 else math.inf,
+            "unit": unit,
+        }
+    return results
+
+
+def bench_startup(runs: int, fast: bool) -> dict[str, float]:
+    # Wall time from launching the game to each startup milestone it prints,
+    # interpreter start and imports included; the fastest run is kept. A
+    # launch that never reaches the end of its trace is killed and skipped.
+    env = dict(os.environ, SDL_AUDIODRIVER="dummy", **{STARTUP_TRACE_ENV: "1", FAST_START_ENV: "1" if fast else "0"})
+    best: dict[str, float] = {}
+    for _ in range(runs):
+        launched = time.time()
+        command = [sys.executable, str(MAIN_PATH)]
+        with subprocess.Popen(command, env=env, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True) as process:
+            try:
+                output, _ = process.communicate(timeout=STARTUP_TIMEOUT)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.communicate()
+                print(f"startup run timed out after {STARTUP_TIMEOUT:g}s; skipped", file=sys.stderr)
+                continue
+        for line in output.splitlines():
+            if line.startswith("startup "):
+                _, stage, _, stamp = line.split()
+                best[stage] = min(best.get(stage, math.inf), float(stamp) - launched)
+    return best
+
+
+def startup_results(runs: int) -> dict[str, dict]:
+    cols = len(read_level_rows(LEVEL_PATH)[0])
+    results = {}
+    # With prebuilt web assets present, the fast start is timed as well.
+    for fast in (False, True) if has_assets() else (False,):
+        for stage, seconds in bench_startup(runs, fast).items():
+            name = f"startup_{stage}" + ("_fast" if fast else "")
+            results[name] = {
+                "benchmark": name,
+                "cols": cols,
+                "density": 0.0,
+                "seconds": seconds,
+                "per_op_us": seconds * 1e6,
+                "throughput": 1 / seconds if seconds > 0 else math.inf,
+                "unit": "starts",
+            }
+    return results
+
+
+def scaling_exponents(results: dict[str, dict]) -> dict[str, float]:
+    # Least-squares slope of log(time) against log(cols): ~1 is linear in
+    # level length, ~0 means the cost does not grow with the level.
+    series: dict[str, list[tuple[float, float]]] = {}
+    for entry in results.values():
+        key = f"{entry['benchmark']}/{entry['density']}"
+        series.setdefault(key, []).append((math.log(entry["cols"]), math.log(max(entry["seconds"], 1e-9))))
+    exponents = {}
+    for key, points in series.items():
+        if len(points) < 2:
+            continue
+        mean_x = sum(x for x, _ in points) / len(points)
+        mean_y = sum(y for _, y in points) / len(points)
+        spread = sum((x - mean_x) ** 2 for x, _ in points)
+        if spread > 0:
+            exponents[key] = sum((x - mean_x) * (y - mean_y) for x, y in points) / spread
+    return exponents
+
+
+def compare(
+    results: dict[str, dict],
+    baseline: dict[str, dict],
+    threshold: float,
+    overrides: dict[str, float],
+) -> list[str]:
+    regressions = []
+    for key, entry in results.items():
+        previous = baseline.get(key)
+        if previous is None:
+            continue
+        limit = overrides.get(entry["benchmark"], threshold)
+        ratio = entry["seconds"] / previous["seconds"] if previous["seconds"] > 0 else 1.0
+        if ratio > 1.0 + limit:
+            regressions.append(f"{key}: {ratio:.2f}x baseline (allowed {1.0 + limit:.2f}x)")
+    return regressions
+
+
+def print_report(results: dict[str, dict], exponents: dict[str, float], baseline: dict[str, dict]) -> None:
+    print(f"{'benchmark':<20}{'cols':>7}{'density':>9}{'per op':>12}{'throughput':>22}{'vs base':>9}")
+    startup = {key: entry for key, entry in results.items() if entry["unit"] == "starts"}
+    for key, entry in results.items():
+        if key in startup:
+            continue
+        previous = baseline.get(key)
+        versus = f"{entry['seconds'] / previous['seconds']:.2f}x" if previous and previous["seconds"] > 0 else "-"
+        throughput = f"{entry['throughput']:,.0f} {entry['unit']}/s"
+        print(
+            f"{entry['benchmark']:<20}{entry['cols']:>7}{entry['density']:>9}"
+            f"{entry['per_op_us']:>10.3f}us{throughput:>22}{versus:>9}"
+        )
+    if startup:
+        print()
+        print("startup (launch to milestone, best run):")
+        for key, entry in startup.items():
+            previous = baseline.get(key)
+            versus = f"{entry['seconds'] / previous['seconds']:.2f}x" if previous and previous["seconds"] > 0 else "-"
+            print(f"  {entry['benchmark']:<28}{entry['seconds'] * 1000:>8.1f}ms{versus:>9}")
+    print()
+    print("scaling exponent (time ~ cols^k):")
+    for key, exponent in exponents.items():
+        print(f"  {key:<28}{exponent:>6.2f}")
+
+
+def parse_overrides(values: list[str]) -> dict[str, float]:
+    overrides = {}
+    for value in values:
+        name, _, limit = value.partition("=")
+        if not limit:
+            raise SystemExit(f"--threshold-for expects name=fraction, got {value!r}")
+        overrides[name] = float(limit)
+    return overrides
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Time the level, editor and physics hot paths on synthetic levels.")
+    parser.add_argument("--lengths", type=int, nargs="+", default=list(DEFAULT_LENGTHS), help="level lengths in columns")
+    parser.add_argument("--densities", type=float, nargs="+", default=list(DEFAULT_DENSITIES), help="obstacle density")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per measurement; the fastest is kept")
+    parser.add_argument("--startup-runs", type=int, default=STARTUP_RUNS, help="game launches to time startup; 0 skips")
+    parser.add_argument("--output", type=Path, help="write results as JSON")
+    parser.add_argument("--baseline", type=Path, help="compare against a results JSON")
+    parser.add_argument("--save-baseline", type=Path, help="write results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="allowed slowdown, e.g. 0.25")
+    parser.add_argument(
+        "--threshold-for",
+        action="append",
+        default=[],
+        metavar="NAME=FRACTION",
+        help="per-benchmark allowed slowdown, e.g. player_update=0.5",
+    )
+    args = parser.parse_args()
+    overrides = parse_overrides(args.threshold_for)
+
+    pygame.init()
+    pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    results: dict[str, dict] = {}
+    with tempfile.TemporaryDirectory() as directory:
+        for cols in args.lengths:
+            for density in args.densities:
+                results.update(run_case(Path(directory), cols, density, args.repeat))
+    pygame.quit()
+    if args.startup_runs > 0:
+        results.update(startup_results(args.startup_runs))
+
+    baseline = json.loads(args.baseline.read_text())["results"] if args.baseline else {}
+    exponents = scaling_exponents(results)
+    print_report(results, exponents, baseline)
+
+    report = {"results": results, "scaling": exponents}
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2) + "\n")
+    if args.save_baseline:
+        args.save_baseline.write_text(json.dumps(report, indent=2) + "\n")
+
+    regressions = compare(results, baseline, args.threshold, overrides)
+    if regressions:
+        print()
+        print("regressions:")
+        for line in regressions:
+            print(f"  {line}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+from collections.abc import Iterable
+
+import pygame
+
+from settings import TILE_SIZE
+
+
+def merge_runs(tiles: Iterable[pygame.Rect]) -> list[pygame.Rect]:
+    # Joins horizontally adjacent tiles of a row into one rect. Swept contact
+    # against a run is identical to the earliest contact against its tiles:
+    # a box can only reach an inner seam after entering the tile beside it,
+    # and every tile of a run shares the same top and bottom edges.
+    runs: list[pygame.Rect] = []
+    for tile in sorted(tiles, key=lambda rect: (rect.y, rect.x)):
+        last = runs[-1] if runs else None
+        if last is not None and last.y == tile.y and last.height == tile.height and last.right == tile.left:
+            last.width += tile.width
+        else:
+            runs.append(tile.copy())
+    return runs
+
+
+def merge_rects(tiles: Iterable[pygame.Rect]) -> list[pygame.Rect]:
+    # Greedy maximal rectangles: row runs, then runs stacked directly on top
+    # of one another with the same span. Only used for drawing; a stacked
+    # seam can decide whether a corner hit lands or hits a wall, so
+    # collision keeps to merge_runs.
+    open_runs: dict[tuple[int, int], pygame.Rect] = {}
+    merged: list[pygame.Rect] = []
+    for run in merge_runs(tiles):
+        above = open_runs.pop((run.x, run.width), None)
+        if above is not None and above.bottom == run.top:
+            above.height += run.height
+            open_runs[(run.x, run.width)] = above
+            continue
+        merged.append(run)
+        open_runs[(run.x, run.width)] = run
+    merged.sort(key=lambda rect: (rect.y, rect.x))
+    return merged
+
+
+def collider_tiles(collider: pygame.Rect) -> list[tuple[int, int]]:
+    # (row, col) of every tile a merged collider stands for.
+    return [
+        (row, col)
+        for row in range(collider.top // TILE_SIZE, collider.bottom // TILE_SIZE)
+        for col in range(collider.left // TILE_SIZE, collider.right // TILE_SIZE)
+    ]
+
+
+def tile_colliders(colliders: Iterable[pygame.Rect]) -> dict[tuple[int, int], pygame.Rect]:
+    return {tile: collider for collider in colliders for tile in collider_tiles(collider)}
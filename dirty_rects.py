@@ -0,0 +1,52 @@
+import pygame
+
+from settings import DIRTY_RECT_UPDATES
+
+
+class DirtyRects:
+    def __init__(self, enabled: bool = DIRTY_RECT_UPDATES) -> None:
+        self.enabled = enabled
+        self.uploaded_area = 0
+        self._rects: list[pygame.Rect] = []
+        # key -> (rect drawn last frame, what was drawn there)
+        self._previous: dict[str, tuple[pygame.Rect, object]] = {}
+        self._camera_x: int | None = None
+        self._band = pygame.Rect(0, 0, 0, 0)
+        self._full = True
+
+    def invalidate(self) -> None:
+        self._full = True
+
+    def scroll(self, camera_x: int, band: pygame.Rect) -> None:
+        # Tiles scrolled out of last frame's band and into this frame's.
+        if camera_x != self._camera_x:
+            self._camera_x = camera_x
+            self._rects.append(band.union(self._band) if self._band else band.copy())
+        self._band = band.copy()
+
+    def track(self, key: str, rect: pygame.Rect | None, content: object = None) -> None:
+        # A drawn item is dirty where it was and where it is whenever its
+        # place or content changed; an item that went away clears its old spot.
+        current = None if rect is None else (rect.copy(), content)
+        previous = self._previous.get(key)
+        if current == previous:
+            return
+        if previous is not None:
+            self._rects.append(previous[0])
+        if current is None:
+            del self._previous[key]
+        else:
+            self._previous[key] = current
+            self._rects.append(current[0])
+
+    def flush(self, surface: pygame.Surface) -> None:
+        if not self.enabled or self._full:
+            pygame.display.flip()
+            self.uploaded_area = surface.get_width() * surface.get_height()
+            self._full = False
+        else:
+            rects = [rect for rect in self._rects if rect]
+            if rects:
+                pygame.display.update(rects)
+            self.uploaded_area = sum(rect.width * rect.height for rect in rects)
+        self._rects.clear()
@@ -0,0 +1,353 @@
+import argparse
+import multiprocessing
+import os
+import time
+from multiprocessing.connection import Connection
+from multiprocessing.shared_memory import SharedMemory
+from pathlib import Path
+
+import numpy as np
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+from batch_physics import DEAD, PLAYER_SIZE, RUNNING, WIN, BatchSimulation, OccupancyGrid
+from colliders import collider_tiles
+from level import LevelData, load_level
+from level_binary import EMPTY, END, SOLID, SPIKE, TILE_CHARS
+from settings import (
+    ENV_DEATH_REWARD,
+    ENV_VIEW_AHEAD,
+    ENV_VIEW_BEHIND,
+    ENV_WIN_REWARD,
+    LEVEL_PATH,
+    PHYSICS_STEP,
+    TILE_SIZE,
+)
+from simulation import Outcome, Simulation
+
+# Observations are tile codes from level_binary, plus this one for the cell
+# holding the player's centre.
+PLAYER = len(TILE_CHARS)
+VIEW_COLS = ENV_VIEW_BEHIND + 1 + ENV_VIEW_AHEAD
+OUTCOME_CODES = {Outcome.RUNNING: RUNNING, Outcome.DEAD: DEAD, Outcome.WIN: WIN}
+
+
+def observation_table(level: LevelData) -> np.ndarray:
+    rows = level.height_px // TILE_SIZE
+    table = np.full((rows, level.width_px // TILE_SIZE), EMPTY, dtype=np.uint8)
+    for solid in level.solids:
+        for row, col in collider_tiles(solid):
+            table[row, col] = SOLID
+    for spike in level.spikes:
+        table[spike.y // TILE_SIZE, spike.x // TILE_SIZE] = SPIKE
+    table[level.end_zone.y // TILE_SIZE, level.end_zone.x // TILE_SIZE] = END
+    return table
+
+
+def occupancy_grid(level: LevelData, table: np.ndarray) -> OccupancyGrid:
+    start_x, start_y = level.start_pos
+    return OccupancyGrid(
+        solid=table == SOLID,
+        spike=table == SPIKE,
+        start=(start_y // TILE_SIZE, start_x // TILE_SIZE),
+        end=(level.end_zone.y // TILE_SIZE, level.end_zone.x // TILE_SIZE),
+    )
+
+
+def observe(table: np.ndarray, x: np.ndarray, y: np.ndarray, out: np.ndarray) -> None:
+    # out[i] is the level's full height by VIEW_COLS columns around player i;
+    # columns off either end of the level read as empty.
+    rows, cols = table.shape
+    center_col = (np.floor(x).astype(np.int64) + PLAYER_SIZE // 2) // TILE_SIZE
+    view = center_col[:, None] + np.arange(-ENV_VIEW_BEHIND, ENV_VIEW_AHEAD + 1)
+    inside = (view >= 0) & (view < cols)
+    gathered = table.T[np.clip(view, 0, cols - 1)].transpose(0, 2, 1)
+    np.copyto(out, np.where(inside[:, None, :], gathered, EMPTY))
+    center_row = (np.floor(y).astype(np.int64) + PLAYER_SIZE // 2) // TILE_SIZE
+    visible = np.flatnonzero((center_row >= 0) & (center_row < rows))
+    out[visible, center_row[visible], ENV_VIEW_BEHIND] = PLAYER
+
+
+def step_rewards(progress: np.ndarray, width_px: int, outcome: np.ndarray) -> np.ndarray:
+    bonus = np.where(outcome == WIN, ENV_WIN_REWARD, np.where(outcome == DEAD, ENV_DEATH_REWARD, 0.0))
+    return (progress / width_px + bonus).astype(np.float32)
+
+
+class GameEnv:
+    # One run of the real game loop's Simulation. Actions are 1 to hold jump
+    # and 0 to let go; going from 0 to 1 is a press, like a key going down.
+    def __init__(self, level: LevelData, step_seconds: float = PHYSICS_STEP, max_steps: int | None = None) -> None:
+        self.level = level
+        self.table = observation_table(level)
+        self.simulation = Simulation(level, step_seconds)
+        self.max_steps = max_steps
+        self.observation_shape = (self.table.shape[0], VIEW_COLS)
+        self._held = False
+
+    @classmethod
+    def from_file(cls, path: Path, step_seconds: float = PHYSICS_STEP, max_steps: int | None = None) -> "GameEnv":
+        return cls(load_level(path), step_seconds, max_steps)
+
+    def _observe(self) -> np.ndarray:
+        player = self.simulation.player
+        out = np.empty((1, *self.observation_shape), dtype=np.uint8)
+        observe(self.table, np.array([player.x]), np.array([player.y]), out)
+        return out[0]
+
+    def _info(self) -> dict:
+        simulation = self.simulation
+        return {
+            "steps": simulation.steps,
+            "outcome": simulation.outcome,
+            "death_cause": simulation.death_cause,
+            "position": (simulation.player.x, simulation.player.y),
+            "velocity_y": simulation.player.velocity_y,
+        }
+
+    def reset(self) -> tuple[np.ndarray, dict]:
+        self.simulation.reset()
+        self._held = False
+        return self._observe(), self._info()
+
+    def step(self, action: int) -> tuple[np.ndarray, float, bool, bool, dict]:
+        simulation = self.simulation
+        if simulation.outcome != Outcome.RUNNING:
+            raise RuntimeError("Run is over; call reset() first.")
+        held = bool(action)
+        pressed = held and not self._held
+        self._held = held
+        before = simulation.player.x
+        outcome = simulation.step(held, pressed)
+        reward = step_rewards(
+            np.array([simulation.player.x - before]),
+            self.level.width_px,
+            np.array([OUTCOME_CODES[outcome]]),
+        )[0]
+        terminated = outcome != Outcome.RUNNING
+        truncated = not terminated and self.max_steps is not None and simulation.steps >= self.max_steps
+        return self._observe(), float(reward), terminated, truncated, self._info()
+
+
+class BatchEnv:
+    # Many runs stepped together by BatchSimulation, which matches Simulation
+    # exactly. Results are written into the arrays handed in, and finished
+    # runs start over straight away; the observation returned for them is the
+    # first one of the new run.
+    def __init__(
+        self,
+        level: LevelData,
+        arrays: dict[str, np.ndarray],
+        step_seconds: float = PHYSICS_STEP,
+        max_steps: int | None = None,
+    ) -> None:
+        self.level = level
+        self.arrays = arrays
+        self.table = observation_table(level)
+        self.count = len(arrays["actions"])
+        self.batch = BatchSimulation(occupancy_grid(level, self.table), self.count, step_seconds)
+        self.max_steps = max_steps
+        self.steps = np.zeros(self.count, dtype=np.int64)
+        self._held = np.zeros(self.count, dtype=bool)
+
+    def reset(self) -> None:
+        self.batch.reset()
+        self.steps[:] = 0
+        self._held[:] = False
+        arrays = self.arrays
+        arrays["rewards"][:] = 0.0
+        arrays["terminated"][:] = False
+        arrays["truncated"][:] = False
+        arrays["outcome"][:] = RUNNING
+        arrays["death_cause"][:] = 0
+        observe(self.table, self.batch.x, self.batch.y, arrays["observations"])
+
+    def step(self) -> None:
+        arrays = self.arrays
+        batch = self.batch
+        held = arrays["actions"] != 0
+        pressed = held & ~self._held
+        self._held = held
+        before = batch.x.copy()
+        batch.step(held, pressed)
+        self.steps += 1
+
+        outcome = batch.outcome
+        terminated = outcome != RUNNING
+        truncated = np.zeros_like(terminated)
+        if self.max_steps is not None:
+            truncated = ~terminated & (self.steps >= self.max_steps)
+        arrays["rewards"][:] = step_rewards(batch.x - before, self.level.width_px, outcome)
+        arrays["terminated"][:] = terminated
+        arrays["truncated"][:] = truncated
+        arrays["outcome"][:] = outcome
+        arrays["death_cause"][:] = batch.death_cause
+
+        done = terminated | truncated
+        if done.any():
+            batch.reset_where(done)
+            self.steps[done] = 0
+            self._held[done] = False
+        observe(self.table, batch.x, batch.y, arrays["observations"])
+
+
+def _layout(count: int, rows: int) -> list[tuple[str, str, tuple[int, ...]]]:
+    return [
+        ("observations", "u1", (count, rows, VIEW_COLS)),
+        ("actions", "i1", (count,)),
+        ("rewards", "f4", (count,)),
+        ("terminated", "?", (count,)),
+        ("truncated", "?", (count,)),
+        ("outcome", "i1", (count,)),
+        ("death_cause", "i1", (count,)),
+    ]
+
+
+def _views(buffer, layout: list[tuple[str, str, tuple[int, ...]]]) -> dict[str, np.ndarray]:
+    arrays = {}
+    offset = 0
+    for name, dtype, shape in layout:
+        arrays[name] = np.ndarray(shape, dtype=dtype, buffer=buffer, offset=offset)
+        # Keep every array 8-byte aligned.
+        offset += -(-arrays[name].nbytes // 8) * 8
+    return arrays
+
+
+def _layout_bytes(layout: list[tuple[str, str, tuple[int, ...]]]) -> int:
+    return sum(-(-int(np.prod(shape)) * np.dtype(dtype).itemsize // 8) * 8 for _, dtype, shape in layout)
+
+
+def _worker(
+    conn: Connection,
+    memory_name: str,
+    layout: list[tuple[str, str, tuple[int, ...]]],
+    first: int,
+    last: int,
+    level_path: str,
+    step_seconds: float,
+    max_steps: int | None,
+) -> None:
+    memory = SharedMemory(name=memory_name)
+    arrays = {name: array[first:last] for name, array in _views(memory.buf, layout).items()}
+    env = BatchEnv(load_level(Path(level_path)), arrays, step_seconds, max_steps)
+    try:
+        while True:
+            command = conn.recv()
+            if command == "step":
+                env.step()
+            elif command == "reset":
+                env.reset()
+            else:
+                break
+            conn.send(None)
+    finally:
+        # The views must go before the mapping can be closed.
+        del env, arrays
+        memory.close()
+
+
+class VectorEnv:
+    # `count` runs split over worker processes. Actions go in and results come
+    # back through one shared-memory block, so a step only sends a short
+    # command down each pipe; the returned arrays are overwritten by the next
+    # step, so copy anything that has to outlive it.
+    def __init__(
+        self,
+        level_path: Path,
+        count: int,
+        workers: int | None = None,
+        step_seconds: float = PHYSICS_STEP,
+        max_steps: int | None = None,
+    ) -> None:
+        level = load_level(level_path)
+        self.count = count
+        self.observation_shape = (level.height_px // TILE_SIZE, VIEW_COLS)
+        layout = _layout(count, self.observation_shape[0])
+        self._memory = SharedMemory(create=True, size=_layout_bytes(layout))
+        self._arrays = _views(self._memory.buf, layout)
+        self._connections: list[Connection] = []
+        self._processes: list[multiprocessing.Process] = []
+
+        workers = max(1, min(count, workers or os.cpu_count() or 1))
+        bounds = np.linspace(0, count, workers + 1).astype(int)
+        for first, last in zip(bounds[:-1], bounds[1:]):
+            parent, child = multiprocessing.Pipe()
+            process = multiprocessing.Process(
+                target=_worker,
+                args=(child, self._memory.name, layout, int(first), int(last), str(level_path), step_seconds, max_steps),
+                daemon=True,
+            )
+            process.start()
+            child.close()
+            self._connections.append(parent)
+            self._processes.append(process)
+
+    def _broadcast(self, command: str) -> None:
+        for conn in self._connections:
+            conn.send(command)
+        for conn in self._connections:
+            conn.recv()
+
+    def _info(self) -> dict[str, np.ndarray]:
+        return {"outcome": self._arrays["outcome"], "death_cause": self._arrays["death_cause"]}
+
+    def reset(self) -> tuple[np.ndarray, dict[str, np.ndarray]]:
+        self._broadcast("reset")
+        return self._arrays["observations"], self._info()
+
+    def step(self, actions: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, dict[str, np.ndarray]]:
+        self._arrays["actions"][:] = actions
+        self._broadcast("step")
+        arrays = self._arrays
+        return arrays["observations"], arrays["rewards"], arrays["terminated"], arrays["truncated"], self._info()
+
+    def close(self) -> None:
+        if self._memory is None:
+            return
+        for conn in self._connections:
+            conn.send("close")
+            conn.close()
+        for process in self._processes:
+            process.join()
+        self._arrays = {}
+        self._memory.close()
+        self._memory.unlink()
+        self._memory = None
+
+    def __enter__(self) -> "VectorEnv":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure environment steps per second with random actions.")
+    parser.add_argument("level", nargs="?", type=Path, default=LEVEL_PATH)
+    parser.add_argument("--envs", type=int, default=256, help="runs in the vectorized environment")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, os.cpu_count() or 1], help="worker counts to try")
+    parser.add_argument("--steps", type=int, default=500, help="vectorized steps per measurement")
+    parser.add_argument("--jump-rate", type=float, default=0.1, help="chance an action holds jump")
+    args = parser.parse_args()
+    rng = np.random.default_rng(0)
+
+    env = GameEnv.from_file(args.level)
+    env.reset()
+    start = time.perf_counter()
+    for _ in range(args.steps):
+        _, _, terminated, truncated, _ = env.step(int(rng.random() < args.jump_rate))
+        if terminated or truncated:
+            env.reset()
+    print(f"GameEnv: {args.steps / (time.perf_counter() - start):,.0f} steps/s")
+
+    for workers in args.workers:
+        with VectorEnv(args.level, args.envs, workers) as vector:
+            vector.reset()
+            start = time.perf_counter()
+            for _ in range(args.steps):
+                vector.step(rng.random(args.envs) < args.jump_rate)
+            elapsed = time.perf_counter() - start
+        print(f"VectorEnv {args.envs} envs, {workers} workers: {args.envs * args.steps / elapsed:,.0f} steps/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,231 @@
+import argparse
+import math
+import random
+import sys
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+
+from level import spike_hitbox
+from settings import (
+    FORWARD_SPEED,
+    GENERATOR_CHUNK_COLUMNS,
+    GRAVITY,
+    JUMP_VELOCITY,
+    PHYSICS_STEP,
+    SCREEN_HEIGHT,
+    TILE_SIZE,
+)
+
+PLAYER_SIZE = int(TILE_SIZE * 0.85)
+ROWS = SCREEN_HEIGHT // TILE_SIZE
+# Columns of flat ground before the first obstacle and after the last one.
+START_RUN = 6
+END_RUN = 4
+# Flat columns in front of every obstacle to jump from.
+RUN_UP = 2
+BLOCK_WIDTHS = (2, 6)
+STAIR_WIDTHS = (2, 4)
+_HITBOX = spike_hitbox(0, 0)
+_EMPTY, _SOLID, _SPIKE, _START, _END = (ord(char) for char in ".#^SE")
+
+
+@dataclass(frozen=True)
+class JumpLimits:
+    air_columns: int
+    max_spikes: int
+    max_block_height: int
+
+    @property
+    def max_obstacle(self) -> int:
+        return max(self.max_spikes, BLOCK_WIDTHS[1], STAIR_WIDTHS[1] * self.max_block_height)
+
+
+def clearance(height: float) -> float:
+    # Horizontal distance a jump from flat ground spends at least `height`
+    # pixels above its takeoff; 0 if it never gets that high.
+    speed = -JUMP_VELOCITY
+    disc = speed * speed - 2.0 * GRAVITY * height
+    if disc <= 0.0:
+        return 0.0
+    return FORWARD_SPEED * 2.0 * math.sqrt(disc) / GRAVITY
+
+
+@lru_cache(maxsize=None)
+def jump_limits(step_seconds: float = PHYSICS_STEP) -> JumpLimits:
+    # Patterns are sized from the real jump arc. Takeoff can only happen on
+    # a step boundary, so every window loses two steps of forward motion.
+    margin = 2.0 * FORWARD_SPEED * step_seconds
+    air = clearance(0.0)
+
+    # Spikes: the player's bottom has to stay above the triangle's bounds
+    # for as long as the two overlap horizontally, which is never shorter
+    # than what the triangle itself needs.
+    spike_window = clearance(TILE_SIZE - _HITBOX.y)
+    max_spikes = 0
+    while max_spikes * TILE_SIZE + _HITBOX.width + PLAYER_SIZE + margin <= spike_window:
+        max_spikes += 1
+
+    # Blocks: the player has to be above the top before reaching the face.
+    max_block_height = 0
+    while clearance((max_block_height + 1) * TILE_SIZE) > margin:
+        max_block_height += 1
+
+    return JumpLimits(
+        air_columns=math.ceil((air + PLAYER_SIZE) / TILE_SIZE),
+        max_spikes=max(1, max_spikes),
+        max_block_height=max(1, max_block_height),
+    )
+
+
+def _spikes(grid: np.ndarray, col: int, rng: random.Random, difficulty: float, limits: JumpLimits) -> int:
+    count = rng.randint(1, 1 + round(difficulty * (limits.max_spikes - 1)))
+    grid[-2, col:col + count] = _SPIKE
+    return count
+
+
+def _block(grid: np.ndarray, col: int, rng: random.Random, difficulty: float, limits: JumpLimits) -> int:
+    height = rng.randint(1, limits.max_block_height if difficulty >= 0.5 else 1)
+    width = rng.randint(*BLOCK_WIDTHS)
+    grid[-1 - height:-1, col:col + width] = _SOLID
+    return width
+
+
+def _stairs(grid: np.ndarray, col: int, rng: random.Random, difficulty: float, limits: JumpLimits) -> int:
+    # One step up at a time, each one low enough to jump from the last.
+    width = 0
+    for height in range(1, limits.max_block_height + 1):
+        step = rng.randint(*STAIR_WIDTHS)
+        grid[-1 - height:-1, col + width:col + width + step] = _SOLID
+        width += step
+    return width
+
+
+PATTERNS = (_spikes, _block, _stairs)
+
+
+def place_patterns(
+    grid: np.ndarray,
+    rng: random.Random,
+    first: int,
+    last: int,
+    difficulty: float,
+    limits: JumpLimits,
+) -> None:
+    # Fills grid columns [first, last) with obstacles, each one with a run-up
+    # in front and a full jump of flat ground behind it, so the player is
+    # back on the floor before the next one whatever jump it took.
+    spacing = round((1.0 - difficulty) * 8)
+    col = first
+    while True:
+        col += RUN_UP + rng.randint(0, spacing)
+        if col + limits.max_obstacle + limits.air_columns > last:
+            return
+        pattern = rng.choice(PATTERNS) if difficulty >= 0.5 else rng.choice(PATTERNS[:2])
+        col += pattern(grid, col, rng, difficulty, limits)
+        col += limits.air_columns
+
+
+def empty_grid(rows: int, cols: int) -> np.ndarray:
+    grid = np.full((rows, cols), _EMPTY, dtype=np.uint8)
+    grid[-1] = _SOLID
+    return grid
+
+
+def generate_rows(seed: int, cols: int = 200, difficulty: float = 0.5, rows: int = ROWS) -> list[str]:
+    limits = jump_limits()
+    cols = max(cols, START_RUN + END_RUN + 2)
+    grid = empty_grid(rows, cols)
+    place_patterns(grid, random.Random(seed), START_RUN, cols - END_RUN, difficulty, limits)
+    grid[-2, 1] = _START
+    grid[-2, cols - 2] = _END
+    return [row.tobytes().decode("ascii") for row in grid]
+
+
+class GeneratedColumnSource:
+    # An endless ColumnSource for StreamingLevel. The level is cut into
+    # chunks that each start and end on flat ground and are seeded from
+    # their own index, so any column can be produced without the ones
+    # before it.
+    def __init__(
+        self,
+        seed: int,
+        difficulty: float = 0.5,
+        rows: int = ROWS,
+        chunk_columns: int = GENERATOR_CHUNK_COLUMNS,
+    ) -> None:
+        self.seed = seed
+        self.difficulty = difficulty
+        self.rows = rows
+        self.cols: int | None = None
+        self.start = (rows - 2, 1)
+        self.end: tuple[int, int] | None = None
+        self.chunk_columns = chunk_columns
+        self._limits = jump_limits()
+
+    def chunk(self, index: int) -> np.ndarray:
+        grid = empty_grid(self.rows, self.chunk_columns)
+        rng = random.Random(self.seed * 1_000_003 + index)
+        place_patterns(grid, rng, START_RUN if index == 0 else 0, self.chunk_columns, self.difficulty, self._limits)
+        return grid
+
+    def read(self, first: int, count: int) -> list[str]:
+        columns: list[str] = []
+        col = max(0, first)
+        end = first + count
+        while col < end:
+            index, offset = divmod(col, self.chunk_columns)
+            take = min(end - col, self.chunk_columns - offset)
+            # Columns as strings top to bottom, the layout ColumnSource uses.
+            block = np.ascontiguousarray(self.chunk(index)[:, offset:offset + take].T)
+            columns.extend(block[i].tobytes().decode("ascii") for i in range(take))
+            col += take
+        return columns
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Generate beatable levels from a seed.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--count", type=int, default=1, help="levels to generate, seeds seed..seed+count-1")
+    parser.add_argument("--cols", type=int, default=200, help="level length in columns")
+    parser.add_argument("--difficulty", type=float, default=0.5, help="0.0 (easy) to 1.0 (hard)")
+    parser.add_argument("--output", type=Path, help="file for one level, or directory for several")
+    parser.add_argument("--verify", action="store_true", help="run the solver on every level")
+    args = parser.parse_args()
+    if not 0.0 <= args.difficulty <= 1.0:
+        raise SystemExit("--difficulty must be between 0 and 1")
+
+    start = time.perf_counter()
+    levels = [generate_rows(seed, args.cols, args.difficulty) for seed in range(args.seed, args.seed + args.count)]
+    elapsed = time.perf_counter() - start
+    print(f"Generated {len(levels)} levels in {elapsed:.3f}s ({len(levels) / elapsed:,.0f} levels/s)", file=sys.stderr)
+
+    if args.output is None:
+        if args.count == 1:
+            print("\n".join(levels[0]))
+    elif args.count == 1 and args.output.suffix:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text("\n".join(levels[0]) + "\n")
+    else:
+        args.output.mkdir(parents=True, exist_ok=True)
+        for seed, rows in enumerate(levels, start=args.seed):
+            (args.output / f"generated_{seed}.txt").write_text("\n".join(rows) + "\n")
+
+    if args.verify:
+        from solver import describe, solve_rows
+
+        failed = 0
+        for seed, rows in enumerate(levels, start=args.seed):
+            result = solve_rows(rows)
+            if not result.solvable:
+                failed += 1
+                print(f"seed {seed}: {describe(result)}")
+        print(f"{len(levels) - failed}/{len(levels)} levels solvable")
+        sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
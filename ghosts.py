@@ -0,0 +1,128 @@
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+import pygame
+
+from batch_physics import PLAYER_SIZE, BatchSimulation, OccupancyGrid
+from level import read_level_rows
+from replay import collect_replays, decode_replay, level_hash
+from settings import GHOST_ALPHA, GHOST_LIMIT, PHYSICS_STEP, PLAYER_SPRITE_ANGLE_STEP, REPLAY_DIR, SCREEN_WIDTH
+from sprites import player_sprites
+
+ROTATION_SPEED = 450.0
+
+
+@dataclass
+class GhostRuns:
+    # One row per run, one column per step; column 0 is the start. Runs
+    # shorter than the longest repeat their last position.
+    x: np.ndarray
+    y: np.ndarray
+    frame: np.ndarray
+    length: np.ndarray
+
+    @property
+    def count(self) -> int:
+        return len(self.length)
+
+
+def _inputs(events: list[tuple[int, bool, bool]], steps: int, total: int) -> tuple[np.ndarray, np.ndarray]:
+    held = np.zeros(total, dtype=bool)
+    pressed = np.zeros(total, dtype=bool)
+    for step, is_held, is_pressed in events:
+        if step < steps:
+            held[step:steps] = is_held
+            pressed[step] |= is_pressed
+    return held, pressed
+
+
+def simulate_runs(grid: OccupancyGrid, runs: list[tuple[list[tuple[int, bool, bool]], int]], step_seconds: float) -> GhostRuns:
+    # Replays every run at once in the batch simulator, keeping only the
+    # per-step position and sprite frame.
+    count = len(runs)
+    total = max((steps for _, steps in runs), default=0)
+    held = np.zeros((total, count), dtype=bool)
+    pressed = np.zeros((total, count), dtype=bool)
+    for index, (events, steps) in enumerate(runs):
+        held[:, index], pressed[:, index] = _inputs(events, steps, total)
+
+    frames = len(player_sprites(PLAYER_SIZE).frames)
+    x = np.empty((count, total + 1), dtype=np.float32)
+    y = np.empty((count, total + 1), dtype=np.float32)
+    frame = np.zeros((count, total + 1), dtype=np.uint16)
+    batch = BatchSimulation(grid, count, step_seconds)
+    x[:, 0] = batch.x
+    y[:, 0] = batch.y
+    rotation = np.zeros(count)
+    for step in range(total):
+        batch.step(held[step], pressed[step])
+        x[:, step + 1] = batch.x
+        y[:, step + 1] = batch.y
+        rotation = np.where(batch.grounded, 0.0, (rotation + ROTATION_SPEED * step_seconds) % 360.0)
+        frame[:, step + 1] = np.round(rotation / PLAYER_SPRITE_ANGLE_STEP).astype(np.int64) % frames
+
+    length = np.array([steps for _, steps in runs], dtype=np.int64)
+    columns = np.minimum(np.arange(total + 1), length[:, None])
+    rows = np.arange(count)[:, None]
+    return GhostRuns(x[rows, columns], y[rows, columns], frame[rows, columns], length)
+
+
+def load_ghost_runs(
+    level_path: Path,
+    directory: Path = REPLAY_DIR,
+    limit: int = GHOST_LIMIT,
+    step_seconds: float = PHYSICS_STEP,
+) -> GhostRuns:
+    # The newest recorded runs of this level that used the same step length.
+    digest = level_hash(read_level_rows(level_path))
+    runs = []
+    for path in reversed(collect_replays([directory]) if directory.is_dir() else []):
+        try:
+            replay = decode_replay(path.read_bytes())
+        except (OSError, ValueError):
+            continue
+        if replay.level_hash == digest and replay.step_seconds == step_seconds and replay.steps:
+            runs.append((replay.events, replay.steps))
+            if len(runs) >= limit:
+                break
+    return simulate_runs(OccupancyGrid.from_file(level_path), runs, step_seconds)
+
+
+class GhostLayer:
+    def __init__(self, runs: GhostRuns, alpha: int = GHOST_ALPHA) -> None:
+        self.runs = runs
+        self.sprites = player_sprites(PLAYER_SIZE, alpha=alpha)
+
+    def draw(self, surface: pygame.Surface, camera_x: int, step: int, alpha: float) -> pygame.Rect | None:
+        # Ghosts are shown where they were after the same number of steps as
+        # the live run, interpolated the same way, and only while still going.
+        runs = self.runs
+        if runs.count == 0 or step <= 0:
+            return None
+        last = runs.x.shape[1] - 1
+        current = min(step, last)
+        previous = min(step - 1, last)
+        alive = np.flatnonzero(runs.length >= step)
+        x0 = runs.x[alive, previous]
+        x = np.floor(x0 + (runs.x[alive, current] - x0) * alpha).astype(np.int64) + PLAYER_SIZE // 2 - camera_x
+        y0 = runs.y[alive, previous]
+        y = np.floor(y0 + (runs.y[alive, current] - y0) * alpha).astype(np.int64) + PLAYER_SIZE // 2
+        visible = (x > -PLAYER_SIZE) & (x < SCREEN_WIDTH + PLAYER_SIZE)
+        if not visible.any():
+            return None
+
+        frames = self.sprites.frames
+        indices = runs.frame[alive[visible], current].tolist()
+        sequence = []
+        for index, center_x, center_y in zip(indices, x[visible].tolist(), y[visible].tolist()):
+            image, ox, oy = frames[index]
+            sequence.append((image, (center_x + ox, center_y + oy)))
+        surface.blits(sequence, doreturn=False)
+
+        # Rotated frames are at most the square's diagonal across.
+        reach = int(PLAYER_SIZE * 0.75) + 1
+        left = int(x[visible].min()) - reach
+        top = int(y[visible].min()) - reach
+        bounds = pygame.Rect(left, top, int(x[visible].max()) + reach - left, int(y[visible].max()) + reach - top)
+        return bounds.clip(surface.get_rect())
@@ -0,0 +1,224 @@
+from pathlib import Path
+
+import numpy as np
+
+from batch_physics import OccupancyGrid
+from level import read_level_rows
+from level_binary import EMPTY, END, SOLID, SPIKE, START, TILE_CHARS, TILE_CODES
+
+_CHAR_TABLE = np.array(list(TILE_CHARS))
+_MARKERS = (START, END)
+
+
+def _run_ids(mask: np.ndarray) -> np.ndarray:
+    # Label every horizontal run of True cells with its own id (runs never
+    # continue across rows); cells outside the mask get id 0.
+    flat = np.zeros((mask.shape[0], mask.shape[1] + 1), dtype=bool)
+    flat[:, 1:] = mask
+    starts = flat[:, 1:] & ~flat[:, :-1]
+    ids = np.cumsum(starts.ravel(), dtype=np.int32).reshape(mask.shape)
+    return np.where(mask, ids, 0)
+
+
+class TileGrid:
+    def __init__(self, codes: np.ndarray) -> None:
+        self.codes = np.ascontiguousarray(codes, dtype=np.uint8)
+        self.start: tuple[int, int] | None = None
+        self.end: tuple[int, int] | None = None
+        self._find_markers()
+
+    @classmethod
+    def from_lines(cls, lines: list[str]) -> "TileGrid":
+        width = max(len(line) for line in lines)
+        text = "".join(line.ljust(width, ".") for line in lines)
+        # Codes only exist for the known tiles, so anything else would be
+        # saved back as empty; refuse the file instead of losing it.
+        unknown = sorted(set(text) - set(TILE_CHARS))
+        if unknown:
+            row, col = divmod(min(text.index(char) for char in unknown), width)
+            raise ValueError(
+                f"Unknown tiles {''.join(unknown)!r} in level (first at row {row + 1}, column {col + 1}); "
+                f"only {TILE_CHARS!r} can be edited."
+            )
+        raw = np.frombuffer(text.encode("ascii"), dtype=np.uint8)
+        lookup = np.zeros(256, dtype=np.uint8)
+        for char, code in TILE_CODES.items():
+            lookup[ord(char)] = code
+        return cls(lookup[raw].reshape(len(lines), width))
+
+    @classmethod
+    def from_file(cls, path: Path) -> "TileGrid":
+        return cls.from_lines(read_level_rows(path))
+
+    def to_lines(self) -> list[str]:
+        chars = _CHAR_TABLE[self.codes]
+        return ["".join(row) for row in chars]
+
+    def occupancy(self) -> OccupancyGrid:
+        if self.start is None:
+            raise ValueError("Level is missing 'S' start marker.")
+        if self.end is None:
+            raise ValueError("Level is missing 'E' end marker.")
+        return OccupancyGrid(solid=self.codes == SOLID, spike=self.codes == SPIKE, start=self.start, end=self.end)
+
+    @property
+    def rows(self) -> int:
+        return self.codes.shape[0]
+
+    @property
+    def cols(self) -> int:
+        return self.codes.shape[1]
+
+    def get(self, row: int, col: int) -> str:
+        return TILE_CHARS[self.codes[row, col]]
+
+    def _find_markers(self) -> None:
+        # Like load_level, the last marker in row-major order wins and any
+        # extra copies are cleared so each marker exists at most once.
+        for code in _MARKERS:
+            found = np.argwhere(self.codes == code)
+            position = None
+            if len(found):
+                position = (int(found[-1][0]), int(found[-1][1]))
+                self.codes[found[:-1, 0], found[:-1, 1]] = EMPTY
+            if code == START:
+                self.start = position
+            else:
+                self.end = position
+
+    def _forget_overwritten_markers(self) -> None:
+        if self.start is not None and self.codes[self.start] != START:
+            self.start = None
+        if self.end is not None and self.codes[self.end] != END:
+            self.end = None
+
+    def find(self, tile: str) -> tuple[int, int] | None:
+        code = TILE_CODES[tile]
+        if code == START:
+            return self.start
+        if code == END:
+            return self.end
+        found = np.argwhere(self.codes == code)
+        return (int(found[0][0]), int(found[0][1])) if len(found) else None
+
+    def place(self, row: int, col: int, tile: str) -> list[tuple[int, int]]:
+        code = TILE_CODES.get(tile)
+        if code is None or self.codes[row, col] == code:
+            return []
+
+        changed = [(row, col)]
+        if code in _MARKERS:
+            existing = self.start if code == START else self.end
+            if existing is not None:
+                self.codes[existing] = EMPTY
+                changed.append(existing)
+        self.codes[row, col] = code
+        self._forget_overwritten_markers()
+        if code == START:
+            self.start = (row, col)
+        elif code == END:
+            self.end = (row, col)
+        return changed
+
+    def ensure_required_markers(self) -> bool:
+        if self.rows == 0 or self.cols == 0:
+            return False
+        changed = False
+        if self.start is None:
+            self.place(max(0, self.rows - 2), 0, "S")
+            changed = True
+        if self.end is None:
+            self.place(max(0, self.rows - 2), max(0, self.cols - 1), "E")
+            changed = True
+        return changed
+
+    def _bulk_code(self, tile: str) -> int:
+        code = TILE_CODES[tile]
+        if code in _MARKERS:
+            raise ValueError("Start and end markers can only be placed one cell at a time.")
+        return code
+
+    def fill_rect(self, top: int, left: int, bottom: int, right: int, tile: str) -> tuple[int, int, int, int]:
+        top, bottom = sorted((max(0, top), min(self.rows - 1, bottom)))
+        left, right = sorted((max(0, left), min(self.cols - 1, right)))
+        self.codes[top:bottom + 1, left:right + 1] = self._bulk_code(tile)
+        self._forget_overwritten_markers()
+        return top, left, bottom, right
+
+    def flood_fill(self, row: int, col: int, tile: str) -> tuple[int, int, int, int] | None:
+        code = self._bulk_code(tile)
+        target = self.codes[row, col]
+        if target == code:
+            return None
+
+        # Alternate filling whole horizontal and vertical runs that touch the
+        # region, so the loop runs once per turn in the region's shape rather
+        # than once per cell.
+        mask = self.codes == target
+        row_ids = _run_ids(mask)
+        col_ids = _run_ids(np.ascontiguousarray(mask.T)).T
+        row_runs = int(row_ids.max()) + 1
+        col_runs = int(col_ids.max()) + 1
+        filled = np.zeros_like(mask)
+        filled[row, col] = True
+        count = 1
+        while True:
+            hit_rows = np.zeros(row_runs, dtype=bool)
+            hit_rows[row_ids[filled]] = True
+            hit_rows[0] = False
+            filled = hit_rows[row_ids]
+            hit_cols = np.zeros(col_runs, dtype=bool)
+            hit_cols[col_ids[filled]] = True
+            hit_cols[0] = False
+            filled = hit_cols[col_ids]
+            new_count = int(filled.sum())
+            if new_count == count:
+                break
+            count = new_count
+
+        self.codes[filled] = code
+        self._forget_overwritten_markers()
+        rows = np.flatnonzero(filled.any(axis=1))
+        cols = np.flatnonzero(filled.any(axis=0))
+        return int(rows[0]), int(cols[0]), int(rows[-1]), int(cols[-1])
+
+    def insert_columns(self, col: int, count: int = 1) -> None:
+        col = max(0, min(self.cols, col))
+        self.codes = np.insert(self.codes, [col] * count, EMPTY, axis=1)
+        if self.start is not None and self.start[1] >= col:
+            self.start = (self.start[0], self.start[1] + count)
+        if self.end is not None and self.end[1] >= col:
+            self.end = (self.end[0], self.end[1] + count)
+
+    def delete_columns(self, col: int, count: int = 1) -> None:
+        col = max(0, min(self.cols - 1, col))
+        # At least one column always survives.
+        count = max(0, min(count, self.cols - col, self.cols - 1))
+        if count == 0:
+            return
+        self.codes = np.delete(self.codes, np.s_[col:col + count], axis=1)
+        for name in ("start", "end"):
+            position = getattr(self, name)
+            if position is None:
+                continue
+            if col <= position[1] < col + count:
+                setattr(self, name, None)
+            elif position[1] >= col + count:
+                setattr(self, name, (position[0], position[1] - count))
+
+    def copy_region(self, top: int, left: int, bottom: int, right: int) -> np.ndarray:
+        top, bottom = sorted((max(0, top), min(self.rows - 1, bottom)))
+        left, right = sorted((max(0, left), min(self.cols - 1, right)))
+        region = self.codes[top:bottom + 1, left:right + 1].copy()
+        # Markers are unique, so copies never carry them along.
+        region[np.isin(region, _MARKERS)] = EMPTY
+        return region
+
+    def paste_region(self, region: np.ndarray, row: int, col: int) -> tuple[int, int, int, int] | None:
+        height = min(region.shape[0], self.rows - row)
+        width = min(region.shape[1], self.cols - col)
+        if height <= 0 or width <= 0 or row < 0 or col < 0:
+            return None
+        self.codes[row:row + height, col:col + width] = region[:height, :width]
+        self._forget_overwritten_markers()
+        return row, col, row + height - 1, col + width - 1
@@ -0,0 +1,116 @@
+import os
+from dataclasses import fields
+from pathlib import Path
+
+import numpy as np
+
+from level import LevelData, build_level, patch_level, read_level_rows
+from level_binary import TILE_CHARS
+from settings import BINARY_LEVEL_SUFFIX, HOT_RELOAD_INTERVAL
+from spatial import ColumnView
+
+
+def _codes(lines: list[str], cols: int) -> np.ndarray:
+    text = "".join(line.ljust(cols, ".") for line in lines).encode("ascii")
+    return np.frombuffer(text, dtype=np.uint8).reshape(len(lines), cols)
+
+
+def _check_rows(lines: list[str]) -> None:
+    # Rows the diff can encode and patch_level would not misread as empty.
+    text = "".join(lines)
+    unknown = sorted(set(text) - set(TILE_CHARS))
+    if unknown:
+        raise ValueError(f"Unknown tiles {''.join(unknown)!r} in level.")
+    if "S" not in text or "E" not in text:
+        raise ValueError("Level is missing its 'S' or 'E' marker.")
+
+
+def changed_spans(old: list[str], new: list[str]) -> list[tuple[int, int]]:
+    # Runs [first, last) of columns that differ, including any the level grew
+    # or shrank by.
+    old_cols = max(len(line) for line in old)
+    new_cols = max(len(line) for line in new)
+    cols = max(old_cols, new_cols)
+    changed = (_codes(old, cols) != _codes(new, cols)).any(axis=0)
+    changed[min(old_cols, new_cols):cols] = True
+    columns = np.flatnonzero(changed)
+    if not len(columns):
+        return []
+    breaks = np.flatnonzero(np.diff(columns) > 1)
+    starts = columns[np.concatenate(([0], breaks + 1))]
+    ends = columns[np.concatenate((breaks, [len(columns) - 1]))] + 1
+    return list(zip(starts.tolist(), ends.tolist()))
+
+
+class LevelWatcher:
+    # Polls the level file's mtime and size and patches the loaded level in
+    # place when it changes, so edits show up without restarting the run.
+    def __init__(self, path: Path, level: LevelData, interval: float = HOT_RELOAD_INTERVAL) -> None:
+        self.path = path
+        self.level = level
+        self.interval = interval
+        self.lines = read_level_rows(path)
+        self._signature = self._stat()
+        self._next_poll = 0.0
+        if path.suffix == BINARY_LEVEL_SUFFIX:
+            # Binary levels pull tiles lazily out of a map of the file, which
+            # patching cannot edit and a save would truncate underneath; hold
+            # the tiles in memory instead.
+            self._replace(build_level(self.lines))
+        else:
+            self._track()
+
+    def _replace(self, rebuilt: LevelData) -> None:
+        for field in fields(LevelData):
+            setattr(self.level, field.name, getattr(rebuilt, field.name))
+        self._track()
+
+    def _track(self) -> None:
+        # patch_level only edits the column indexes; the flat lists follow
+        # them from here on. Solids are then the merged runs, which cover the
+        # same tiles.
+        level = self.level
+        level.solids = ColumnView(level.solid_index)
+        level.spikes = ColumnView(level.spike_index)
+        level.spike_hitboxes = ColumnView(level.spike_hitbox_index)
+
+    def _stat(self) -> tuple[int, int] | None:
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def poll(self, now: float) -> list[tuple[int, int]] | None:
+        # Returns the column spans that were rebuilt, or None if nothing was.
+        if now < self._next_poll:
+            return None
+        self._next_poll = now + self.interval
+        signature = self._stat()
+        if signature is None or signature == self._signature:
+            return None
+        self._signature = signature
+        try:
+            lines = read_level_rows(self.path)
+            _check_rows(lines)
+        except (OSError, ValueError):
+            # Probably caught mid-save; the finished save changes the stat again.
+            return None
+        return self.apply(lines)
+
+    def apply(self, lines: list[str]) -> list[tuple[int, int]] | None:
+        level = self.level
+        if len(lines) != len(self.lines):
+            # A different row count moves every tile; rebuild it all.
+            try:
+                rebuilt = build_level(lines)
+            except ValueError:
+                return None
+            self._replace(rebuilt)
+            cols = max(len(line) for line in (*self.lines, *lines))
+            self.lines = lines
+            return [(0, cols)]
+
+        spans = [patch_level(level, lines, first, last) for first, last in changed_spans(self.lines, lines)]
+        self.lines = lines
+        return spans or None
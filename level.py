@@ -1,9 +1,25 @@
+from collections import OrderedDict
+from collections.abc import Iterable
 from dataclasses import dataclass
 from pathlib import Path
 
 import pygame
 
-from settings import END_COLOR, GROUND_COLOR, SCREEN_HEIGHT, SPIKE_COLOR, TILE_SIZE
+from colliders import merge_rects, merge_runs
+from masks import spike_bounds
+from settings import (
+    BACKGROUND_COLOR,
+    BINARY_LEVEL_SUFFIX,
+    END_COLOR,
+    GROUND_COLOR,
+    MERGE_SOLIDS,
+    RENDER_CHUNK_CACHE,
+    RENDER_CHUNK_WIDTH,
+    SCREEN_HEIGHT,
+    SPIKE_COLOR,
+    TILE_SIZE,
+)
+from spatial import ColumnIndex
 
 
 @dataclass
@@ -14,45 +30,70 @@ class LevelData:
     end_zone: pygame.Rect
     start_pos: tuple[int, int]
     width_px: int
+    height_px: int
+    solid_index: ColumnIndex
+    spike_index: ColumnIndex
+    spike_hitbox_index: ColumnIndex
 
 
-def load_level(path: Path) -> LevelData:
+def read_level_rows(path: Path) -> list[str]:
+    if path.suffix == BINARY_LEVEL_SUFFIX:
+        from level_binary import read_rows_binary
+
+        return read_rows_binary(path)
     raw_lines = [line.rstrip("\n") for line in path.read_text().splitlines() if line.strip()]
     if not raw_lines:
         raise ValueError(f"Level file {path} is empty.")
 
     width = max(len(line) for line in raw_lines)
-    lines = [line.ljust(width, ".") for line in raw_lines]
+    return [line.ljust(width, ".") for line in raw_lines]
+
+
+def spike_hitbox(x: int, y: int) -> pygame.Rect:
+    # Bounds of the drawn triangle, the broad phase for spike collision;
+    # masks.move_touches_spike then checks the triangle itself.
+    return spike_bounds().move(x, y)
+
+
+def load_level(path: Path) -> LevelData:
+    if path.suffix == BINARY_LEVEL_SUFFIX:
+        from level_binary import load_level_binary
+
+        return load_level_binary(path)
+    return build_level(read_level_rows(path))
 
+
+def build_level(lines: list[str]) -> LevelData:
+    cells = (
+        (row, col, char)
+        for row, line in enumerate(lines)
+        for col, char in enumerate(line)
+        if char != "."
+    )
+    return build_level_from_cells(len(lines[0]), len(lines), cells)
+
+
+def build_level_from_cells(width: int, height: int, cells: Iterable[tuple[int, int, str]]) -> LevelData:
     solids: list[pygame.Rect] = []
     spikes: list[pygame.Rect] = []
     spike_hitboxes: list[pygame.Rect] = []
     end_zone: pygame.Rect | None = None
     start_pos: tuple[int, int] | None = None
 
-    for row, line in enumerate(lines):
-        for col, char in enumerate(line):
-            x = col * TILE_SIZE
-            y = row * TILE_SIZE
-            tile = pygame.Rect(x, y, TILE_SIZE, TILE_SIZE)
-
-            if char == "#":
-                solids.append(tile)
-            elif char == "^":
-                spikes.append(tile)
-                # Collision is intentionally tighter than visuals so it mostly
-                # follows the red triangle shape instead of the full tile.
-                hitbox = pygame.Rect(
-                    x + int(TILE_SIZE * 0.22),
-                    y + int(TILE_SIZE * 0.16),
-                    int(TILE_SIZE * 0.56),
-                    int(TILE_SIZE * 0.80),
-                )
-                spike_hitboxes.append(hitbox)
-            elif char == "S":
-                start_pos = (x, y)
-            elif char == "E":
-                end_zone = tile
+    for row, col, char in cells:
+        x = col * TILE_SIZE
+        y = row * TILE_SIZE
+        tile = pygame.Rect(x, y, TILE_SIZE, TILE_SIZE)
+
+        if char == "#":
+            solids.append(tile)
+        elif char == "^":
+            spikes.append(tile)
+            spike_hitboxes.append(spike_hitbox(x, y))
+        elif char == "S":
+            start_pos = (x, y)
+        elif char == "E":
+            end_zone = tile
 
     if start_pos is None:
         raise ValueError("Level is missing 'S' start marker.")
@@ -60,6 +101,7 @@ def load_level(path: Path) -> LevelData:
         raise ValueError("Level is missing 'E' end marker.")
 
     width_px = width * TILE_SIZE
+    height_px = height * TILE_SIZE
     return LevelData(
         solids=solids,
         spikes=spikes,
@@ -67,14 +109,63 @@ def load_level(path: Path) -> LevelData:
         end_zone=end_zone,
         start_pos=start_pos,
         width_px=width_px,
+        height_px=height_px,
+        solid_index=ColumnIndex(merge_runs(solids) if MERGE_SOLIDS else solids),
+        spike_index=ColumnIndex(spikes),
+        spike_hitbox_index=ColumnIndex(spike_hitboxes),
     )
 
 
-def draw_level(surface: pygame.Surface, level: LevelData, camera_x: int) -> None:
-    for solid in level.solids:
+def patch_level(level: LevelData, lines: list[str], first: int, last: int) -> tuple[int, int]:
+    # Rebuilds the colliders of columns [first, last) from lines in place and
+    # returns the columns actually rebuilt. Merged solid runs reaching into
+    # the span are rebuilt whole; runs are not re-merged across its edges,
+    # which only leaves more, equally exact, colliders. Only the column
+    # indexes are patched, so the flat lists should be views of them
+    # (spatial.ColumnView) or they go stale.
+    left = first * TILE_SIZE
+    right = last * TILE_SIZE
+    for run in level.solid_index.query_span(left, right):
+        left = min(left, run.left)
+        right = max(right, run.right)
+    first = left // TILE_SIZE
+    last = right // TILE_SIZE
+    for index in (level.solid_index, level.spike_index, level.spike_hitbox_index):
+        index.remove_span(left, right)
+
+    solids: list[pygame.Rect] = []
+    for row, line in enumerate(lines):
+        y = row * TILE_SIZE
+        for col in range(first, min(last, len(line))):
+            char = line[col]
+            x = col * TILE_SIZE
+            if char == "#":
+                solids.append(pygame.Rect(x, y, TILE_SIZE, TILE_SIZE))
+            elif char == "^":
+                level.spike_index.add(pygame.Rect(x, y, TILE_SIZE, TILE_SIZE))
+                level.spike_hitbox_index.add(spike_hitbox(x, y))
+            elif char == "S":
+                level.start_pos = (x, y)
+            elif char == "E":
+                # Updated in place; the renderer and simulation hold this rect.
+                level.end_zone.update(x, y, TILE_SIZE, TILE_SIZE)
+    for solid in merge_runs(solids) if MERGE_SOLIDS else solids:
+        level.solid_index.add(solid)
+    level.width_px = max(len(line) for line in lines) * TILE_SIZE
+    return first, last
+
+
+def _draw_tiles(
+    surface: pygame.Surface,
+    solids: list[pygame.Rect],
+    spikes: list[pygame.Rect],
+    end_zone: pygame.Rect,
+    camera_x: int,
+) -> None:
+    for solid in solids:
         pygame.draw.rect(surface, GROUND_COLOR, solid.move(-camera_x, 0))
 
-    for spike in level.spikes:
+    for spike in spikes:
         sx = spike.x - camera_x
         sy = spike.y
         points = [
@@ -84,7 +175,80 @@ def draw_level(surface: pygame.Surface, level: LevelData, camera_x: int) -> None
         ]
         pygame.draw.polygon(surface, SPIKE_COLOR, points)
 
-    pygame.draw.rect(surface, END_COLOR, level.end_zone.move(-camera_x, 0), border_radius=6)
+    pygame.draw.rect(surface, END_COLOR, end_zone.move(-camera_x, 0), border_radius=6)
 
+
+def _draw_floor(surface: pygame.Surface) -> None:
     floor_y = (SCREEN_HEIGHT // TILE_SIZE - 1) * TILE_SIZE
     pygame.draw.rect(surface, GROUND_COLOR, (0, floor_y, surface.get_width(), SCREEN_HEIGHT - floor_y))
+
+
+def draw_level(surface: pygame.Surface, level: LevelData, camera_x: int) -> None:
+    _draw_tiles(surface, level.solids, level.spikes, level.end_zone, camera_x)
+    _draw_floor(surface)
+
+
+class LevelRenderer:
+    def __init__(
+        self,
+        level: LevelData,
+        chunk_width: int = RENDER_CHUNK_WIDTH,
+        max_chunks: int = RENDER_CHUNK_CACHE,
+    ) -> None:
+        self.level = level
+        self.chunk_width = chunk_width
+        self.max_chunks = max_chunks
+        self._chunks: OrderedDict[int, pygame.Surface] = OrderedDict()
+        # chunk index -> (top, bottom) of the rows it has tiles in
+        self._chunk_rows: dict[int, tuple[int, int]] = {}
+        # Rows the last draw put tiles in; scrolling only changes pixels there.
+        self.band = pygame.Rect(0, 0, 0, 0)
+
+    @property
+    def chunk_height(self) -> int:
+        return max(self.level.height_px, SCREEN_HEIGHT)
+
+    def invalidate_span(self, left: int, right: int) -> None:
+        # Chunks over [left, right) are redrawn the next time they are shown.
+        for index in range(left // self.chunk_width, (right - 1) // self.chunk_width + 1):
+            if self._chunks.pop(index, None) is not None:
+                del self._chunk_rows[index]
+
+    def _chunk(self, index: int) -> pygame.Surface:
+        chunk = self._chunks.get(index)
+        if chunk is not None:
+            self._chunks.move_to_end(index)
+            return chunk
+
+        left = index * self.chunk_width
+        right = min(left + self.chunk_width, self.level.width_px)
+        chunk = pygame.Surface((right - left, self.chunk_height))
+        chunk.fill(BACKGROUND_COLOR)
+        solids = self.level.solid_index.query_span(left, right)
+        spikes = self.level.spike_index.query_span(left, right)
+        _draw_tiles(chunk, merge_rects(solids) if MERGE_SOLIDS else solids, spikes, self.level.end_zone, left)
+        tiles = [tile for tile in (*solids, *spikes, self.level.end_zone) if tile.right > left and tile.left < right]
+        self._chunk_rows[index] = (
+            min((tile.top for tile in tiles), default=SCREEN_HEIGHT),
+            max((tile.bottom for tile in tiles), default=SCREEN_HEIGHT),
+        )
+
+        self._chunks[index] = chunk
+        if len(self._chunks) > self.max_chunks:
+            evicted, _ = self._chunks.popitem(last=False)
+            del self._chunk_rows[evicted]
+        return chunk
+
+    def draw(self, surface: pygame.Surface, camera_x: int) -> None:
+        last_chunk = (self.level.width_px - 1) // self.chunk_width
+        first = max(0, camera_x // self.chunk_width)
+        last = min(last_chunk, (camera_x + surface.get_width() - 1) // self.chunk_width)
+        top = bottom = SCREEN_HEIGHT
+        for index in range(first, last + 1):
+            surface.blit(self._chunk(index), (index * self.chunk_width - camera_x, 0))
+            chunk_top, chunk_bottom = self._chunk_rows[index]
+            top = min(top, chunk_top)
+            bottom = max(bottom, chunk_bottom)
+        _draw_floor(surface)
+        top = max(0, top)
+        self.band = pygame.Rect(0, top, surface.get_width(), max(0, min(bottom, surface.get_height()) - top))
@@ -0,0 +1,262 @@
+import argparse
+import mmap
+import re
+import struct
+import sys
+from bisect import bisect_left
+from collections.abc import Callable, Iterator, Sequence
+from dataclasses import dataclass
+from pathlib import Path
+
+import pygame
+
+from level import LevelData, read_level_rows, spike_hitbox
+from settings import MERGE_SOLIDS, TILE_SIZE
+from spatial import ColumnIndex
+
+# Layout: a fixed header, the tile grid as one uint8 per tile stored column
+# by column (so a column window is one contiguous slice), then optionally the
+# horizontal runs of solid tiles: a count, then (row, first column, length)
+# triples ordered by first column, then row.
+MAGIC = b"GDLV"
+VERSION = 2
+HEADER = struct.Struct("<4sHHIIIIII")
+RUNS = struct.Struct("<I")
+RUN = struct.Struct("<III")
+FLAG_SOLID_RUNS = 1
+# Stored runs are cut at multiples of this many columns, so the runs over a
+# column all start in the same block of columns as it.
+RUN_SPLIT_COLUMNS = 16
+
+TILE_CHARS = ".#^SE"
+TILE_CODES = {char: code for code, char in enumerate(TILE_CHARS)}
+EMPTY = TILE_CODES["."]
+SOLID = TILE_CODES["#"]
+SPIKE = TILE_CODES["^"]
+START = TILE_CODES["S"]
+END = TILE_CODES["E"]
+
+_SOLID_RUN = re.compile(r"#+")
+
+
+@dataclass
+class BinaryHeader:
+    flags: int
+    rows: int
+    cols: int
+    start: tuple[int, int]
+    end: tuple[int, int]
+
+    @property
+    def grid_offset(self) -> int:
+        return HEADER.size
+
+    @property
+    def runs_offset(self) -> int:
+        return HEADER.size + self.rows * self.cols
+
+
+def read_header(buffer: bytes | mmap.mmap) -> BinaryHeader:
+    if len(buffer) < HEADER.size:
+        raise ValueError("Level file is too short for a binary level header.")
+    magic, version, flags, rows, cols, start_row, start_col, end_row, end_col = HEADER.unpack_from(buffer, 0)
+    if magic != MAGIC:
+        raise ValueError("Not a binary level file.")
+    if version != VERSION:
+        raise ValueError(f"Unsupported binary level version {version}.")
+    if len(buffer) < HEADER.size + rows * cols:
+        raise ValueError("Binary level file is truncated.")
+    return BinaryHeader(flags, rows, cols, (start_row, start_col), (end_row, end_col))
+
+
+def encode_rows(rows: list[str], solid_runs: bool = True) -> bytes:
+    height = len(rows)
+    width = len(rows[0])
+    start: tuple[int, int] | None = None
+    end: tuple[int, int] | None = None
+    grid = bytearray(height * width)
+    runs: list[tuple[int, int, int]] = []
+
+    unknown = sorted(set("".join(rows)) - set(TILE_CHARS))
+    if unknown:
+        raise ValueError(f"Unknown tiles {''.join(unknown)!r} in level; only {TILE_CHARS!r} can be stored.")
+
+    for row_idx, line in enumerate(rows):
+        for match in _SOLID_RUN.finditer(line):
+            first = match.start()
+            while first < match.end():
+                last = min(match.end(), (first // RUN_SPLIT_COLUMNS + 1) * RUN_SPLIT_COLUMNS)
+                runs.append((row_idx, first, last - first))
+                first = last
+        for col_idx, char in enumerate(line):
+            code = TILE_CODES[char]
+            # Only the marker load_level would use is kept, so the file never
+            # holds more than one start or end.
+            if code == START:
+                start = (row_idx, col_idx)
+                code = EMPTY
+            elif code == END:
+                end = (row_idx, col_idx)
+                code = EMPTY
+            grid[col_idx * height + row_idx] = code
+
+    if start is None:
+        raise ValueError("Level is missing 'S' start marker.")
+    if end is None:
+        raise ValueError("Level is missing 'E' end marker.")
+    grid[start[1] * height + start[0]] = START
+    grid[end[1] * height + end[0]] = END
+
+    flags = FLAG_SOLID_RUNS if solid_runs else 0
+    parts = [HEADER.pack(MAGIC, VERSION, flags, height, width, *start, *end), bytes(grid)]
+    if solid_runs:
+        runs.sort(key=lambda run: (run[1], run[0]))
+        parts.append(RUNS.pack(len(runs)))
+        parts.extend(RUN.pack(*run) for run in runs)
+    return b"".join(parts)
+
+
+def decode_rows(buffer: bytes | mmap.mmap) -> list[str]:
+    header = read_header(buffer)
+    rows, cols = header.rows, header.cols
+    grid = buffer[header.grid_offset:header.runs_offset]
+    table = bytes.maketrans(bytes(range(len(TILE_CHARS))), TILE_CHARS.encode())
+    text = grid.translate(table).decode("ascii")
+    return ["".join(text[row::rows]) for row in range(rows)]
+
+
+def read_rows_binary(path: Path) -> list[str]:
+    return decode_rows(path.read_bytes())
+
+
+def save_rows_binary(path: Path, rows: list[str]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(encode_rows(rows))
+
+
+class LazyTileList(Sequence[pygame.Rect]):
+    def __init__(self, index: ColumnIndex, cols: int) -> None:
+        self._index = index
+        self._cols = cols
+        self._items: list[pygame.Rect] | None = None
+
+    def _materialize(self) -> list[pygame.Rect]:
+        if self._items is None:
+            self._items = [rect for col in range(self._cols) for rect in self._index.column(col)]
+        return self._items
+
+    def __getitem__(self, index):
+        return self._materialize()[index]
+
+    def __len__(self) -> int:
+        return len(self._materialize())
+
+    def __iter__(self) -> Iterator[pygame.Rect]:
+        return iter(self._materialize())
+
+
+def _column_loader(
+    buffer: bytes | mmap.mmap,
+    header: BinaryHeader,
+    code: int,
+    make: Callable[[int, int], pygame.Rect],
+) -> Callable[[int], list[pygame.Rect]]:
+    rows = header.rows
+
+    def load(col: int) -> list[pygame.Rect]:
+        if not 0 <= col < header.cols:
+            return []
+        start = header.grid_offset + col * rows
+        column = buffer[start:start + rows]
+        if code not in column:
+            return []
+        x = col * TILE_SIZE
+        return [make(x, row * TILE_SIZE) for row, value in enumerate(column) if value == code]
+
+    return load
+
+
+def _run_loader(buffer: bytes | mmap.mmap, header: BinaryHeader) -> Callable[[int], list[pygame.Rect]] | None:
+    # Every stored run over a column; a run is returned for each column it
+    # covers. Columns are asked for mostly in order, so the runs of the last
+    # block are kept decoded.
+    if not header.flags & FLAG_SOLID_RUNS:
+        return None
+    (count,) = RUNS.unpack_from(buffer, header.runs_offset)
+    offset = header.runs_offset + RUNS.size
+    block_runs: dict[int, list[tuple[int, int, int]]] = {}
+
+    def first_col(index: int) -> int:
+        return RUN.unpack_from(buffer, offset + index * RUN.size)[1]
+
+    def load(col: int) -> list[pygame.Rect]:
+        block = col // RUN_SPLIT_COLUMNS
+        runs = block_runs.get(block)
+        if runs is None:
+            low = bisect_left(range(count), block * RUN_SPLIT_COLUMNS, key=first_col)
+            high = bisect_left(range(count), (block + 1) * RUN_SPLIT_COLUMNS, lo=low, key=first_col)
+            runs = sorted(RUN.unpack_from(buffer, offset + index * RUN.size) for index in range(low, high))
+            block_runs.clear()
+            block_runs[block] = runs
+        return [
+            pygame.Rect(first * TILE_SIZE, row * TILE_SIZE, length * TILE_SIZE, TILE_SIZE)
+            for row, first, length in runs
+            if first <= col < first + length
+        ]
+
+    return load
+
+
+def _tile_rect(x: int, y: int) -> pygame.Rect:
+    return pygame.Rect(x, y, TILE_SIZE, TILE_SIZE)
+
+
+def load_level_binary(path: Path) -> LevelData:
+    # Nothing but the header is decoded up front: the indices pull tiles out
+    # of the mapped grid one column at a time as the game first asks for them.
+    if sys.platform == "emscripten":
+        # The browser's in-memory filesystem has nothing to gain from a map.
+        buffer = path.read_bytes()
+    else:
+        with path.open("rb") as handle:
+            buffer = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+    header = read_header(buffer)
+    solid_tiles = ColumnIndex(loader=_column_loader(buffer, header, SOLID, _tile_rect))
+    # Collision uses the stored runs, like the merged runs load_level builds.
+    runs = _run_loader(buffer, header) if MERGE_SOLIDS else None
+    solid_index = ColumnIndex(loader=runs) if runs is not None else solid_tiles
+    spike_index = ColumnIndex(loader=_column_loader(buffer, header, SPIKE, _tile_rect))
+    spike_hitbox_index = ColumnIndex(loader=_column_loader(buffer, header, SPIKE, spike_hitbox))
+
+    start_row, start_col = header.start
+    end_row, end_col = header.end
+    return LevelData(
+        solids=LazyTileList(solid_tiles, header.cols),
+        spikes=LazyTileList(spike_index, header.cols),
+        spike_hitboxes=LazyTileList(spike_hitbox_index, header.cols),
+        end_zone=_tile_rect(end_col * TILE_SIZE, end_row * TILE_SIZE),
+        start_pos=(start_col * TILE_SIZE, start_row * TILE_SIZE),
+        width_px=header.cols * TILE_SIZE,
+        height_px=header.rows * TILE_SIZE,
+        solid_index=solid_index,
+        spike_index=spike_index,
+        spike_hitbox_index=spike_hitbox_index,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Convert levels between the text and binary formats.")
+    parser.add_argument("source", type=Path)
+    parser.add_argument("target", type=Path)
+    args = parser.parse_args()
+
+    rows = read_level_rows(args.source)
+    if args.target.suffix == ".txt":
+        args.target.write_text("\n".join(rows) + "\n")
+    else:
+        save_rows_binary(args.target, rows)
+    print(f"Wrote {args.target} ({args.target.stat().st_size} bytes)")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,10 +4,33 @@ from enum import Enum, auto
 import pygame
 
 from camera import compute_camera_x
-from level import draw_level, load_level
-from player import Player
-from settings import BACKGROUND_COLOR, FPS, LEVEL_PATH, SCREEN_HEIGHT, SCREEN_WIDTH, WINDOW_TITLE
+from dirty_rects import DirtyRects
+from level import LevelRenderer, load_level, read_level_rows
+from profiler import FrameProfiler
+from settings import (
+    BACKGROUND_COLOR,
+    ENDLESS_DIFFICULTY,
+    ENDLESS_SEED,
+    FPS,
+    HOT_RELOAD_LEVEL,
+    LEVEL_PATH,
+    LEVEL_STREAMING,
+    MAX_FRAME_TIME,
+    RECORD_ANALYTICS,
+    RECORD_REPLAYS,
+    SCREEN_HEIGHT,
+    SCREEN_WIDTH,
+    SHOW_GHOSTS,
+    TILE_SIZE,
+    WINDOW_TITLE,
+)
+from simulation import Outcome, Simulation
 from ui import draw_attempts, draw_center_message
+from web_assets import fast_start, level_blob, load_fonts, mark_startup, trace_startup
+
+# Optional features (replays, analytics, ghosts, streaming, generated levels,
+# hot reload) are imported where they are switched on, after the first frame;
+# several of them pull in numpy.
 
 
 class GameState(Enum):
@@ -17,35 +40,115 @@ class GameState(Enum):
     WIN = auto()
 
 
+MESSAGES = {
+    GameState.MENU: ("Geometry Dash Clone", "Press Space or Click to Start"),
+    GameState.DEAD: ("You Died", "Press Space or Click to Retry"),
+    GameState.WIN: ("Level Complete", "Press Space or Click to Play Again"),
+}
+
+
 async def main() -> None:
-    pygame.init()
+    # With prebuilt assets (always on the web build) only the display is
+    # initialized and neither fonts nor level text are parsed at startup.
+    fast = fast_start()
+    if fast:
+        pygame.display.init()
+    else:
+        pygame.init()
     screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
     pygame.display.set_caption(WINDOW_TITLE)
     clock = pygame.time.Clock()
-    font = pygame.font.SysFont("freesansbold", 26)
-    big_font = pygame.font.SysFont("freesansbold", 54)
+    font, big_font = load_fonts(fast)
+    level_path = level_blob() if fast else LEVEL_PATH
+
+    # The menu goes up before anything else loads; the level behind it
+    # appears a few yields later.
+    attempts = 1
+    screen.fill(BACKGROUND_COLOR)
+    draw_attempts(screen, font, attempts)
+    draw_center_message(screen, big_font, font, *MESSAGES[GameState.MENU])
+    pygame.display.flip()
+    mark_startup("first_frame")
+    await asyncio.sleep(0)
+
+    stream = None
+    if ENDLESS_SEED is not None:
+        from generator import GeneratedColumnSource
+        from streaming import StreamingLevel
+
+        stream = StreamingLevel(GeneratedColumnSource(ENDLESS_SEED, ENDLESS_DIFFICULTY))
+        level = stream.level
+    elif LEVEL_STREAMING:
+        from streaming import StreamingLevel, open_column_source
+
+        stream = StreamingLevel(open_column_source(level_path))
+        level = stream.level
+    else:
+        level = load_level(level_path)
+    renderer = LevelRenderer(level)
+    profiler = FrameProfiler()
+    dirty = DirtyRects()
+    simulation = Simulation(level, profiler=profiler)
+    player = simulation.player
+    await asyncio.sleep(0)
+
+    recorder = analytics = ghosts = watcher = None
+    # The prebuilt blob is never edited, so there is nothing to watch.
+    if HOT_RELOAD_LEVEL and stream is None and not fast:
+        from hot_reload import LevelWatcher
+
+        watcher = LevelWatcher(level_path, level)
+    # Replays are matched to a level file, which endless play does not have.
+    # Runs are tagged with the hash of the rows being played, taken here and
+    # on each reload so no frame waits on reading the level.
+    if (RECORD_REPLAYS or RECORD_ANALYTICS) and ENDLESS_SEED is None:
+        from replay import level_hash
 
-    level = load_level(LEVEL_PATH)
-    player = Player(*level.start_pos)
+        played_hash = level_hash(watcher.lines if watcher is not None else read_level_rows(level_path))
+    if RECORD_REPLAYS and ENDLESS_SEED is None:
+        from replay import ReplayRecorder
+
+        recorder = ReplayRecorder(played_hash)
+    if RECORD_ANALYTICS and ENDLESS_SEED is None:
+        from analytics import AnalyticsLog
+
+        analytics = AnalyticsLog(played_hash)
+    if SHOW_GHOSTS and ENDLESS_SEED is None:
+        from ghosts import GhostLayer, load_ghost_runs
+
+        ghosts = GhostLayer(load_ghost_runs(level_path))
+    mark_startup("loaded")
+    await asyncio.sleep(0)
 
     state = GameState.MENU
-    attempts = 1
     camera_x = 0
     running = True
     jump_held = False
     mouse_held = False
+    pending_press = False
+    accumulator = 0.0
 
     while running:
-        dt = min(clock.tick(FPS) / 1000.0, 1 / 30)
+        frame_time = min(clock.tick(FPS) / 1000.0, MAX_FRAME_TIME)
+        profiler.begin_frame()
         jump_pressed = False
 
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 running = False
+            elif event.type in (pygame.WINDOWEXPOSED, pygame.WINDOWRESTORED):
+                dirty.invalidate()
             elif event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_ESCAPE:
                     running = False
                     continue
+                if event.key == pygame.K_F3:
+                    profiler.toggle()
+                if event.key == pygame.K_g and ENDLESS_SEED is None:
+                    from ghosts import GhostLayer, load_ghost_runs
+
+                    # Reloaded on every toggle so the latest attempts show up.
+                    ghosts = None if ghosts is not None else GhostLayer(load_ghost_runs(level_path))
                 if event.key == pygame.K_SPACE:
                     jump_held = True
                     jump_pressed = True
@@ -56,55 +159,103 @@ async def main() -> None:
                 jump_pressed = True
             elif event.type == pygame.MOUSEBUTTONUP and event.button == 1:
                 mouse_held = False
+        profiler.mark("events")
+
+        spans = watcher.poll(pygame.time.get_ticks() / 1000.0) if watcher is not None else None
+        if spans is not None:
+            for first, last in spans:
+                renderer.invalidate_span(first * TILE_SIZE, last * TILE_SIZE)
+            dirty.invalidate()
+            if recorder is not None or analytics is not None:
+                played_hash = level_hash(watcher.lines)
+                for log in (recorder, analytics):
+                    if log is not None:
+                        log.level_changed(played_hash)
+            # Recorded runs were of the old layout.
+            ghosts = None
+        profiler.mark("reload")
 
         if jump_pressed:
             if state == GameState.MENU:
                 state = GameState.PLAYING
+                if recorder is not None:
+                    recorder.start()
             elif state == GameState.PLAYING:
-                player.request_jump()
+                pending_press = True
             elif state in (GameState.DEAD, GameState.WIN):
                 if state == GameState.DEAD:
                     attempts += 1
-                player.reset(*level.start_pos)
+                simulation.reset()
+                accumulator = 0.0
                 state = GameState.PLAYING
+                if recorder is not None:
+                    recorder.start()
 
+        alpha = 1.0
         if state == GameState.PLAYING:
-            player.update(dt, level.solids, jump_held or mouse_held)
-
-            for spike in level.spike_hitboxes:
-                if player.rect.colliderect(spike):
+            accumulator += frame_time
+            step = simulation.step_seconds
+            while accumulator >= step:
+                accumulator -= step
+                if recorder is not None:
+                    recorder.record(simulation.steps, jump_held or mouse_held, pending_press)
+                outcome = simulation.step(jump_held or mouse_held, pending_press)
+                pending_press = False
+                if outcome == Outcome.DEAD:
                     state = GameState.DEAD
+                elif outcome == Outcome.WIN:
+                    state = GameState.WIN
+                if outcome != Outcome.RUNNING:
+                    accumulator = 0.0
+                    if recorder is not None:
+                        recorder.finish(simulation)
+                    if analytics is not None:
+                        analytics.log(simulation)
                     break
+            if state == GameState.PLAYING:
+                alpha = accumulator / step
 
-            if player.hit_head:
-                state = GameState.DEAD
-            if player.hit_wall:
-                state = GameState.DEAD
-
-            if player.rect.top > SCREEN_HEIGHT:
-                state = GameState.DEAD
+            center_x, _ = player.interpolated_center(alpha)
+            camera_x = compute_camera_x(center_x, level.width_px)
+            if stream is not None:
+                stream.release_behind(camera_x)
+        profiler.mark("camera")
 
-            if player.rect.colliderect(level.end_zone):
-                state = GameState.WIN
+        screen.fill(BACKGROUND_COLOR)
+        renderer.draw(screen, camera_x)
+        dirty.scroll(camera_x, renderer.band)
+        profiler.mark("level")
+        ghost_rect = ghosts.draw(screen, camera_x, simulation.steps, alpha) if ghosts is not None else None
+        dirty.track("ghosts", ghost_rect, (simulation.steps, alpha))
+        profiler.mark("ghosts")
+        player_rect = player.draw(screen, camera_x, alpha)
+        dirty.track("player", player_rect, player.rotation_degrees)
+        profiler.mark("player_draw")
+        dirty.track("attempts", draw_attempts(screen, font, attempts), attempts)
 
-            camera_x = compute_camera_x(player.rect.centerx, level.width_px)
+        message = MESSAGES.get(state)
+        message_rect = draw_center_message(screen, big_font, font, *message) if message else None
+        dirty.track("message", message_rect, message)
+        dirty.track("profiler", profiler.draw(screen, font), profiler.panel_builds)
+        profiler.mark("ui")
 
-        screen.fill(BACKGROUND_COLOR)
-        draw_level(screen, level, camera_x)
-        player.draw(screen, camera_x)
-        draw_attempts(screen, font, attempts)
-
-        if state == GameState.MENU:
-            draw_center_message(screen, big_font, font, "Geometry Dash Clone", "Press Space or Click to Start")
-        elif state == GameState.DEAD:
-            draw_center_message(screen, big_font, font, "You Died", "Press Space or Click to Retry")
-        elif state == GameState.WIN:
-            draw_center_message(screen, big_font, font, "Level Complete", "Press Space or Click to Play Again")
-
-        pygame.display.flip()
+        dirty.flush(screen)
+        profiler.mark("flip")
+        if trace_startup() and profiler.frames == 0:
+            # The first complete frame; a startup trace ends here.
+            mark_startup("ready")
+            running = False
         # Required for browser/pygbag event loop cooperation.
         await asyncio.sleep(0)
+        profiler.mark("yield")
+        profiler.end_frame()
 
+    # An attempt cut short by quitting is kept too, still running.
+    if recorder is not None and state == GameState.PLAYING:
+        recorder.finish(simulation)
+    if analytics is not None:
+        analytics.close()
+    profiler.finish()
     pygame.quit()
 
 
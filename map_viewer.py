@@ -1,21 +1,32 @@
 from __future__ import annotations
 
+import math
 import sys
+from collections import OrderedDict
 from pathlib import Path
 
+import numpy as np
 import pygame
 
 from settings import (
     BACKGROUND_COLOR,
     BASE_DIR,
+    BINARY_LEVEL_SUFFIX,
     END_COLOR,
     GROUND_COLOR,
     LEVEL_PATH,
+    MERGE_SOLIDS,
     SCREEN_HEIGHT,
     SCREEN_WIDTH,
     SPIKE_COLOR,
     TILE_SIZE,
 )
+from analytics import level_heatmap
+from colliders import collider_tiles, merge_runs, tile_colliders
+from grid_model import TileGrid
+from level_binary import SOLID, TILE_CHARS, save_rows_binary
+from profiler import FrameProfiler
+from solver import describe, solve
 
 
 MARGIN = 24
@@ -25,6 +36,15 @@ GRID_COLOR = (71, 85, 105)
 START_COLOR = (59, 130, 246)
 TEXT_COLOR = (241, 245, 249)
 SELECTED_COLOR = (250, 204, 21)
+FAIL_COLOR = (248, 113, 113)
+SELECTION_COLOR = (56, 189, 248)
+HEAT_COLOR = (239, 68, 68)
+COLLIDER_COLOR = (167, 139, 250)
+HEAT_MAX_ALPHA = 190
+
+PYRAMID_CHUNK_TILES = 32
+PYRAMID_MAX_LEVEL = 6
+PYRAMID_MEMORY_BUDGET = 128 * 1024 * 1024
 
 EDITABLE_TILES = [".", "#", "^", "S", "E"]
 TILE_LABELS = {
@@ -53,6 +73,14 @@ def is_save_shortcut(event: pygame.event.Event) -> bool:
     return has_command_mod(event.mod)
 
 
+def is_copy_shortcut(event: pygame.event.Event) -> bool:
+    return event.key == pygame.K_c and has_command_mod(event.mod)
+
+
+def is_paste_shortcut(event: pygame.event.Event) -> bool:
+    return event.key == pygame.K_v and has_command_mod(event.mod)
+
+
 def resolve_level_path() -> Path:
     if len(sys.argv) > 1:
         level_arg = Path(sys.argv[1])
@@ -62,55 +90,219 @@ def resolve_level_path() -> Path:
     return LEVEL_PATH
 
 
-def load_grid(path: Path) -> list[list[str]]:
-    raw_lines = [line.rstrip("\n") for line in path.read_text().splitlines() if line.strip()]
-    if not raw_lines:
-        raise ValueError(f"Level file {path} is empty.")
-    width = max(len(line) for line in raw_lines)
-    return [list(line.ljust(width, ".")) for line in raw_lines]
+def load_grid(path: Path) -> TileGrid:
+    return TileGrid.from_file(path)
 
 
-def save_grid(path: Path, grid: list[list[str]]) -> None:
+def save_grid(path: Path, grid: TileGrid) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
-    lines = ["".join(row) for row in grid]
+    lines = grid.to_lines()
+    if path.suffix == BINARY_LEVEL_SUFFIX:
+        save_rows_binary(path, lines)
+        return
     path.write_text("\n".join(lines) + "\n")
 
 
-def find_tile(grid: list[list[str]], tile: str) -> tuple[int, int] | None:
-    for row_idx, row in enumerate(grid):
-        for col_idx, value in enumerate(row):
-            if value == tile:
-                return row_idx, col_idx
-    return None
-
-
-def build_world_surface(grid: list[list[str]]) -> pygame.Surface:
-    rows = len(grid)
-    cols = len(grid[0]) if rows else 1
-    surface = pygame.Surface((max(1, cols * TILE_SIZE), max(1, rows * TILE_SIZE)), pygame.SRCALPHA)
+def draw_tile(surface: pygame.Surface, tile: str, row_idx: int, col_idx: int, first_col: int = 0) -> None:
+    x = (col_idx - first_col) * TILE_SIZE
+    y = row_idx * TILE_SIZE
+    rect = pygame.Rect(x, y, TILE_SIZE, TILE_SIZE)
+    if tile == "#":
+        pygame.draw.rect(surface, GROUND_COLOR, rect)
+    elif tile == "^":
+        points = [
+            (x + TILE_SIZE // 2, y),
+            (x + TILE_SIZE, y + TILE_SIZE),
+            (x, y + TILE_SIZE),
+        ]
+        pygame.draw.polygon(surface, SPIKE_COLOR, points)
+    elif tile == "E":
+        pygame.draw.rect(surface, END_COLOR, rect, border_radius=5)
+    elif tile == "S":
+        pygame.draw.rect(surface, START_COLOR, rect, border_radius=5)
+
+
+def draw_tiles(surface: pygame.Surface, codes: np.ndarray, first_col: int, offset_col: int) -> None:
+    # np.nonzero walks the array row by row, so tiles are drawn in the same
+    # order a row-major loop over the level would draw them.
+    for row_idx, col_idx in zip(*np.nonzero(codes)):
+        draw_tile(surface, TILE_CHARS[codes[row_idx, col_idx]], int(row_idx), int(col_idx) + offset_col, first_col)
+
+
+def build_world_surface(grid: TileGrid) -> pygame.Surface:
+    surface = pygame.Surface((max(1, grid.cols * TILE_SIZE), max(1, grid.rows * TILE_SIZE)), pygame.SRCALPHA)
     surface.fill(BACKGROUND_COLOR)
-
-    for row_idx, row in enumerate(grid):
-        for col_idx, tile in enumerate(row):
-            x = col_idx * TILE_SIZE
-            y = row_idx * TILE_SIZE
-            rect = pygame.Rect(x, y, TILE_SIZE, TILE_SIZE)
-            if tile == "#":
-                pygame.draw.rect(surface, GROUND_COLOR, rect)
-            elif tile == "^":
-                points = [
-                    (x + TILE_SIZE // 2, y),
-                    (x + TILE_SIZE, y + TILE_SIZE),
-                    (x, y + TILE_SIZE),
-                ]
-                pygame.draw.polygon(surface, SPIKE_COLOR, points)
-            elif tile == "E":
-                pygame.draw.rect(surface, END_COLOR, rect, border_radius=5)
-            elif tile == "S":
-                pygame.draw.rect(surface, START_COLOR, rect, border_radius=5)
+    draw_tiles(surface, grid.codes, 0, 0)
     return surface
 
 
+def redraw_cells(
+    surface: pygame.Surface,
+    grid: TileGrid,
+    cells: list[tuple[int, int]],
+    first_col: int = 0,
+) -> None:
+    rows = grid.rows
+    cols = grid.cols
+    # Spike triangles spill one pixel into the cells right of and below them,
+    # so an edit also refreshes those neighbours, and each refreshed cell
+    # replays the tiles that can spill into it in build_world_surface order.
+    affected = {
+        (row + dr, col + dc)
+        for row, col in cells
+        for dr in (0, 1)
+        for dc in (0, 1)
+        if row + dr < rows and col + dc < cols
+    }
+    for row, col in affected:
+        rect = pygame.Rect((col - first_col) * TILE_SIZE, row * TILE_SIZE, TILE_SIZE, TILE_SIZE)
+        surface.set_clip(rect)
+        surface.fill(BACKGROUND_COLOR, rect)
+        for source_row, source_col in ((row - 1, col - 1), (row - 1, col), (row, col - 1), (row, col)):
+            if source_row >= 0 and source_col >= 0 and grid.codes[source_row, source_col]:
+                draw_tile(surface, grid.get(source_row, source_col), source_row, source_col, first_col)
+    surface.set_clip(None)
+
+
+class TilePyramid:
+    def __init__(
+        self,
+        grid: TileGrid,
+        chunk_tiles: int = PYRAMID_CHUNK_TILES,
+        memory_budget: int = PYRAMID_MEMORY_BUDGET,
+    ) -> None:
+        self.grid = grid
+        self.rows = grid.rows
+        self.cols = max(1, grid.cols)
+        self.chunk_tiles = chunk_tiles
+        self.memory_budget = memory_budget
+        self.chunk_count = max(1, math.ceil(self.cols / chunk_tiles))
+        # (level, chunk) -> surface; level k is level 0 halved k times.
+        self._chunks: OrderedDict[tuple[int, int], pygame.Surface] = OrderedDict()
+        self._bytes = 0
+        # chunk -> (scale key, surface) for the chunks drawn last frame.
+        self._scaled: dict[int, tuple[tuple, pygame.Surface]] = {}
+
+    def _store(self, key: tuple[int, int], surface: pygame.Surface) -> None:
+        self._chunks[key] = surface
+        self._bytes += surface.get_width() * surface.get_height() * surface.get_bytesize()
+        while self._bytes > self.memory_budget and len(self._chunks) > 1:
+            _, evicted = self._chunks.popitem(last=False)
+            self._bytes -= evicted.get_width() * evicted.get_height() * evicted.get_bytesize()
+
+    def _drop(self, key: tuple[int, int]) -> None:
+        surface = self._chunks.pop(key, None)
+        if surface is not None:
+            self._bytes -= surface.get_width() * surface.get_height() * surface.get_bytesize()
+
+    def _build_base(self, index: int) -> pygame.Surface:
+        first_col = index * self.chunk_tiles
+        last_col = min(self.cols, first_col + self.chunk_tiles)
+        surface = pygame.Surface((max(1, (last_col - first_col) * TILE_SIZE), max(1, self.rows * TILE_SIZE)))
+        surface.fill(BACKGROUND_COLOR)
+        # Start one column early so spikes spilling across the seam match a
+        # full build_world_surface pixel for pixel.
+        source_col = max(0, first_col - 1)
+        draw_tiles(surface, self.grid.codes[:, source_col:last_col], first_col, source_col)
+        return surface
+
+    def chunk(self, level: int, index: int) -> pygame.Surface:
+        key = (level, index)
+        surface = self._chunks.get(key)
+        if surface is not None:
+            self._chunks.move_to_end(key)
+            return surface
+        if level == 0:
+            surface = self._build_base(index)
+        else:
+            parent = self.chunk(level - 1, index)
+            size = (max(1, (parent.get_width() + 1) // 2), max(1, (parent.get_height() + 1) // 2))
+            surface = pygame.transform.smoothscale(parent, size)
+        self._store(key, surface)
+        return surface
+
+    def invalidate(self, cells: list[tuple[int, int]]) -> None:
+        touched: dict[int, list[tuple[int, int]]] = {}
+        for row, col in cells:
+            # Edits can spill into the next column, which may start a new chunk.
+            for index in {col // self.chunk_tiles, (col + 1) // self.chunk_tiles}:
+                if index < self.chunk_count:
+                    touched.setdefault(index, []).append((row, col))
+        for index, chunk_cells in touched.items():
+            base = self._chunks.get((0, index))
+            if base is not None:
+                redraw_cells(base, self.grid, chunk_cells, index * self.chunk_tiles)
+            for level in range(1, PYRAMID_MAX_LEVEL + 1):
+                self._drop((level, index))
+            self._scaled.pop(index, None)
+
+    def invalidate_columns(self, first_col: int, last_col: int) -> None:
+        # Bulk edits touch too many cells to patch one by one; the chunks they
+        # cover (plus the spill column) are dropped and rebuilt on demand.
+        first = max(0, first_col // self.chunk_tiles)
+        last = min(self.chunk_count - 1, (last_col + 1) // self.chunk_tiles)
+        for index in range(first, last + 1):
+            for level in range(PYRAMID_MAX_LEVEL + 1):
+                self._drop((level, index))
+            self._scaled.pop(index, None)
+
+    def draw(self, surface: pygame.Surface, draw_x: int, draw_y: int, zoom: float) -> None:
+        level = 0
+        if zoom < 1.0:
+            level = min(PYRAMID_MAX_LEVEL, int(math.floor(math.log2(1.0 / zoom))))
+        chunk_px = self.chunk_tiles * TILE_SIZE
+        world_w = self.cols * TILE_SIZE
+        dst_top = draw_y
+        dst_h = max(1, int(self.rows * TILE_SIZE * zoom))
+        screen_w, screen_h = surface.get_size()
+        if dst_top >= screen_h or dst_top + dst_h <= 0:
+            self._scaled.clear()
+            return
+
+        first = max(0, int(-draw_x / zoom) // chunk_px)
+        last = min(self.chunk_count - 1, int((screen_w - draw_x) / zoom) // chunk_px)
+        scaled: dict[int, tuple[tuple, pygame.Surface]] = {}
+        for index in range(first, last + 1):
+            left = index * chunk_px
+            right = min(world_w, left + chunk_px)
+            dst_left = draw_x + int(left * zoom)
+            dst_right = draw_x + int(right * zoom)
+            if dst_right <= 0 or dst_left >= screen_w or dst_right <= dst_left:
+                continue
+
+            source = self.chunk(level, index)
+            if zoom <= 1.0:
+                # Zoomed out, the whole chunk is small once scaled; keep it.
+                key = (level, dst_right - dst_left, dst_h)
+                area = source.get_rect()
+                blit_pos = (dst_left, dst_top)
+            else:
+                # Zoomed in, scale only the part of the chunk on screen.
+                vis_left = max(dst_left, 0)
+                vis_right = min(dst_right, screen_w)
+                vis_top = max(dst_top, 0)
+                vis_bottom = min(dst_top + dst_h, screen_h)
+                src_x0 = int((vis_left - dst_left) / zoom)
+                src_x1 = min(source.get_width(), math.ceil((vis_right - dst_left) / zoom))
+                src_y0 = int((vis_top - dst_top) / zoom)
+                src_y1 = min(source.get_height(), math.ceil((vis_bottom - dst_top) / zoom))
+                area = pygame.Rect(src_x0, src_y0, max(1, src_x1 - src_x0), max(1, src_y1 - src_y0))
+                blit_pos = (dst_left + int(src_x0 * zoom), dst_top + int(src_y0 * zoom))
+                key = (level, tuple(area), zoom)
+
+            cached = self._scaled.get(index)
+            if cached is not None and cached[0] == key:
+                image = cached[1]
+            elif zoom <= 1.0:
+                image = pygame.transform.smoothscale(source, (key[1], key[2]))
+            else:
+                size = (max(1, int(area.right * zoom) - int(area.x * zoom)), max(1, int(area.bottom * zoom) - int(area.y * zoom)))
+                image = pygame.transform.smoothscale(source.subsurface(area), size)
+            scaled[index] = (key, image)
+            surface.blit(image, blit_pos)
+        self._scaled = scaled
+
+
 def fit_zoom(window_size: tuple[int, int], world_size: tuple[int, int]) -> float:
     win_w, win_h = window_size
     world_w, world_h = world_size
@@ -139,44 +331,91 @@ def screen_to_cell(
     return row, col
 
 
-def place_tile(grid: list[list[str]], row: int, col: int, tile: str) -> bool:
-    current = grid[row][col]
-    if tile not in EDITABLE_TILES:
-        return False
-    if current == tile:
-        return False
+def build_heat_strip(deaths: np.ndarray) -> pygame.Surface:
+    # One pixel per column, stretched over the level when drawn. Square-root
+    # scaling keeps columns with a few deaths visible next to the worst one.
+    strip = pygame.Surface((max(1, len(deaths)), 1), pygame.SRCALPHA)
+    strip.fill(HEAT_COLOR)
+    if len(deaths) and deaths.max() > 0:
+        alpha = np.sqrt(deaths / deaths.max()) * HEAT_MAX_ALPHA
+        pygame.surfarray.pixels_alpha(strip)[:, 0] = alpha.astype(np.uint8)
+    else:
+        strip.fill((0, 0, 0, 0))
+    return strip
 
-    if tile in ("S", "E"):
-        existing = find_tile(grid, tile)
-        if existing is not None:
-            erow, ecol = existing
-            grid[erow][ecol] = "."
 
-    grid[row][col] = tile
-    return True
+def draw_heat_strip(
+    surface: pygame.Surface,
+    strip: pygame.Surface,
+    draw_x: int,
+    draw_y: int,
+    rows: int,
+    zoom: float,
+) -> None:
+    # Only the visible columns are scaled, so zooming in stays cheap.
+    cell = TILE_SIZE * zoom
+    first = max(0, math.floor(-draw_x / cell))
+    last = min(strip.get_width(), math.ceil((surface.get_width() - draw_x) / cell))
+    top = max(0, draw_y)
+    bottom = min(surface.get_height(), draw_y + int(rows * cell))
+    if first >= last or top >= bottom:
+        return
+    x0 = draw_x + int(first * cell)
+    x1 = draw_x + int(last * cell)
+    visible = strip.subsurface((first, 0, last - first, 1))
+    surface.blit(pygame.transform.scale(visible, (max(1, x1 - x0), bottom - top)), (x0, top))
 
 
 def draw_grid_overlay(surface: pygame.Surface, draw_x: int, draw_y: int, cols: int, rows: int, zoom: float) -> None:
     if zoom < 0.3:
         return
     tile_px = max(1, int(TILE_SIZE * zoom))
-    for col in range(cols + 1):
+    screen_w, screen_h = surface.get_size()
+    # Only lines that land inside the window are drawn.
+    first_col = max(0, -draw_x // tile_px)
+    last_col = min(cols, (screen_w - draw_x) // tile_px)
+    first_row = max(0, -draw_y // tile_px)
+    last_row = min(rows, (screen_h - draw_y) // tile_px)
+    top = max(0, draw_y)
+    bottom = min(screen_h, draw_y + rows * tile_px)
+    left = max(0, draw_x)
+    right = min(screen_w, draw_x + cols * tile_px)
+    for col in range(first_col, last_col + 1):
         x = draw_x + col * tile_px
-        pygame.draw.line(surface, GRID_COLOR, (x, draw_y), (x, draw_y + rows * tile_px), 1)
-    for row in range(rows + 1):
+        pygame.draw.line(surface, GRID_COLOR, (x, top), (x, bottom), 1)
+    for row in range(first_row, last_row + 1):
         y = draw_y + row * tile_px
-        pygame.draw.line(surface, GRID_COLOR, (draw_x, y), (draw_x + cols * tile_px, y), 1)
+        pygame.draw.line(surface, GRID_COLOR, (left, y), (right, y), 1)
 
 
-def ensure_required_markers(grid: list[list[str]]) -> None:
-    rows = len(grid)
-    cols = len(grid[0]) if rows else 0
-    if rows == 0 or cols == 0:
-        return
-    if find_tile(grid, "S") is None:
-        grid[max(0, rows - 2)][0] = "S"
-    if find_tile(grid, "E") is None:
-        grid[max(0, rows - 2)][max(0, cols - 1)] = "E"
+def selection_bounds(anchor: tuple[int, int], corner: tuple[int, int]) -> tuple[int, int, int, int]:
+    return (
+        min(anchor[0], corner[0]),
+        min(anchor[1], corner[1]),
+        max(anchor[0], corner[0]),
+        max(anchor[1], corner[1]),
+    )
+
+
+def hovered_collider(grid: TileGrid, row: int, col: int) -> tuple[int, int, int, int] | None:
+    # Cell bounds of the collider the game builds for a solid tile. Runs never
+    # span rows, so the hovered row is all that needs merging.
+    if grid.codes[row, col] != SOLID:
+        return None
+    solids = [
+        pygame.Rect(int(solid_col) * TILE_SIZE, row * TILE_SIZE, TILE_SIZE, TILE_SIZE)
+        for solid_col in np.flatnonzero(grid.codes[row] == SOLID)
+    ]
+    tiles = collider_tiles(tile_colliders(merge_runs(solids) if MERGE_SOLIDS else solids)[(row, col)])
+    return tiles[0][0], tiles[0][1], tiles[-1][0], tiles[-1][1]
+
+
+def cell_rect(draw_x: int, draw_y: int, zoom: float, top: int, left: int, bottom: int, right: int) -> pygame.Rect:
+    x0 = draw_x + int(left * TILE_SIZE * zoom)
+    y0 = draw_y + int(top * TILE_SIZE * zoom)
+    x1 = draw_x + int((right + 1) * TILE_SIZE * zoom)
+    y1 = draw_y + int((bottom + 1) * TILE_SIZE * zoom)
+    return pygame.Rect(x0, y0, max(2, x1 - x0), max(2, y1 - y0))
 
 
 def main() -> None:
@@ -184,68 +423,152 @@ def main() -> None:
     if not level_path.exists():
         raise FileNotFoundError(f"Level file not found: {level_path}")
 
+    grid = load_grid(level_path)
+    grid.ensure_required_markers()
+
     pygame.init()
     pygame.display.set_caption(f"Level Editor - {level_path.name}")
     screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.RESIZABLE)
     clock = pygame.time.Clock()
     font = pygame.font.SysFont("freesansbold", 18)
 
-    grid = load_grid(level_path)
-    ensure_required_markers(grid)
-
-    zoom = fit_zoom(screen.get_size(), (len(grid[0]) * TILE_SIZE, len(grid) * TILE_SIZE))
+    zoom = fit_zoom(screen.get_size(), (grid.cols * TILE_SIZE, grid.rows * TILE_SIZE))
     pan_x = 0.0
     pan_y = 0.0
     selected_tile = "^"
     dirty = False
     status_message = ""
     status_timer = 0.0
+    fail_column: int | None = None
     running = True
     left_mouse_down = False
     right_mouse_down = False
+    selection: tuple[int, int, int, int] | None = None
+    select_anchor: tuple[int, int] | None = None
+    clipboard: np.ndarray | None = None
+    # Deaths per column from the analytics log, shown with H.
+    heat_strip: pygame.Surface | None = None
+
+    # The world is kept as a pyramid of chunk surfaces in which only edited
+    # cells are redrawn, and frames where nothing happened skip rendering.
+    pyramid = TilePyramid(grid)
+    needs_redraw = True
+    last_hovered: tuple[int, int] | None = None
+    profiler = FrameProfiler()
 
     while running:
         dt = min(clock.tick(120) / 1000.0, 1 / 20)
-        rows = len(grid)
-        cols = len(grid[0]) if rows else 1
-        world = build_world_surface(grid)
-        world_rect = world.get_rect()
+        profiler.begin_frame()
+        rows = grid.rows
+        cols = max(1, grid.cols)
+        world_size = (cols * TILE_SIZE, rows * TILE_SIZE)
 
-        scaled_w = max(1, int(world_rect.width * zoom))
-        scaled_h = max(1, int(world_rect.height * zoom))
+        scaled_w = max(1, int(world_size[0] * zoom))
+        scaled_h = max(1, int(world_size[1] * zoom))
         center_x = (screen.get_width() - scaled_w) // 2
         center_y = (screen.get_height() - scaled_h) // 2
         draw_x = center_x - int(pan_x * zoom)
         draw_y = center_y - int(pan_y * zoom)
 
+        # Bulk edits report the cell box they touched; column edits resize
+        # the grid and need a fresh pyramid.
+        bulk_bounds: tuple[int, int, int, int] | None = None
+        resized = False
         for event in pygame.event.get():
+            needs_redraw = True
             if event.type == pygame.QUIT:
                 running = False
             elif event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_ESCAPE:
-                    running = False
+                    if selection is not None:
+                        selection = None
+                    else:
+                        running = False
                 elif event.key in (pygame.K_EQUALS, pygame.K_PLUS, pygame.K_KP_PLUS):
                     zoom = min(MAX_ZOOM, zoom * 1.15)
                 elif event.key in (pygame.K_MINUS, pygame.K_KP_MINUS):
                     zoom = max(MIN_ZOOM, zoom / 1.15)
                 elif event.key == pygame.K_f:
-                    zoom = fit_zoom(screen.get_size(), world.get_size())
+                    zoom = fit_zoom(screen.get_size(), world_size)
                     pan_x = 0.0
                     pan_y = 0.0
+                elif event.key == pygame.K_F3:
+                    profiler.toggle()
+                elif event.key == pygame.K_h:
+                    if heat_strip is not None:
+                        heat_strip = None
+                    else:
+                        # Deaths are matched to the level as saved, so unsaved
+                        # edits do not count.
+                        deaths = level_heatmap(level_path).sum(axis=0)
+                        heat_strip = build_heat_strip(deaths)
+                        status_message = f"{int(deaths.sum())} deaths logged"
+                        if deaths.any():
+                            status_message += f", most at column {int(deaths.argmax())}"
+                        status_timer = 2.0
                 elif event.key in KEY_TO_TILE:
                     selected_tile = KEY_TO_TILE[event.key]
                 elif is_save_shortcut(event):
-                    ensure_required_markers(grid)
+                    if grid.ensure_required_markers():
+                        pyramid = TilePyramid(grid)
                     save_grid(level_path, grid)
                     dirty = False
                     status_message = "Saved"
                     status_timer = 1.25
                 elif event.key == pygame.K_r:
-                    grid = load_grid(level_path)
-                    ensure_required_markers(grid)
+                    try:
+                        grid = load_grid(level_path)
+                    except (OSError, ValueError) as exc:
+                        status_message = str(exc)
+                        status_timer = 3.0
+                        continue
+                    grid.ensure_required_markers()
+                    pyramid = TilePyramid(grid)
                     dirty = False
                     status_message = "Reloaded"
                     status_timer = 1.0
+                    fail_column = None
+                    selection = None
+                    if heat_strip is not None:
+                        heat_strip = build_heat_strip(level_heatmap(level_path).sum(axis=0))
+                elif is_copy_shortcut(event):
+                    if selection is not None:
+                        clipboard = grid.copy_region(*selection)
+                        status_message = f"Copied {clipboard.shape[1]}x{clipboard.shape[0]} tiles"
+                        status_timer = 1.25
+                elif is_paste_shortcut(event):
+                    if clipboard is not None and last_hovered is not None:
+                        bulk_bounds = grid.paste_region(clipboard, *last_hovered)
+                elif event.key == pygame.K_v:
+                    if grid.ensure_required_markers():
+                        pyramid = TilePyramid(grid)
+                    result = solve(grid.occupancy())
+                    fail_column = result.fail_column
+                    status_message = describe(result)
+                    status_timer = 3.0
+                elif event.key in (pygame.K_g, pygame.K_b):
+                    if selected_tile in ("S", "E"):
+                        status_message = "Start and end can only be painted one cell at a time"
+                        status_timer = 2.0
+                    elif event.key == pygame.K_g and selection is not None:
+                        bulk_bounds = grid.fill_rect(*selection, selected_tile)
+                    elif event.key == pygame.K_b and last_hovered is not None:
+                        bulk_bounds = grid.flood_fill(*last_hovered, selected_tile)
+                elif event.key in (pygame.K_INSERT, pygame.K_i, pygame.K_DELETE, pygame.K_x):
+                    if selection is not None:
+                        first_col, count = selection[1], selection[3] - selection[1] + 1
+                    elif last_hovered is not None:
+                        first_col, count = last_hovered[1], 1
+                    else:
+                        continue
+                    if event.key in (pygame.K_INSERT, pygame.K_i):
+                        grid.insert_columns(first_col, count)
+                    else:
+                        grid.delete_columns(first_col, count)
+                    selection = None
+                    resized = True
+                    # Logged columns no longer line up with the grid.
+                    heat_strip = None
             elif event.type == pygame.MOUSEWHEEL:
                 if event.y > 0:
                     zoom = min(MAX_ZOOM, zoom * 1.1)
@@ -253,12 +576,19 @@ def main() -> None:
                     zoom = max(MIN_ZOOM, zoom / 1.1)
             elif event.type == pygame.MOUSEBUTTONDOWN:
                 if event.button == 1:
-                    left_mouse_down = True
+                    clicked = screen_to_cell(event.pos, draw_x, draw_y, zoom, cols, rows)
+                    if pygame.key.get_mods() & pygame.KMOD_SHIFT and clicked is not None:
+                        select_anchor = clicked
+                        selection = selection_bounds(clicked, clicked)
+                    else:
+                        left_mouse_down = True
+                        selection = None
                 elif event.button == 3:
                     right_mouse_down = True
             elif event.type == pygame.MOUSEBUTTONUP:
                 if event.button == 1:
                     left_mouse_down = False
+                    select_anchor = None
                 elif event.button == 3:
                     right_mouse_down = False
 
@@ -268,30 +598,79 @@ def main() -> None:
         pan_speed = 800.0 / max(zoom, MIN_ZOOM)
         if keys[pygame.K_LEFT] or (keys[pygame.K_a] and not has_mod):
             pan_x -= pan_speed * dt
+            needs_redraw = True
         if keys[pygame.K_RIGHT] or (keys[pygame.K_d] and not has_mod):
             pan_x += pan_speed * dt
+            needs_redraw = True
         if keys[pygame.K_UP] or (keys[pygame.K_w] and not has_mod):
             pan_y -= pan_speed * dt
+            needs_redraw = True
         if keys[pygame.K_DOWN] or (keys[pygame.K_s] and not has_mod):
             pan_y += pan_speed * dt
+            needs_redraw = True
+
+        profiler.mark("events")
+        if resized:
+            pyramid = TilePyramid(grid)
+            rows = grid.rows
+            cols = max(1, grid.cols)
+            dirty = True
+            fail_column = None
+        elif bulk_bounds is not None:
+            pyramid.invalidate_columns(bulk_bounds[1], bulk_bounds[3])
+            dirty = True
+            fail_column = None
 
         hovered = screen_to_cell(pygame.mouse.get_pos(), draw_x, draw_y, zoom, cols, rows)
-        if hovered is not None:
+        if hovered != last_hovered:
+            last_hovered = hovered
+            needs_redraw = True
+        if select_anchor is not None and hovered is not None:
+            selection = selection_bounds(select_anchor, hovered)
+        elif hovered is not None:
             row, col = hovered
+            changed: list[tuple[int, int]] = []
             if left_mouse_down:
-                if place_tile(grid, row, col, selected_tile):
-                    dirty = True
+                changed = grid.place(row, col, selected_tile)
             elif right_mouse_down:
-                if place_tile(grid, row, col, "."):
-                    dirty = True
+                changed = grid.place(row, col, ".")
+            if changed:
+                pyramid.invalidate(changed)
+                dirty = True
+                fail_column = None
+                needs_redraw = True
+
+        if status_timer > 0.0:
+            status_timer = max(0.0, status_timer - dt)
+            needs_redraw = True
+        # The overlay's numbers change every frame while it is shown.
+        if not needs_redraw and not profiler.visible:
+            continue
+        needs_redraw = False
+        profiler.mark("edit")
 
         screen.fill(BACKGROUND_COLOR)
-        scaled_world = pygame.transform.smoothscale(world, (scaled_w, scaled_h))
-        screen.blit(scaled_world, (draw_x, draw_y))
+        pyramid.draw(screen, draw_x, draw_y, zoom)
+        profiler.mark("world")
+        if heat_strip is not None:
+            draw_heat_strip(screen, heat_strip, draw_x, draw_y, rows, zoom)
         draw_grid_overlay(screen, draw_x, draw_y, cols, rows, zoom)
 
+        if fail_column is not None:
+            fail_x = draw_x + int(fail_column * TILE_SIZE * zoom)
+            fail_w = max(2, int(TILE_SIZE * zoom))
+            pygame.draw.rect(screen, FAIL_COLOR, (fail_x, draw_y, fail_w, scaled_h), width=max(1, int(2 * zoom)))
+
+        if selection is not None:
+            outline = cell_rect(draw_x, draw_y, zoom, *selection)
+            pygame.draw.rect(screen, SELECTION_COLOR, outline, width=max(1, int(2 * zoom)))
+
         if hovered is not None:
             hrow, hcol = hovered
+            collider = hovered_collider(grid, hrow, hcol)
+            if collider is not None:
+                outline = cell_rect(draw_x, draw_y, zoom, *collider)
+                pygame.draw.rect(screen, COLLIDER_COLOR, outline, width=max(1, int(2 * zoom)))
             highlight = pygame.Rect(
                 draw_x + int(hcol * TILE_SIZE * zoom),
                 draw_y + int(hrow * TILE_SIZE * zoom),
@@ -299,26 +678,36 @@ def main() -> None:
                 max(2, int(TILE_SIZE * zoom)),
             )
             pygame.draw.rect(screen, SELECTED_COLOR, highlight, width=max(1, int(2 * zoom)))
+        profiler.mark("overlay")
 
         status = "*" if dirty else ""
         info = (
             f"{level_path.name}{status} | Tile {selected_tile} ({TILE_LABELS[selected_tile]}) | "
-            "1 empty 2 solid 3 spike 4 start 5 end | LMB paint RMB erase | Cmd/Ctrl+S save | R reload | "
-            "+/- zoom | WASD/arrows pan | F fit | Esc quit"
+            "1 empty 2 solid 3 spike 4 start 5 end | LMB paint RMB erase | Cmd/Ctrl+S save | R reload | V verify | "
+            "H deaths | +/- zoom | WASD/arrows pan | F fit | Esc quit"
         )
         text = font.render(info, True, TEXT_COLOR)
         screen.blit(text, (12, 10))
+        tools = (
+            "Shift+drag select | G fill selection | B flood fill | I/Ins insert columns | X/Del delete columns | "
+            "Cmd/Ctrl+C copy | Cmd/Ctrl+V paste"
+        )
+        screen.blit(font.render(tools, True, TEXT_COLOR), (12, 34))
         if status_timer > 0.0:
-            status_timer = max(0.0, status_timer - dt)
             status = font.render(status_message, True, (134, 239, 172))
-            screen.blit(status, (12, 34))
+            screen.blit(status, (12, 58))
+        profiler.draw(screen, font)
+        profiler.mark("hud")
 
         pygame.display.flip()
+        profiler.mark("flip")
+        profiler.end_frame()
 
     if dirty:
-        ensure_required_markers(grid)
+        grid.ensure_required_markers()
         save_grid(level_path, grid)
 
+    profiler.finish()
     pygame.quit()
 
 
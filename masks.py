@@ -0,0 +1,46 @@
+import math
+from functools import lru_cache
+
+import pygame
+
+from settings import TILE_SIZE
+from sweep import Move
+
+
+@lru_cache(maxsize=None)
+def spike_mask(size: int = TILE_SIZE) -> pygame.Mask:
+    # The triangle exactly as the level renderer draws it into a tile.
+    surface = pygame.Surface((size, size), pygame.SRCALPHA)
+    pygame.draw.polygon(surface, (255, 255, 255), [(size // 2, 0), (size, size), (0, size)])
+    return pygame.mask.from_surface(surface)
+
+
+@lru_cache(maxsize=None)
+def spike_bounds(size: int = TILE_SIZE) -> pygame.Rect:
+    return spike_mask(size).get_bounding_rects()[0]
+
+
+@lru_cache(maxsize=None)
+def player_mask(size: int) -> pygame.Mask:
+    # Rotation is only drawn; the player collides as its unrotated square.
+    return pygame.Mask((size, size), fill=True)
+
+
+def move_touches_spike(move: Move, size: int, hitbox: pygame.Rect) -> bool:
+    # Narrow phase after the swept hitbox test: the player's mask is tried at
+    # the pixel it occupies at least once per pixel of travel.
+    bounds = spike_bounds()
+    tile_x = hitbox.x - bounds.x
+    tile_y = hitbox.y - bounds.y
+    spike = spike_mask()
+    player = player_mask(size)
+    x0, y0, x1, y1 = move
+    dx = x1 - x0
+    dy = y1 - y0
+    samples = max(1, math.ceil(max(abs(dx), abs(dy))))
+    for k in range(samples + 1):
+        t = k / samples
+        offset = (math.floor(x0 + dx * t) - tile_x, math.floor(y0 + dy * t) - tile_y)
+        if spike.overlap(player, offset) is not None:
+            return True
+    return False
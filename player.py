@@ -1,32 +1,34 @@
 import math
+
 import pygame
 
 from settings import (
     COYOTE_TIME,
     FORWARD_SPEED,
-    GRAVITY,
     JUMP_BUFFER_TIME,
     JUMP_VELOCITY,
-    MAX_FALL_SPEED,
-    PLAYER_COLOR,
+    SWEEP_MAX_STEP,
     TILE_SIZE,
 )
+from spatial import ColumnIndex
+from sprites import player_sprites
+from sweep import X_AXIS, Y_AXIS, Move, fall, move_span, sweep
 
 
 class Player:
     def __init__(self, x: float, y: float) -> None:
         size = int(TILE_SIZE * 0.85)
         self.rect = pygame.Rect(int(x), int(y), size, size)
-        self.velocity_y = 0.0
-        self.grounded = False
-        self.rotation_degrees = 0.0
-        self.coyote_timer = 0.0
-        self.jump_buffer_timer = 0.0
-        self.hit_head = False
-        self.hit_wall = False
+        self.reset(x, y)
 
     def reset(self, x: float, y: float) -> None:
-        self.rect.topleft = (int(x), int(y))
+        # Motion is tracked in floats; rect is the position floored to whole
+        # pixels for drawing and reporting.
+        self.x = float(x)
+        self.y = float(y)
+        self.rect.topleft = (math.floor(self.x), math.floor(self.y))
+        self.previous_pos = (self.x, self.y)
+        self.moves: list[Move] = []
         self.velocity_y = 0.0
         self.grounded = False
         self.rotation_degrees = 0.0
@@ -47,10 +49,43 @@ class Player:
             self.coyote_timer = 0.0
             self.jump_buffer_timer = 0.0
 
-    def update(self, dt: float, solids: list[pygame.Rect], jump_held: bool) -> None:
+    def update(self, dt: float, solids: ColumnIndex, jump_held: bool) -> None:
         self.hit_head = False
         self.hit_wall = False
-
+        self.previous_pos = (self.x, self.y)
+        self.moves = []
+
+        # Long steps are split so each straight sweep stays close to the
+        # true arc; at the normal step length there is a single segment.
+        segments = max(1, math.ceil(dt / SWEEP_MAX_STEP - 1e-9))
+        for _ in range(segments):
+            self._advance(dt / segments, solids, jump_held)
+        self.rect.topleft = (math.floor(self.x), math.floor(self.y))
+
+    def _first_contact(self, solids: ColumnIndex, dx: float, dy: float) -> tuple[float, int, float] | None:
+        size = self.rect.width
+        best: tuple[float, int, float] | None = None
+        left, right = move_span((self.x, self.y, self.x + dx, self.y + dy), size)
+        for solid in solids.query_span(left, right):
+            enter, leave, axis = sweep(self.x, self.y, dx, dy, size, solid)
+            if not (enter < leave and 0.0 <= enter < 1.0):
+                continue
+            # The earliest contact wins; at equal times a landing beats a
+            # wall, so the result does not depend on the order solids come in.
+            if best is None or enter < best[0] or (enter == best[0] and axis == Y_AXIS and best[1] == X_AXIS):
+                if axis == Y_AXIS:
+                    edge = float(solid.top - size) if dy > 0.0 else float(solid.bottom)
+                else:
+                    edge = float(solid.left - size) if dx > 0.0 else float(solid.right)
+                best = (enter, axis, edge)
+        return best
+
+    def _move_to(self, x: float, y: float) -> None:
+        self.moves.append((self.x, self.y, x, y))
+        self.x = x
+        self.y = y
+
+    def _advance(self, dt: float, solids: ColumnIndex, jump_held: bool) -> None:
         if jump_held:
             self.request_jump()
         else:
@@ -63,35 +98,31 @@ class Player:
 
         self._try_consume_jump()
 
-        dx = int(FORWARD_SPEED * dt)
-        self.rect.x += dx
-        for solid in solids:
-            if not self.rect.colliderect(solid):
-                continue
-            if dx > 0:
-                self.hit_wall = True
-            elif dx < 0:
-                self.hit_wall = True
-
-        self.velocity_y += GRAVITY * dt
-        if self.velocity_y > MAX_FALL_SPEED:
-            self.velocity_y = MAX_FALL_SPEED
-
-        dy = int(self.velocity_y * dt)
-        self.rect.y += dy
+        dx = FORWARD_SPEED * dt
+        dy, velocity_y = fall(self.velocity_y, dt)
         self.grounded = False
 
-        for solid in solids:
-            if not self.rect.colliderect(solid):
-                continue
-            if dy > 0:
-                self.rect.bottom = solid.top
-                self.velocity_y = 0.0
-                self.grounded = True
-            elif dy < 0:
-                self.rect.top = solid.bottom
-                self.velocity_y = 0.0
-                self.hit_head = True
+        # Each contact stops motion along one axis, so there are at most two
+        # before the rest of the move is free.
+        for _ in range(2):
+            contact = self._first_contact(solids, dx, dy)
+            if contact is None:
+                break
+            enter, axis, edge = contact
+            if axis == Y_AXIS:
+                self._move_to(self.x + dx * enter, edge)
+                if dy > 0.0:
+                    self.grounded = True
+                else:
+                    self.hit_head = True
+                velocity_y = 0.0
+                dx, dy = dx * (1.0 - enter), 0.0
+            else:
+                self._move_to(edge, self.y + dy * enter)
+                self.hit_wall = True
+                dx, dy = 0.0, dy * (1.0 - enter)
+        self._move_to(self.x + dx, self.y + dy)
+        self.velocity_y = velocity_y
 
         if self.grounded:
             self.coyote_timer = COYOTE_TIME
@@ -103,26 +134,13 @@ class Player:
         else:
             self.rotation_degrees = (self.rotation_degrees + 450.0 * dt) % 360.0
 
-    def draw(self, surface: pygame.Surface, camera_x: int) -> None:
-        center_x = self.rect.centerx - camera_x
-        center_y = self.rect.centery
-
-        base = pygame.Surface((self.rect.width, self.rect.height), pygame.SRCALPHA)
-        base.fill(PLAYER_COLOR)
-        rotated = pygame.transform.rotate(base, self.rotation_degrees)
-        draw_rect = rotated.get_rect(center=(center_x, center_y))
-        surface.blit(rotated, draw_rect.topleft)
-
-        eye_radius = max(2, self.rect.width // 10)
-        eye_offset = self.rect.width // 5
-        pupil = (20, 20, 20)
-        eye = (245, 245, 245)
-        angle = math.radians(self.rotation_degrees)
-        for side in (-1, 1):
-            ox = side * eye_offset
-            rx = ox * math.cos(angle)
-            ry = ox * math.sin(angle)
-            ex = int(center_x + rx)
-            ey = int(center_y + ry)
-            pygame.draw.circle(surface, eye, (ex, ey), eye_radius + 1)
-            pygame.draw.circle(surface, pupil, (ex, ey), eye_radius)
+    def interpolated_center(self, alpha: float) -> tuple[int, int]:
+        prev_x, prev_y = self.previous_pos
+        x = prev_x + (self.x - prev_x) * alpha
+        y = prev_y + (self.y - prev_y) * alpha
+        return math.floor(x) + self.rect.width // 2, math.floor(y) + self.rect.height // 2
+
+    def draw(self, surface: pygame.Surface, camera_x: int, alpha: float = 1.0) -> pygame.Rect:
+        center_x, center_y = self.interpolated_center(alpha)
+        sprites = player_sprites(self.rect.width)
+        return sprites.draw(surface, center_x - camera_x, center_y, self.rotation_degrees)
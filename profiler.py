@@ -0,0 +1,140 @@
+import csv
+import json
+import os
+import sys
+from array import array
+from pathlib import Path
+from time import perf_counter_ns
+
+import pygame
+
+from settings import PROFILER_HISTORY, PROFILER_REFRESH_FRAMES, TEXT_COLOR
+
+# Set to a .csv or .json path to write the recorded frames there on exit.
+TRACE_ENV = "GD_PROFILE_TRACE"
+TOTAL = "frame"
+PANEL_COLOR = (15, 23, 42, 200)
+
+
+def percentile(sorted_values: list[int], fraction: float) -> int:
+    if not sorted_values:
+        return 0
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+
+class FrameProfiler:
+    def __init__(self, history: int = PROFILER_HISTORY) -> None:
+        self.history = history
+        self.visible = False
+        self.frames = 0
+        # phase -> ring of per-frame nanoseconds; phases keep first-seen order.
+        self._rings: dict[str, array] = {TOTAL: array("q", bytes(8 * history))}
+        self._current: dict[str, int] = {}
+        self._frame_start = 0
+        self._last = 0
+        self._panel: pygame.Surface | None = None
+        # Bumped whenever the overlay is re-rendered, so callers can tell
+        # when its pixels changed.
+        self.panel_builds = 0
+
+    def begin_frame(self) -> None:
+        self._current.clear()
+        self._frame_start = self._last = perf_counter_ns()
+
+    def mark(self, phase: str) -> None:
+        # Lap timing: the phase is charged with everything since the previous
+        # mark, and repeated marks within a frame add up.
+        now = perf_counter_ns()
+        self._current[phase] = self._current.get(phase, 0) + now - self._last
+        self._last = now
+
+    def end_frame(self) -> None:
+        slot = self.frames % self.history
+        current = self._current
+        for phase in current:
+            if phase not in self._rings:
+                self._rings[phase] = array("q", bytes(8 * self.history))
+        for phase, ring in self._rings.items():
+            ring[slot] = current.get(phase, 0)
+        self._rings[TOTAL][slot] = self._last - self._frame_start
+        self.frames += 1
+        if self.visible and self.frames % PROFILER_REFRESH_FRAMES == 0:
+            self._panel = None
+
+    def toggle(self) -> None:
+        self.visible = not self.visible
+        self._panel = None
+
+    @property
+    def phases(self) -> list[str]:
+        return [phase for phase in self._rings if phase != TOTAL] + [TOTAL]
+
+    def samples(self, phase: str) -> list[int]:
+        # Oldest first, covering at most the last `history` frames.
+        ring = self._rings[phase]
+        if self.frames <= self.history:
+            return ring[:self.frames].tolist()
+        slot = self.frames % self.history
+        return (ring[slot:] + ring[:slot]).tolist()
+
+    def summary(self) -> dict[str, dict[str, float]]:
+        result = {}
+        for phase in self.phases:
+            values = sorted(self.samples(phase))
+            result[phase] = {
+                "p50_ms": percentile(values, 0.5) / 1e6,
+                "p99_ms": percentile(values, 0.99) / 1e6,
+                "mean_ms": sum(values) / len(values) / 1e6 if values else 0.0,
+            }
+        return result
+
+    def summary_lines(self) -> list[str]:
+        lines = [f"{'phase':<12}{'p50 ms':>9}{'p99 ms':>9}"]
+        for phase, stats in self.summary().items():
+            lines.append(f"{phase:<12}{stats['p50_ms']:>9.3f}{stats['p99_ms']:>9.3f}")
+        return lines
+
+    def draw(self, surface: pygame.Surface, font: pygame.font.Font) -> pygame.Rect | None:
+        if not self.visible:
+            return None
+        # The panel is re-rendered a few times a second, not every frame, so
+        # the overlay barely shows up in its own numbers.
+        if self._panel is None:
+            rendered = [font.render(line, True, TEXT_COLOR) for line in self.summary_lines()]
+            line_h = font.get_linesize()
+            width = max(text.get_width() for text in rendered) + 16
+            self._panel = pygame.Surface((width, line_h * len(rendered) + 12), pygame.SRCALPHA)
+            self._panel.fill(PANEL_COLOR)
+            for index, text in enumerate(rendered):
+                self._panel.blit(text, (8, 6 + index * line_h))
+            self.panel_builds += 1
+        return surface.blit(self._panel, (surface.get_width() - self._panel.get_width() - 12, 12))
+
+    def dump(self, path: Path) -> None:
+        phases = self.phases
+        columns = [self.samples(phase) for phase in phases]
+        first = max(0, self.frames - self.history)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if path.suffix == ".csv":
+            with path.open("w", newline="") as handle:
+                writer = csv.writer(handle)
+                writer.writerow(["frame"] + [f"{phase}_ns" for phase in phases])
+                for offset, row in enumerate(zip(*columns)):
+                    writer.writerow([first + offset, *row])
+            return
+        trace = {
+            "platform": sys.platform,
+            "frames": self.frames,
+            "first_frame": first,
+            "summary": self.summary(),
+            "samples_ns": dict(zip(phases, columns)),
+        }
+        path.write_text(json.dumps(trace, indent=2) + "\n")
+
+    def finish(self) -> None:
+        trace_path = os.environ.get(TRACE_ENV)
+        if trace_path:
+            self.dump(Path(trace_path))
+        elif sys.platform == "emscripten" and self.frames:
+            # The browser build has no file to write to; the console is the trace.
+            print("\n".join(self.summary_lines()))
@@ -0,0 +1,278 @@
+import argparse
+import hashlib
+import os
+import struct
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+from level import load_level, read_level_rows
+from settings import PHYSICS_STEP, REPLAY_DIR, REPLAY_SUFFIX
+from simulation import DeathCause, Outcome, Simulation
+from validate_levels import LEVELS_DIR, collect_paths
+
+# Layout: a fixed header, then one varint per input event holding the step
+# delta since the previous event shifted left by two, with the jump-held
+# state and a fresh press in the low bits.
+MAGIC = b"GDRP"
+VERSION = 1
+HEADER = struct.Struct("<4sH32sdBBIiiI")
+HELD = 1
+PRESSED = 2
+
+OUTCOMES = list(Outcome)
+CAUSES = [None, *DeathCause]
+
+
+@dataclass
+class Replay:
+    level_hash: bytes
+    step_seconds: float = PHYSICS_STEP
+    # (step, jump held from this step on, jump pressed on this step)
+    events: list[tuple[int, bool, bool]] = field(default_factory=list)
+    steps: int = 0
+    outcome: Outcome = Outcome.RUNNING
+    death_cause: DeathCause | None = None
+    final_pos: tuple[int, int] = (0, 0)
+
+
+def level_hash(rows: list[str]) -> bytes:
+    # Hashes the tiles rather than the file, so a level converted between
+    # the text and binary formats keeps its replays.
+    return hashlib.sha256("\n".join(rows).encode("ascii")).digest()
+
+
+def encode_replay(replay: Replay) -> bytes:
+    body = bytearray()
+    previous = 0
+    for step, held, pressed in replay.events:
+        value = (step - previous) << 2 | (HELD if held else 0) | (PRESSED if pressed else 0)
+        previous = step
+        while value >= 0x80:
+            body.append(value & 0x7F | 0x80)
+            value >>= 7
+        body.append(value)
+    header = HEADER.pack(
+        MAGIC,
+        VERSION,
+        replay.level_hash,
+        replay.step_seconds,
+        OUTCOMES.index(replay.outcome),
+        CAUSES.index(replay.death_cause),
+        replay.steps,
+        *replay.final_pos,
+        len(replay.events),
+    )
+    return header + bytes(body)
+
+
+def decode_replay(data: bytes) -> Replay:
+    if len(data) < HEADER.size:
+        raise ValueError("Replay file is too short for a header.")
+    magic, version, digest, step_seconds, outcome, cause, steps, final_x, final_y, count = HEADER.unpack_from(data, 0)
+    if magic != MAGIC:
+        raise ValueError("Not a replay file.")
+    if version != VERSION:
+        raise ValueError(f"Unsupported replay version {version}.")
+
+    events = []
+    offset = HEADER.size
+    step = 0
+    for _ in range(count):
+        value = shift = 0
+        while True:
+            if offset >= len(data):
+                raise ValueError("Replay file is truncated.")
+            byte = data[offset]
+            offset += 1
+            value |= (byte & 0x7F) << shift
+            shift += 7
+            if byte < 0x80:
+                break
+        step += value >> 2
+        events.append((step, bool(value & HELD), bool(value & PRESSED)))
+    return Replay(digest, step_seconds, events, steps, OUTCOMES[outcome], CAUSES[cause], (final_x, final_y))
+
+
+class ReplayRecorder:
+    def __init__(self, level_hash: bytes, directory: Path = REPLAY_DIR) -> None:
+        # level_hash is of the rows being played, taken when they were loaded.
+        self.level_hash = level_hash
+        self.directory = directory
+        self._events: list[tuple[int, bool, bool]] = []
+        self._held = False
+
+    def level_changed(self, level_hash: bytes) -> None:
+        # The level was reloaded; later runs are tagged with its new hash.
+        self.level_hash = level_hash
+
+    def start(self) -> None:
+        self._events = []
+        self._held = False
+
+    def record(self, step: int, held: bool, pressed: bool) -> None:
+        # Only changes are kept; a long hold is two events however long it is.
+        if held != self._held or pressed:
+            self._events.append((step, held, pressed))
+            self._held = held
+
+    def finish(self, simulation: Simulation) -> Path | None:
+        if simulation.steps == 0:
+            return None
+        replay = Replay(
+            level_hash=self.level_hash,
+            step_seconds=simulation.step_seconds,
+            events=self._events,
+            steps=simulation.steps,
+            outcome=simulation.outcome,
+            death_cause=simulation.death_cause,
+            final_pos=simulation.player.rect.topleft,
+        )
+        self._events = []
+        # One clock reading for both parts, in UTC, so names sort in recording
+        # order across a second boundary and across a DST change.
+        seconds, nanoseconds = divmod(time.time_ns(), 1_000_000_000)
+        stamp = time.strftime("%Y%m%d-%H%M%SZ", time.gmtime(seconds))
+        path = self.directory / f"{stamp}-{nanoseconds:09d}-{replay.outcome.name.lower()}{REPLAY_SUFFIX}"
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(encode_replay(replay))
+        except OSError:
+            return None
+        return path
+
+
+def play(simulation: Simulation, replay: Replay) -> None:
+    simulation.reset()
+    events = replay.events
+    index = 0
+    held = False
+    while simulation.steps < replay.steps:
+        pressed = False
+        if index < len(events) and events[index][0] == simulation.steps:
+            _, held, pressed = events[index]
+            index += 1
+        if simulation.step(held, pressed) != Outcome.RUNNING:
+            break
+
+
+def check(simulation: Simulation, replay: Replay) -> list[str]:
+    play(simulation, replay)
+    found = {
+        "outcome": simulation.outcome.name,
+        "death cause": simulation.death_cause.name if simulation.death_cause else None,
+        "steps": simulation.steps,
+        "final position": simulation.player.rect.topleft,
+    }
+    expected = {
+        "outcome": replay.outcome.name,
+        "death cause": replay.death_cause.name if replay.death_cause else None,
+        "steps": replay.steps,
+        "final position": replay.final_pos,
+    }
+    return [f"{name}: recorded {expected[name]}, replayed {found[name]}" for name in found if found[name] != expected[name]]
+
+
+def _verify_group(job: tuple[str, list[tuple[str, bytes]]]) -> list[tuple[str, list[str]]]:
+    level_path, replays = job
+    level = load_level(Path(level_path))
+    simulations: dict[float, Simulation] = {}
+    results = []
+    for path, data in replays:
+        try:
+            replay = decode_replay(data)
+        except ValueError as exc:
+            results.append((path, [str(exc)]))
+            continue
+        simulation = simulations.get(replay.step_seconds)
+        if simulation is None:
+            simulation = simulations[replay.step_seconds] = Simulation(level, replay.step_seconds)
+        results.append((path, check(simulation, replay)))
+    return results
+
+
+def index_levels(paths: list[Path]) -> dict[bytes, Path]:
+    levels = {}
+    for path in paths:
+        try:
+            levels[level_hash(read_level_rows(path))] = path
+        except (OSError, ValueError):
+            continue
+    return levels
+
+
+def collect_replays(targets: list[Path]) -> list[Path]:
+    paths: list[Path] = []
+    for target in targets:
+        paths.extend(sorted(target.glob(f"*{REPLAY_SUFFIX}")) if target.is_dir() else [target])
+    return paths
+
+
+def verify(replay_paths: list[Path], level_paths: list[Path], workers: int | None = None) -> dict[str, list[str]]:
+    levels = index_levels(level_paths)
+    failures: dict[str, list[str]] = {}
+    groups: dict[Path, list[tuple[str, bytes]]] = {}
+    for path in replay_paths:
+        data = path.read_bytes()
+        try:
+            digest = decode_replay(data).level_hash
+        except ValueError as exc:
+            failures[str(path)] = [str(exc)]
+            continue
+        level_path = levels.get(digest)
+        if level_path is None:
+            failures[str(path)] = [f"no level with hash {digest.hex()[:16]}"]
+            continue
+        groups.setdefault(level_path, []).append((str(path), data))
+
+    # Each worker loads a level once and replays a slice of its runs.
+    workers = workers or os.cpu_count() or 1
+    jobs = []
+    for level_path, replays in groups.items():
+        size = max(1, -(-len(replays) // workers))
+        jobs.extend((str(level_path), replays[start:start + size]) for start in range(0, len(replays), size))
+    if workers == 1 or len(jobs) <= 1:
+        results = list(map(_verify_group, jobs))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_verify_group, jobs))
+    for group in results:
+        for path, problems in group:
+            if problems:
+                failures[path] = problems
+    return failures
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Replay recorded runs headlessly and check they end the same way.")
+    parser.add_argument("replays", nargs="*", type=Path, default=[REPLAY_DIR], help="replay files or directories")
+    parser.add_argument(
+        "--levels",
+        nargs="+",
+        type=Path,
+        default=[LEVELS_DIR],
+        help="level files or directories to match replays against",
+    )
+    parser.add_argument("--jobs", type=int, default=None, help="worker processes (default: all cores)")
+    args = parser.parse_args()
+
+    replay_paths = collect_replays(args.replays)
+    level_paths = collect_paths(args.levels)
+    start = time.perf_counter()
+    failures = verify(replay_paths, level_paths, args.jobs)
+    elapsed = time.perf_counter() - start
+
+    for path, problems in failures.items():
+        print(f"FAIL {path}")
+        for problem in problems:
+            print(f"  {problem}")
+    print(f"{len(replay_paths) - len(failures)}/{len(replay_paths)} replays match ({elapsed:.2f}s)")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -5,8 +5,18 @@ SCREEN_WIDTH = 1000
 SCREEN_HEIGHT = 600
 FPS = 60
 
+# Physics always advances in fixed steps of this length, independent of the
+# render frame rate; frames longer than MAX_FRAME_TIME are not caught up.
+PHYSICS_STEP = 1 / 60
+MAX_FRAME_TIME = 0.25
+# Collision is swept, so steps of any length are safe; steps longer than
+# this are split so the straight sweeps stay within a pixel of the arc.
+SWEEP_MAX_STEP = 1 / 20
+
 GRAVITY = 2800.0
-JUMP_VELOCITY = -820.0
+# The exact arc from this launch matches the one the old per-step
+# integration gave at 60 Hz (-820 plus half a step of gravity).
+JUMP_VELOCITY = -797.0
 FORWARD_SPEED = 380.0
 MAX_FALL_SPEED = 1800.0
 COYOTE_TIME = 0.08
@@ -14,14 +24,83 @@ JUMP_BUFFER_TIME = 0.12
 
 TILE_SIZE = 40
 
+# The static level is pre-rendered into vertical strips this wide and only the
+# strips under the camera are blitted each frame.
+RENDER_CHUNK_WIDTH = TILE_SIZE * 16
+RENDER_CHUNK_CACHE = 8
+
+# Adjacent solid tiles of a row share one collider, and chunks draw solids
+# as merged rectangles; levels play exactly the same either way.
+MERGE_SOLIDS = True
+
+# Upload only the parts of the window that changed each frame rather than
+# flipping all of it; canvas uploads dominate the browser build's frame.
+DIRTY_RECT_UPDATES = True
+# Rendered HUD strings kept around for reuse.
+TEXT_CACHE_SIZE = 64
+
+# Angular resolution of the pre-rotated player sprites, in degrees.
+PLAYER_SPRITE_ANGLE_STEP = 2.0
+
 BACKGROUND_COLOR = (15, 23, 42)
 GROUND_COLOR = (51, 65, 85)
 SPIKE_COLOR = (239, 68, 68)
 END_COLOR = (34, 197, 94)
 PLAYER_COLOR = (56, 189, 248)
 TEXT_COLOR = (241, 245, 249)
+FONT_NAME = "freesansbold"
+HUD_FONT_SIZE = 26
+TITLE_FONT_SIZE = 54
 
 WINDOW_TITLE = "Stereo Madness (Pygame Fan Remake)"
 
 BASE_DIR = Path(__file__).parent
 LEVEL_PATH = BASE_DIR / "levels" / "stereo_madness.txt"
+BINARY_LEVEL_SUFFIX = ".gdl"
+# Built by web_assets.py before packaging the web build: the level as a
+# binary blob and the HUD glyphs pre-rendered, so startup parses neither.
+WEB_ASSETS_DIR = BASE_DIR / "web_assets"
+
+# Every attempt's inputs are saved here so it can be replayed exactly.
+RECORD_REPLAYS = True
+REPLAY_DIR = BASE_DIR / "replays"
+REPLAY_SUFFIX = ".gdr"
+# G in game overlays this many of the newest recorded runs as ghosts.
+SHOW_GHOSTS = False
+GHOST_LIMIT = 300
+GHOST_ALPHA = 70
+# Every death and win is appended to this log as a fixed-size record, a
+# buffer of this many records at a time.
+RECORD_ANALYTICS = True
+ANALYTICS_PATH = BASE_DIR / "analytics" / "runs.gda"
+ANALYTICS_BUFFER_RECORDS = 64
+
+# The game checks LEVEL_PATH this often (seconds) and patches in the
+# columns that changed since it was loaded, keeping the current run going.
+HOT_RELOAD_LEVEL = True
+HOT_RELOAD_INTERVAL = 0.25
+
+# Streaming reads the level in windows of this many columns as the camera
+# reaches them and drops the ones behind it, instead of loading it all.
+LEVEL_STREAMING = False
+STREAM_WINDOW_COLUMNS = 64
+STREAM_WINDOWS_KEPT = 4
+
+# Endless play: set a seed to stream generated columns instead of loading
+# LEVEL_PATH. Generated levels are built in chunks of this many columns.
+ENDLESS_SEED: int | None = None
+ENDLESS_DIFFICULTY = 0.5
+GENERATOR_CHUNK_COLUMNS = 64
+
+# Frames of per-phase timings the profiler keeps, and how often (in frames)
+# its F3 overlay re-renders.
+PROFILER_HISTORY = 3600
+PROFILER_REFRESH_FRAMES = 30
+
+# Bot training environment (env.py): tile columns observed behind and ahead
+# of the player, and the rewards for the end of a run. Forward progress adds
+# up to 1.0 over the length of a level.
+ENV_VIEW_BEHIND = 2
+ENV_VIEW_AHEAD = 13
+ENV_WIN_REWARD = 1.0
+ENV_DEATH_REWARD = -1.0
@@ -0,0 +1,104 @@
+from collections.abc import Callable, Iterable
+from enum import Enum, auto
+
+import pygame
+
+from level import LevelData
+from masks import move_touches_spike
+from player import Player
+from profiler import FrameProfiler
+from settings import PHYSICS_STEP, SCREEN_HEIGHT
+from spatial import ColumnIndex
+from sweep import Move, move_overlaps, move_span
+
+
+class Outcome(Enum):
+    RUNNING = auto()
+    DEAD = auto()
+    WIN = auto()
+
+
+class DeathCause(Enum):
+    SPIKE = auto()
+    HIT_HEAD = auto()
+    HIT_WALL = auto()
+    FALL = auto()
+
+
+def path_touches(
+    moves: list[Move],
+    size: int,
+    index: ColumnIndex,
+    narrow: Callable[[Move, int, pygame.Rect], bool] | None = None,
+) -> bool:
+    for move in moves:
+        for rect in index.query_span(*move_span(move, size)):
+            if move_overlaps(move, size, rect) and (narrow is None or narrow(move, size, rect)):
+                return True
+    return False
+
+
+class Simulation:
+    def __init__(
+        self,
+        level: LevelData,
+        step_seconds: float = PHYSICS_STEP,
+        profiler: FrameProfiler | None = None,
+    ) -> None:
+        self.level = level
+        self.step_seconds = step_seconds
+        self.profiler = profiler
+        self.player = Player(*level.start_pos)
+        self.steps = 0
+        self.outcome = Outcome.RUNNING
+        self.death_cause: DeathCause | None = None
+
+    def reset(self) -> None:
+        self.player.reset(*self.level.start_pos)
+        self.steps = 0
+        self.outcome = Outcome.RUNNING
+        self.death_cause = None
+
+    def step(self, jump_held: bool, jump_pressed: bool = False) -> Outcome:
+        if self.outcome != Outcome.RUNNING:
+            return self.outcome
+
+        player = self.player
+        level = self.level
+        if jump_pressed:
+            player.request_jump()
+        player.update(self.step_seconds, level.solid_index, jump_held)
+        self.steps += 1
+        if self.profiler is not None:
+            self.profiler.mark("update")
+
+        # Hazards and the goal are tested against the whole path of the step,
+        # so a long step cannot skip over them.
+        size = player.rect.width
+        cause = None
+        if path_touches(player.moves, size, level.spike_hitbox_index, move_touches_spike):
+            cause = DeathCause.SPIKE
+        elif player.hit_head:
+            cause = DeathCause.HIT_HEAD
+        elif player.hit_wall:
+            cause = DeathCause.HIT_WALL
+        elif player.rect.top > SCREEN_HEIGHT:
+            cause = DeathCause.FALL
+
+        # Reaching the end zone wins even if the same step was also fatal.
+        if any(move_overlaps(move, size, level.end_zone) for move in player.moves):
+            self.outcome = Outcome.WIN
+        elif cause is not None:
+            self.outcome = Outcome.DEAD
+            self.death_cause = cause
+        if self.profiler is not None:
+            self.profiler.mark("collisions")
+        return self.outcome
+
+    def run(self, inputs: Iterable[bool], max_steps: int | None = None) -> Outcome:
+        for jump_held in inputs:
+            if self.step(jump_held) != Outcome.RUNNING:
+                break
+            if max_steps is not None and self.steps >= max_steps:
+                break
+        return self.outcome
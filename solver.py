@@ -0,0 +1,139 @@
+import argparse
+import math
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import numpy as np
+
+from batch_physics import PLAYER_SIZE, RUNNING, WIN, BatchSimulation, OccupancyGrid
+from level import read_level_rows
+from settings import BASE_DIR, FORWARD_SPEED, LEVEL_PATH, PHYSICS_STEP, TILE_SIZE
+
+
+@dataclass
+class SolveResult:
+    solvable: bool
+    steps: int
+    jump_steps: list[int] = field(default_factory=list)
+    fail_column: int | None = None
+    explored: int = 0
+
+
+def _state_keys(batch: BatchSimulation) -> np.ndarray:
+    # x advances by the same amount every step, so states within one layer
+    # differ only in their vertical motion and timers. Height is kept to
+    # 1/64 px and velocity to 0.01 px/s. The coyote timer counts down a step
+    # at a time, so it is kept as whole steps left: merging two states with
+    # different jump windows could drop the only branch that gets through.
+    # The jump buffer is left out; solve() keeps the state with the least of
+    # it, which can match any buffered jump by holding on that step.
+    height = np.round(batch.y * 64.0).astype(np.int64)
+    velocity = np.round(batch.velocity_y * 100.0).astype(np.int64)
+    coyote = np.rint(batch.coyote_timer / batch.step_seconds).astype(np.int64)
+    return (
+        ((height + (1 << 20)) << 32)
+        | ((velocity + (1 << 20)) << 9)
+        | (batch.grounded.astype(np.int64) << 8)
+        | coyote
+    )
+
+
+def solve(grid: OccupancyGrid, max_steps: int | None = None) -> SolveResult:
+    if max_steps is None:
+        max_steps = math.ceil(grid.cols * TILE_SIZE / (FORWARD_SPEED * PHYSICS_STEP)) + 2
+
+    # The frontier is one layer of a breadth-first search over steps, with
+    # one representative per quantized state, stepped for both inputs at
+    # once through the batch simulator. Ties keep the least jump buffer, then
+    # the fewest jump inputs.
+    batch = BatchSimulation(grid, 1)
+    frontier = (batch.x, batch.y, batch.velocity_y, batch.grounded, batch.coyote_timer, batch.jump_buffer_timer)
+    cost = np.zeros(1, dtype=np.int64)
+    history: list[tuple[np.ndarray, np.ndarray]] = []
+    explored = 0
+
+    for step in range(max_steps):
+        size = len(cost)
+        parents = np.concatenate((np.arange(size), np.arange(size)))
+        held = np.repeat(np.array([False, True]), size)
+        batch.load_states(*(np.concatenate((values, values)) for values in frontier))
+        batch.step(held)
+        explored += len(parents)
+        child_cost = cost[parents] + held
+
+        won = np.flatnonzero(batch.outcome == WIN)
+        if len(won):
+            winner = won[np.argmin(child_cost[won])]
+            history.append((parents[[winner]], held[[winner]]))
+            return SolveResult(solvable=True, steps=step + 1, jump_steps=_rebuild(history), explored=explored)
+
+        alive = np.flatnonzero(batch.outcome == RUNNING)
+        if len(alive) == 0:
+            column = int((batch.x[0] + PLAYER_SIZE // 2) // TILE_SIZE)
+            return SolveResult(solvable=False, steps=step + 1, fail_column=column, explored=explored)
+
+        keys = _state_keys(batch)[alive]
+        order = np.lexsort((child_cost[alive], batch.jump_buffer_timer[alive], keys))
+        sorted_keys = keys[order]
+        first = np.ones(len(order), dtype=bool)
+        first[1:] = sorted_keys[1:] != sorted_keys[:-1]
+        keep = alive[order[first]]
+
+        frontier = (
+            batch.x[keep],
+            batch.y[keep],
+            batch.velocity_y[keep],
+            batch.grounded[keep],
+            batch.coyote_timer[keep],
+            batch.jump_buffer_timer[keep],
+        )
+        cost = child_cost[keep]
+        history.append((parents[keep], held[keep]))
+
+    column = int((frontier[0][0] + PLAYER_SIZE // 2) // TILE_SIZE)
+    return SolveResult(solvable=False, steps=max_steps, fail_column=column, explored=explored)
+
+
+def _rebuild(history: list[tuple[np.ndarray, np.ndarray]]) -> list[int]:
+    jump_steps: list[int] = []
+    index = 0
+    for step in range(len(history) - 1, -1, -1):
+        parents, held = history[step]
+        if held[index]:
+            jump_steps.append(step)
+        index = int(parents[index])
+    jump_steps.reverse()
+    return jump_steps
+
+
+def solve_rows(rows: list[str]) -> SolveResult:
+    return solve(OccupancyGrid.from_rows(rows))
+
+
+def solve_file(path: Path) -> SolveResult:
+    return solve_rows(read_level_rows(path))
+
+
+def describe(result: SolveResult) -> str:
+    if result.solvable:
+        return f"Solvable: {len(result.jump_steps)} jump inputs over {result.steps} steps"
+    return f"Unsolvable: every path dies by column {result.fail_column}"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Check whether a level can be completed.")
+    parser.add_argument("level", nargs="?", type=Path, default=LEVEL_PATH)
+    parser.add_argument("--schedule", action="store_true", help="print the steps where jump is held")
+    args = parser.parse_args()
+
+    level_path = args.level if args.level.is_absolute() else BASE_DIR / args.level
+    result = solve_file(level_path)
+    print(describe(result))
+    if args.schedule and result.solvable:
+        print(" ".join(str(step) for step in result.jump_steps))
+    sys.exit(0 if result.solvable else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+import math
+from collections.abc import Callable, Iterator, Sequence
+
+import pygame
+
+from settings import TILE_SIZE
+
+
+class ColumnIndex:
+    def __init__(
+        self,
+        rects: list[pygame.Rect] | None = None,
+        column_width: int = TILE_SIZE,
+        loader: Callable[[int], list[pygame.Rect]] | None = None,
+    ) -> None:
+        self.column_width = column_width
+        self._buckets: dict[int, list[pygame.Rect]] = {}
+        # With a loader, columns are filled the first time they are queried
+        # instead of up front; a rect wider than a column must be loaded for
+        # every column it covers.
+        self._loader = loader
+        for rect in rects or ():
+            self.add(rect)
+
+    def add(self, rect: pygame.Rect) -> None:
+        # A rect wider than a column, such as a merged run of solids, is
+        # filed under every column it covers.
+        first = rect.left // self.column_width
+        last = (rect.right - 1) // self.column_width
+        for col in range(first, last + 1):
+            self._buckets.setdefault(col, []).append(rect)
+
+    def column(self, col: int) -> list[pygame.Rect]:
+        bucket = self._buckets.get(col)
+        if bucket is None:
+            if self._loader is None:
+                return []
+            bucket = self._loader(col)
+            self._buckets[col] = bucket
+        return bucket
+
+    def remove_span(self, left: int, right: int) -> None:
+        # Drops every rect filed under a column of [left, right), including
+        # from any columns it reaches outside the span.
+        width = self.column_width
+        first = left // width
+        last = (right - 1) // width
+        for col in range(first, last + 1):
+            for rect in self._buckets.pop(col, ()):
+                for other in range(rect.left // width, (rect.right - 1) // width + 1):
+                    if other < first or other > last:
+                        self._buckets[other] = [kept for kept in self._buckets.get(other, ()) if kept is not rect]
+
+    def release_before(self, col: int) -> None:
+        for key in [key for key in self._buckets if key < col]:
+            del self._buckets[key]
+
+    def rects(self) -> Iterator[pygame.Rect]:
+        # Every filed rect once, column by column.
+        for col in sorted(self._buckets):
+            for rect in self._buckets[col]:
+                if rect.left // self.column_width == col:
+                    yield rect
+
+    @property
+    def loaded_columns(self) -> int:
+        return len(self._buckets)
+
+    def query_span(self, left: float, right: float) -> list[pygame.Rect]:
+        first = int(left // self.column_width)
+        # right is exclusive and may be fractional for swept queries.
+        last = (math.ceil(right) - 1) // self.column_width
+        found: list[pygame.Rect] = []
+        for col in range(first, last + 1):
+            bucket = self._buckets.get(col)
+            if bucket is None and self._loader is not None:
+                bucket = self.column(col)
+            if not bucket:
+                continue
+            if col == first:
+                found.extend(bucket)
+            else:
+                # Rects reaching back into earlier columns were already found.
+                start = col * self.column_width
+                found.extend(rect for rect in bucket if rect.left >= start)
+        if last > first:
+            # Keep the row-major order load_level produces so collision
+            # resolution does not depend on how the index is laid out.
+            found.sort(key=lambda rect: (rect.y, rect.x))
+        return found
+
+    def query(self, rect: pygame.Rect) -> list[pygame.Rect]:
+        return self.query_span(rect.left, rect.right)
+
+    def collides(self, rect: pygame.Rect) -> bool:
+        for other in self.query(rect):
+            if rect.colliderect(other):
+                return True
+        return False
+
+
+class ColumnView(Sequence[pygame.Rect]):
+    # A read-only list of an index's rects that follows later adds and
+    # removes, for code that wants a flat list of a level being patched.
+    def __init__(self, index: ColumnIndex) -> None:
+        self._index = index
+
+    def __getitem__(self, item):
+        return list(self._index.rects())[item]
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self._index.rects())
+
+    def __iter__(self) -> Iterator[pygame.Rect]:
+        return self._index.rects()
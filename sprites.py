@@ -0,0 +1,50 @@
+import math
+from functools import lru_cache
+
+import pygame
+
+from settings import PLAYER_COLOR, PLAYER_SPRITE_ANGLE_STEP
+
+EYE_COLOR = (245, 245, 245)
+PUPIL_COLOR = (20, 20, 20)
+
+
+class PlayerSprites:
+    def __init__(self, size: int, angle_step: float = PLAYER_SPRITE_ANGLE_STEP, alpha: int = 255) -> None:
+        self.size = size
+        self.angle_step = angle_step
+        self.frames: list[tuple[pygame.Surface, int, int]] = []
+
+        base = pygame.Surface((size, size), pygame.SRCALPHA)
+        base.fill(PLAYER_COLOR)
+        eye_radius = max(2, size // 10)
+        eye_offset = size // 5
+        count = max(1, round(360.0 / angle_step))
+        for step in range(count):
+            angle = step * 360.0 / count
+            rotated = pygame.transform.rotate(base, angle)
+            half_w = rotated.get_width() // 2
+            half_h = rotated.get_height() // 2
+            radians = math.radians(angle)
+            for side in (-1, 1):
+                ox = side * eye_offset
+                ex = half_w + math.floor(ox * math.cos(radians))
+                ey = half_h + math.floor(ox * math.sin(radians))
+                pygame.draw.circle(rotated, EYE_COLOR, (ex, ey), eye_radius + 1)
+                pygame.draw.circle(rotated, PUPIL_COLOR, (ex, ey), eye_radius)
+            if alpha < 255:
+                rotated.set_alpha(alpha)
+            self.frames.append((rotated, -half_w, -half_h))
+
+    def frame(self, rotation_degrees: float) -> tuple[pygame.Surface, int, int]:
+        index = round(rotation_degrees / self.angle_step) % len(self.frames)
+        return self.frames[index]
+
+    def draw(self, surface: pygame.Surface, center_x: int, center_y: int, rotation_degrees: float) -> pygame.Rect:
+        image, ox, oy = self.frame(rotation_degrees)
+        return surface.blit(image, (center_x + ox, center_y + oy))
+
+
+@lru_cache(maxsize=None)
+def player_sprites(size: int, angle_step: float = PLAYER_SPRITE_ANGLE_STEP, alpha: int = 255) -> PlayerSprites:
+    return PlayerSprites(size, angle_step, alpha)
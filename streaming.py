@@ -0,0 +1,178 @@
+import mmap
+from collections import OrderedDict
+from collections.abc import Callable
+from pathlib import Path
+from typing import Protocol
+
+import pygame
+
+from level import LevelData, spike_hitbox
+from level_binary import TILE_CHARS, read_header
+from settings import BINARY_LEVEL_SUFFIX, STREAM_WINDOW_COLUMNS, STREAM_WINDOWS_KEPT, TILE_SIZE
+from spatial import ColumnIndex
+
+# Endless sources have no width; report one large enough that the camera
+# never clamps against it.
+ENDLESS_WIDTH_PX = 1 << 40
+
+
+class ColumnSource(Protocol):
+    rows: int
+    cols: int | None
+    start: tuple[int, int]
+    end: tuple[int, int] | None
+
+    def read(self, first: int, count: int) -> list[str]: ...
+
+
+class TextColumnSource:
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._rows: list[tuple[int, int]] = []
+        self.start: tuple[int, int] | None = None
+        self.end: tuple[int, int] | None = None
+
+        # One pass records where each row starts and where the markers are;
+        # afterwards only the requested slice of each row is ever read.
+        offset = 0
+        with path.open("rb") as handle:
+            for raw in handle:
+                line = raw.rstrip(b"\r\n")
+                if line.strip():
+                    row = len(self._rows)
+                    self._rows.append((offset, len(line)))
+                    start_col = line.rfind(b"S")
+                    if start_col != -1:
+                        self.start = (row, start_col)
+                    end_col = line.rfind(b"E")
+                    if end_col != -1:
+                        self.end = (row, end_col)
+                offset += len(raw)
+
+        if not self._rows:
+            raise ValueError(f"Level file {path} is empty.")
+        if self.start is None:
+            raise ValueError("Level is missing 'S' start marker.")
+        if self.end is None:
+            raise ValueError("Level is missing 'E' end marker.")
+        self.rows = len(self._rows)
+        self.cols: int | None = max(length for _, length in self._rows)
+
+    def read(self, first: int, count: int) -> list[str]:
+        count = max(0, min(count, self.cols - first))
+        slices = []
+        with self.path.open("rb") as handle:
+            for offset, length in self._rows:
+                available = max(0, min(count, length - first))
+                handle.seek(offset + first)
+                text = handle.read(available).decode("ascii") if available else ""
+                slices.append(text.ljust(count, "."))
+        return ["".join(column) for column in zip(*slices)]
+
+
+class BinaryColumnSource:
+    def __init__(self, path: Path) -> None:
+        with path.open("rb") as handle:
+            self._buffer = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        self._header = read_header(self._buffer)
+        self._table = bytes.maketrans(bytes(range(len(TILE_CHARS))), TILE_CHARS.encode())
+        self.rows = self._header.rows
+        self.cols: int | None = self._header.cols
+        self.start = self._header.start
+        self.end: tuple[int, int] | None = self._header.end
+
+    def read(self, first: int, count: int) -> list[str]:
+        count = max(0, min(count, self.cols - first))
+        rows = self.rows
+        offset = self._header.grid_offset + first * rows
+        text = self._buffer[offset:offset + count * rows].translate(self._table).decode("ascii")
+        return [text[index * rows:(index + 1) * rows] for index in range(count)]
+
+
+def open_column_source(path: Path) -> ColumnSource:
+    if path.suffix == BINARY_LEVEL_SUFFIX:
+        return BinaryColumnSource(path)
+    return TextColumnSource(path)
+
+
+class StreamingLevel:
+    def __init__(
+        self,
+        source: ColumnSource,
+        window_columns: int = STREAM_WINDOW_COLUMNS,
+        windows_kept: int = STREAM_WINDOWS_KEPT,
+    ) -> None:
+        self.source = source
+        self.window_columns = window_columns
+        self.windows_kept = windows_kept
+        self._windows: OrderedDict[int, list[str]] = OrderedDict()
+
+        solid_index = ColumnIndex(loader=self._loader("#", self._tile))
+        spike_index = ColumnIndex(loader=self._loader("^", self._tile))
+        spike_hitbox_index = ColumnIndex(loader=self._loader("^", spike_hitbox))
+        self._indices = (solid_index, spike_index, spike_hitbox_index)
+
+        start_row, start_col = source.start
+        if source.end is not None:
+            end_row, end_col = source.end
+            end_zone = self._tile(end_col * TILE_SIZE, end_row * TILE_SIZE)
+        else:
+            end_zone = pygame.Rect(-1, -1, 0, 0)
+        width_px = source.cols * TILE_SIZE if source.cols is not None else ENDLESS_WIDTH_PX
+
+        # Colliders are only reachable through the indices; the flat lists
+        # stay empty so nothing can accidentally materialize the whole level.
+        self.level = LevelData(
+            solids=[],
+            spikes=[],
+            spike_hitboxes=[],
+            end_zone=end_zone,
+            start_pos=(start_col * TILE_SIZE, start_row * TILE_SIZE),
+            width_px=width_px,
+            height_px=source.rows * TILE_SIZE,
+            solid_index=solid_index,
+            spike_index=spike_index,
+            spike_hitbox_index=spike_hitbox_index,
+        )
+
+    @staticmethod
+    def _tile(x: int, y: int) -> pygame.Rect:
+        return pygame.Rect(x, y, TILE_SIZE, TILE_SIZE)
+
+    def _column(self, col: int) -> str:
+        window_id, offset = divmod(col, self.window_columns)
+        window = self._windows.get(window_id)
+        if window is None:
+            window = self.source.read(window_id * self.window_columns, self.window_columns)
+            self._windows[window_id] = window
+            if len(self._windows) > self.windows_kept:
+                self._windows.popitem(last=False)
+        else:
+            self._windows.move_to_end(window_id)
+        return window[offset] if offset < len(window) else ""
+
+    def _loader(self, char: str, make: Callable[[int, int], pygame.Rect]) -> Callable[[int], list[pygame.Rect]]:
+        def load(col: int) -> list[pygame.Rect]:
+            if col < 0 or (self.source.cols is not None and col >= self.source.cols):
+                return []
+            column = self._column(col)
+            if char not in column:
+                return []
+            x = col * TILE_SIZE
+            return [make(x, row * TILE_SIZE) for row, value in enumerate(column) if value == char]
+
+        return load
+
+    def release_behind(self, camera_x: int) -> None:
+        # The camera only moves forward during a run; anything left of it is
+        # dropped and re-read from the source if a restart needs it again.
+        first_col = camera_x // TILE_SIZE - 1
+        for index in self._indices:
+            index.release_before(first_col)
+        first_window = first_col // self.window_columns
+        for window_id in [window_id for window_id in self._windows if window_id < first_window]:
+            del self._windows[window_id]
+
+    @property
+    def loaded_columns(self) -> int:
+        return self._indices[0].loaded_columns
@@ -0,0 +1,54 @@
+import math
+
+import pygame
+
+from settings import GRAVITY, MAX_FALL_SPEED
+
+X_AXIS = 0
+Y_AXIS = 1
+
+# A straight move of a square box: (x0, y0, x1, y1) of its top-left corner.
+Move = tuple[float, float, float, float]
+
+
+def fall(velocity: float, dt: float) -> tuple[float, float]:
+    # Exact constant-acceleration motion up to the fall speed cap, so a jump
+    # reaches the same height whatever the step length.
+    end_velocity = velocity + GRAVITY * dt
+    if end_velocity <= MAX_FALL_SPEED:
+        return (velocity + end_velocity) * 0.5 * dt, end_velocity
+    capped_after = max(0.0, (MAX_FALL_SPEED - velocity) / GRAVITY)
+    distance = (velocity + MAX_FALL_SPEED) * 0.5 * capped_after + MAX_FALL_SPEED * (dt - capped_after)
+    return distance, MAX_FALL_SPEED
+
+
+def slab(position: float, delta: float, low: float, high: float) -> tuple[float, float]:
+    # Fractions of the move during which position lies strictly inside
+    # (low, high); touching an edge is not an overlap.
+    if delta > 0.0:
+        return (low - position) / delta, (high - position) / delta
+    if delta < 0.0:
+        return (high - position) / delta, (low - position) / delta
+    if low < position < high:
+        return -math.inf, math.inf
+    return math.inf, -math.inf
+
+
+def sweep(x: float, y: float, dx: float, dy: float, size: int, rect: pygame.Rect) -> tuple[float, float, int]:
+    enter_x, exit_x = slab(x, dx, rect.left - size, rect.right)
+    enter_y, exit_y = slab(y, dy, rect.top - size, rect.bottom)
+    # Ties go to the vertical axis, so landing exactly on a corner lands.
+    if enter_y >= enter_x:
+        return enter_y, min(exit_x, exit_y), Y_AXIS
+    return enter_x, min(exit_x, exit_y), X_AXIS
+
+
+def move_span(move: Move, size: int) -> tuple[float, float]:
+    x0, _, x1, _ = move
+    return min(x0, x1), max(x0, x1) + size
+
+
+def move_overlaps(move: Move, size: int, rect: pygame.Rect) -> bool:
+    x0, y0, x1, y1 = move
+    enter, leave, _ = sweep(x0, y0, x1 - x0, y1 - y0, size, rect)
+    return enter < leave and enter < 1.0 and leave > 0.0
@@ -1,16 +1,45 @@
+from collections import OrderedDict
+
 import pygame
 
-from settings import SCREEN_WIDTH, TEXT_COLOR
+from settings import SCREEN_WIDTH, TEXT_CACHE_SIZE, TEXT_COLOR
+
+
+class TextCache:
+    def __init__(self, max_entries: int = TEXT_CACHE_SIZE) -> None:
+        self.max_entries = max_entries
+        self._surfaces: OrderedDict[tuple[pygame.font.Font, str, tuple[int, int, int]], pygame.Surface] = OrderedDict()
+
+    def render(self, font: pygame.font.Font, text: str, color: tuple[int, int, int] = TEXT_COLOR) -> pygame.Surface:
+        key = (font, text, color)
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self._surfaces.move_to_end(key)
+            return surface
+        surface = self._surfaces[key] = font.render(text, True, color)
+        if len(self._surfaces) > self.max_entries:
+            self._surfaces.popitem(last=False)
+        return surface
+
+
+text_cache = TextCache()
 
 
-def draw_attempts(surface: pygame.Surface, font: pygame.font.Font, attempts: int) -> None:
-    text = font.render(f"Attempts: {attempts}", True, TEXT_COLOR)
-    surface.blit(text, (16, 12))
+def draw_attempts(surface: pygame.Surface, font: pygame.font.Font, attempts: int) -> pygame.Rect:
+    text = text_cache.render(font, f"Attempts: {attempts}")
+    return surface.blit(text, (16, 12))
 
 
-def draw_center_message(surface: pygame.Surface, big_font: pygame.font.Font, small_font: pygame.font.Font, title: str, subtitle: str) -> None:
-    title_surf = big_font.render(title, True, TEXT_COLOR)
-    subtitle_surf = small_font.render(subtitle, True, TEXT_COLOR)
+def draw_center_message(
+    surface: pygame.Surface,
+    big_font: pygame.font.Font,
+    small_font: pygame.font.Font,
+    title: str,
+    subtitle: str,
+) -> pygame.Rect:
+    title_surf = text_cache.render(big_font, title)
+    subtitle_surf = text_cache.render(small_font, subtitle)
 
-    surface.blit(title_surf, (SCREEN_WIDTH // 2 - title_surf.get_width() // 2, 190))
-    surface.blit(subtitle_surf, (SCREEN_WIDTH // 2 - subtitle_surf.get_width() // 2, 250))
+    title_rect = surface.blit(title_surf, (SCREEN_WIDTH // 2 - title_surf.get_width() // 2, 190))
+    subtitle_rect = surface.blit(subtitle_surf, (SCREEN_WIDTH // 2 - subtitle_surf.get_width() // 2, 250))
+    return title_rect.union(subtitle_rect)
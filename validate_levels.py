@@ -0,0 +1,244 @@
+import argparse
+import hashlib
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+# Workers import pygame through the solver; keep its banner out of the report.
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+from settings import (
+    BASE_DIR,
+    BINARY_LEVEL_SUFFIX,
+    COYOTE_TIME,
+    FORWARD_SPEED,
+    GRAVITY,
+    JUMP_BUFFER_TIME,
+    JUMP_VELOCITY,
+    MAX_FALL_SPEED,
+    PHYSICS_STEP,
+    SCREEN_HEIGHT,
+    SWEEP_MAX_STEP,
+    TILE_SIZE,
+)
+
+LEVELS_DIR = BASE_DIR / "levels"
+CACHE_PATH = BASE_DIR / ".level_validation_cache.json"
+KNOWN_TILES = set(".#^SE")
+
+# Cached results are only reused while the rules they were computed under
+# stay the same, so any physics change forces a full re-validation. Spike
+# geometry is part of the rules too; see rules_version.
+RULES_VERSION = "3:" + ",".join(
+    str(value)
+    for value in (
+        COYOTE_TIME,
+        FORWARD_SPEED,
+        GRAVITY,
+        JUMP_BUFFER_TIME,
+        JUMP_VELOCITY,
+        MAX_FALL_SPEED,
+        PHYSICS_STEP,
+        SCREEN_HEIGHT,
+        SWEEP_MAX_STEP,
+        TILE_SIZE,
+    )
+)
+
+
+def level_digest(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def validate_text(text: str) -> dict:
+    errors: list[str] = []
+    warnings: list[str] = []
+    report: dict = {"errors": errors, "warnings": warnings}
+
+    raw_lines = [line for line in text.splitlines() if line.strip()]
+    if not raw_lines:
+        errors.append("level is empty")
+        report["ok"] = False
+        return report
+
+    width = max(len(line) for line in raw_lines)
+    report["rows"] = len(raw_lines)
+    report["cols"] = width
+    ragged = [index for index, line in enumerate(raw_lines) if len(line) != width]
+    if ragged:
+        warnings.append(f"{len(ragged)} ragged rows padded with '.' (first: row {ragged[0]})")
+
+    unknown = sorted(set("".join(raw_lines)) - KNOWN_TILES)
+    if unknown:
+        warnings.append(f"unknown tiles treated as empty: {''.join(unknown)!r}")
+
+    rows = [line.ljust(width, ".") for line in raw_lines]
+    markers: dict[str, list[tuple[int, int]]] = {"S": [], "E": []}
+    for row_idx, line in enumerate(rows):
+        for marker, found in markers.items():
+            col_idx = line.find(marker)
+            while col_idx != -1:
+                found.append((row_idx, col_idx))
+                col_idx = line.find(marker, col_idx + 1)
+
+    for marker, name in (("S", "start"), ("E", "end")):
+        if not markers[marker]:
+            errors.append(f"missing '{marker}' {name} marker")
+        elif len(markers[marker]) > 1:
+            warnings.append(f"{len(markers[marker])} '{marker}' markers, the last one is used")
+    if errors:
+        report["ok"] = False
+        return report
+
+    start_row, start_col = markers["S"][-1]
+    end_row, end_col = markers["E"][-1]
+    fall_row = SCREEN_HEIGHT // TILE_SIZE
+    if end_col < start_col:
+        errors.append(f"end marker (column {end_col}) is behind the start (column {start_col})")
+    if start_row * TILE_SIZE > SCREEN_HEIGHT:
+        errors.append(f"start marker on row {start_row} is below the fall line")
+    if end_row * TILE_SIZE >= SCREEN_HEIGHT:
+        errors.append(f"end marker on row {end_row} is below the fall line")
+    if len(rows) > fall_row:
+        warnings.append(f"rows {fall_row}+ are below the fall line and can never be reached")
+
+    if not errors:
+        from solver import solve_rows
+
+        result = solve_rows(rows)
+        report["solver"] = {
+            "solvable": result.solvable,
+            "steps": result.steps,
+            "jump_inputs": len(result.jump_steps),
+            "fail_column": result.fail_column,
+        }
+        if not result.solvable:
+            errors.append(f"end is unreachable: every path dies by column {result.fail_column}")
+
+    report["ok"] = not errors
+    return report
+
+
+def _validate_file(path_and_data: tuple[str, bytes]) -> tuple[str, dict]:
+    path, data = path_and_data
+    try:
+        if path.endswith(BINARY_LEVEL_SUFFIX):
+            from level_binary import decode_rows
+
+            report = validate_text("\n".join(decode_rows(data)))
+        else:
+            report = validate_text(data.decode("utf-8"))
+    except ValueError as exc:
+        report = {"ok": False, "errors": [f"unreadable level: {exc}"], "warnings": []}
+    return path, report
+
+
+def rules_version() -> str:
+    # The spike hitbox and mask come from pygame, so they are folded in only
+    # when the cache is used rather than on import.
+    from level import spike_hitbox
+    from masks import spike_mask
+
+    mask = spike_mask()
+    width, height = mask.get_size()
+    bits = bytes(mask.get_at((x, y)) for y in range(height) for x in range(width))
+    geometry = f"{tuple(spike_hitbox(0, 0))}:{width}x{height}:{hashlib.sha256(bits).hexdigest()[:16]}"
+    return f"{RULES_VERSION}:{geometry}"
+
+
+def load_cache(path: Path) -> dict:
+    try:
+        cache = json.loads(path.read_text())
+    except (OSError, ValueError):
+        return {}
+    if cache.get("rules") != rules_version():
+        return {}
+    return cache.get("levels", {})
+
+
+def save_cache(path: Path, entries: dict) -> None:
+    path.write_text(json.dumps({"rules": rules_version(), "levels": entries}))
+
+
+def validate_paths(paths: list[Path], cache_path: Path | None = CACHE_PATH, workers: int | None = None) -> dict:
+    cache = load_cache(cache_path) if cache_path is not None else {}
+    reports: dict[str, dict] = {}
+    digests: dict[str, str] = {}
+    pending: list[tuple[str, bytes]] = []
+
+    for path in paths:
+        key = str(path)
+        data = path.read_bytes()
+        digest = level_digest(data)
+        digests[key] = digest
+        cached = cache.get(digest)
+        if cached is not None:
+            reports[key] = dict(cached, cached=True)
+        else:
+            pending.append((key, data))
+
+    if pending:
+        workers = workers or os.cpu_count() or 1
+        if workers == 1 or len(pending) == 1:
+            for key, report in map(_validate_file, pending):
+                reports[key] = report
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                chunksize = max(1, len(pending) // (workers * 4))
+                for key, report in pool.map(_validate_file, pending, chunksize=chunksize):
+                    reports[key] = report
+        for key, _ in pending:
+            cache[digests[key]] = reports[key]
+            reports[key] = dict(reports[key], cached=False)
+
+    if cache_path is not None and pending:
+        live = set(digests.values())
+        save_cache(cache_path, {digest: entry for digest, entry in cache.items() if digest in live})
+
+    levels = [dict(reports[str(path)], path=str(path), sha256=digests[str(path)]) for path in paths]
+    failed = sum(1 for entry in levels if not entry["ok"])
+    return {
+        "levels": levels,
+        "summary": {
+            "total": len(levels),
+            "failed": failed,
+            "cached": sum(1 for entry in levels if entry["cached"]),
+        },
+    }
+
+
+def collect_paths(targets: list[Path]) -> list[Path]:
+    paths: list[Path] = []
+    for target in targets:
+        if target.is_dir():
+            paths.extend(sorted(target.glob("*.txt")) + sorted(target.glob(f"*{BINARY_LEVEL_SUFFIX}")))
+        else:
+            paths.append(target)
+    return paths
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Lint and validate level files in parallel.")
+    parser.add_argument("targets", nargs="*", type=Path, default=[LEVELS_DIR], help="level files or directories")
+    parser.add_argument("--output", type=Path, help="write the JSON report here instead of stdout")
+    parser.add_argument("--jobs", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--no-cache", action="store_true", help="ignore and do not update the result cache")
+    args = parser.parse_args()
+
+    paths = collect_paths(args.targets)
+    report = validate_paths(paths, cache_path=None if args.no_cache else CACHE_PATH, workers=args.jobs)
+    text = json.dumps(report, indent=2)
+    if args.output is not None:
+        args.output.write_text(text + "\n")
+    else:
+        print(text)
+
+    summary = report["summary"]
+    print(f"{summary['total']} levels, {summary['failed']} failed, {summary['cached']} cached", file=sys.stderr)
+    sys.exit(1 if summary["failed"] else 0)
+
+
+if __name__ == "__main__":
+    main()
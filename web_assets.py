@@ -0,0 +1,146 @@
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+import pygame
+
+from level import read_level_rows
+from level_binary import save_rows_binary
+from settings import (
+    BINARY_LEVEL_SUFFIX,
+    FONT_NAME,
+    HUD_FONT_SIZE,
+    LEVEL_PATH,
+    TITLE_FONT_SIZE,
+    WEB_ASSETS_DIR,
+)
+
+# Set to 1 to start from the prebuilt assets on desktop too; the browser
+# build uses them whenever they were shipped.
+FAST_START_ENV = "GD_FAST_START"
+# Set to 1 to print startup milestones and quit once the game is ready.
+STARTUP_TRACE_ENV = "GD_STARTUP_TRACE"
+LEVEL_BLOB = "level" + BINARY_LEVEL_SUFFIX
+ATLAS_IMAGE = "glyphs.png"
+ATLAS_INDEX = "glyphs.json"
+GLYPHS = "".join(chr(code) for code in range(32, 127))
+WHITE = (255, 255, 255)
+_STARTED = time.perf_counter()
+
+
+class GlyphFont:
+    # Stands in for pygame.font.Font where only render() and get_linesize()
+    # are used. Strings are laid out glyph by glyph from the atlas, without
+    # kerning, and tinted from white.
+    def __init__(
+        self,
+        atlas: pygame.Surface,
+        top: int,
+        height: int,
+        linesize: int,
+        glyphs: dict[str, list[int]],
+    ) -> None:
+        self.atlas = atlas
+        self.top = top
+        self.height = height
+        self.linesize = linesize
+        self.glyphs = glyphs
+
+    def get_linesize(self) -> int:
+        return self.linesize
+
+    def render(self, text: str, antialias: bool, color: tuple[int, int, int]) -> pygame.Surface:
+        placed = [self.glyphs.get(char, self.glyphs["?"]) for char in text]
+        surface = pygame.Surface((max(1, sum(width for _, width in placed)), self.height), pygame.SRCALPHA)
+        x = 0
+        for left, width in placed:
+            # Glyph boxes never overlap, so adding onto the cleared surface
+            # copies their pixels exactly.
+            surface.blit(self.atlas, (x, 0), (left, self.top, width, self.height), special_flags=pygame.BLEND_RGBA_ADD)
+            x += width
+        if tuple(color[:3]) != WHITE:
+            surface.fill((*color[:3], 255), special_flags=pygame.BLEND_RGBA_MULT)
+        return surface
+
+
+def has_assets(directory: Path = WEB_ASSETS_DIR) -> bool:
+    return all((directory / name).exists() for name in (LEVEL_BLOB, ATLAS_IMAGE, ATLAS_INDEX))
+
+
+def fast_start(directory: Path = WEB_ASSETS_DIR) -> bool:
+    return has_assets(directory) and (sys.platform == "emscripten" or os.environ.get(FAST_START_ENV) == "1")
+
+
+def level_blob(directory: Path = WEB_ASSETS_DIR) -> Path:
+    return directory / LEVEL_BLOB
+
+
+def load_fonts(fast: bool, directory: Path = WEB_ASSETS_DIR) -> tuple[pygame.font.Font | GlyphFont, ...]:
+    # (HUD font, title font); without the atlas this initializes pygame.font.
+    if not fast:
+        pygame.font.init()
+        return pygame.font.SysFont(FONT_NAME, HUD_FONT_SIZE), pygame.font.SysFont(FONT_NAME, TITLE_FONT_SIZE)
+    atlas = pygame.image.load(directory / ATLAS_IMAGE).convert_alpha()
+    index = json.loads((directory / ATLAS_INDEX).read_text())
+    return tuple(GlyphFont(atlas, **index[str(size)]) for size in (HUD_FONT_SIZE, TITLE_FONT_SIZE))
+
+
+def trace_startup() -> bool:
+    return os.environ.get(STARTUP_TRACE_ENV) == "1"
+
+
+def mark_startup(stage: str) -> None:
+    if trace_startup():
+        # Milliseconds since this module was imported, then the wall clock,
+        # so a launcher can measure from before the interpreter started.
+        print(f"startup {stage} {(time.perf_counter() - _STARTED) * 1000:.1f} {time.time():.6f}", flush=True)
+
+
+def build_atlas(directory: Path) -> tuple[int, int]:
+    pygame.font.init()
+    strips = []
+    index = {}
+    top = 0
+    for size in (HUD_FONT_SIZE, TITLE_FONT_SIZE):
+        font = pygame.font.SysFont(FONT_NAME, size)
+        glyphs = {}
+        rendered = []
+        left = 0
+        for char in GLYPHS:
+            image = font.render(char, True, WHITE)
+            glyphs[char] = [left, image.get_width()]
+            rendered.append((image, left))
+            left += image.get_width()
+        height = max(image.get_height() for image, _ in rendered)
+        strips.append((rendered, top, left))
+        index[str(size)] = {"top": top, "height": height, "linesize": font.get_linesize(), "glyphs": glyphs}
+        top += height
+
+    atlas = pygame.Surface((max(width for _, _, width in strips), top), pygame.SRCALPHA)
+    for rendered, strip_top, _ in strips:
+        for image, left in rendered:
+            atlas.blit(image, (left, strip_top), special_flags=pygame.BLEND_RGBA_ADD)
+    pygame.image.save(atlas, directory / ATLAS_IMAGE)
+    (directory / ATLAS_INDEX).write_text(json.dumps(index, separators=(",", ":")))
+    return atlas.get_size()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Prebuild the level blob and glyph atlas for the web build.")
+    parser.add_argument("--level", type=Path, default=LEVEL_PATH)
+    parser.add_argument("--output", type=Path, default=WEB_ASSETS_DIR)
+    args = parser.parse_args()
+
+    args.output.mkdir(parents=True, exist_ok=True)
+    save_rows_binary(args.output / LEVEL_BLOB, read_level_rows(args.level))
+    width, height = build_atlas(args.output)
+    for name in (LEVEL_BLOB, ATLAS_IMAGE, ATLAS_INDEX):
+        print(f"Wrote {args.output / name} ({(args.output / name).stat().st_size} bytes)")
+    print(f"Atlas is {width}x{height} for {len(GLYPHS)} glyphs at sizes {HUD_FONT_SIZE} and {TITLE_FONT_SIZE}")
+
+
+if __name__ == "__main__":
+    main()